@@ -1,19 +1,30 @@
 import json
+from bisect import bisect_right
 from datetime import datetime, timedelta
 
-import ollama
-
 from config import Config
 from database import db_manager
+from keyword_matcher import keyword_matcher
+from lazy import LazyInstance
 from openai_client import OpenAICompatibleClient
 
+# 分析结果逐行提取与置信度计数的规则，同一文本只扫描一次
+analysis_matcher = keyword_matcher.select('analysis.line', 'analysis.confidence')
+
 class AIAnalyzer:
     def __init__(self):
         self.host = Config.OLLAMA_HOST
         self.provider = Config.AI_PROVIDER
         self.openai_client = OpenAICompatibleClient() if self.provider == "openai" else None
-        self.available_models = self.get_available_models()
+        self._available_models = None
     
+    @property
+    def available_models(self):
+        """可用模型列表，首次访问时才向模型服务查询"""
+        if self._available_models is None:
+            self._available_models = self.get_available_models()
+        return self._available_models
+    
     def get_available_models(self):
         """获取可用的Ollama模型"""
         if self.provider == "openai":
@@ -27,6 +38,7 @@ class AIAnalyzer:
                 return [Config.OPENAI_MODEL]
 
         try:
+            import ollama
             response = ollama.list()
             models = [model['name'] for model in response['models']]
             db_manager.log_message("INFO", "AIAnalyzer", f"发现{len(models)}个可用模型: {', '.join(models)}")
@@ -73,6 +85,7 @@ class AIAnalyzer:
             )
             return response['choices'][0]['message']['content']
 
+        import ollama
         response = ollama.chat(
             model=model_name,
             messages=[{
@@ -152,64 +165,60 @@ class AIAnalyzer:
     
     def _parse_trend_analysis(self, analysis_text):
         """解析趋势分析结果"""
+        matches = analysis_matcher.scan(analysis_text)
         return {
             'analysis_date': datetime.now().date(),
             'raw_response': analysis_text,
-            'parsed_insights': self._extract_key_insights(analysis_text),
-            'confidence_score': self._calculate_confidence(analysis_text)
+            'parsed_insights': self._extract_key_insights(analysis_text, matches),
+            'confidence_score': self._calculate_confidence(analysis_text, matches)
         }
     
     def _parse_prediction_result(self, prediction_text):
         """解析预测结果"""
+        matches = analysis_matcher.scan(prediction_text)
         return {
             'prediction_date': (datetime.now() + timedelta(days=1)).date(),
             'raw_response': prediction_text,
-            'predictions': self._extract_predictions(prediction_text),
-            'confidence_score': self._calculate_confidence(prediction_text),
-            'risk_assessment': self._extract_risks(prediction_text)
+            'predictions': self._extract_predictions(prediction_text, matches),
+            'confidence_score': self._calculate_confidence(prediction_text, matches),
+            'risk_assessment': self._extract_risks(prediction_text, matches)
         }
     
-    def _extract_key_insights(self, text):
+    def _extract_key_insights(self, text, matches=None):
         """提取关键洞察"""
-        insights = []
-        lines = text.split('\n')
-        
-        for line in lines:
-            if any(keyword in line for keyword in ['增长', '下降', '热门', '趋势', '变化']):
-                insights.append(line.strip())
-        
-        return insights[:5]  # 返回前5个关键洞察
+        return self._extract_lines(text, 'insight', matches)[:5]  # 返回前5个关键洞察
     
-    def _extract_predictions(self, text):
+    def _extract_predictions(self, text, matches=None):
         """提取预测内容"""
-        predictions = []
-        lines = text.split('\n')
-        
-        for line in lines:
-            if any(keyword in line for keyword in ['预测', '预计', '将', '可能', '有望']):
-                predictions.append(line.strip())
-        
-        return predictions[:8]  # 返回前8个预测
+        return self._extract_lines(text, 'prediction', matches)[:8]  # 返回前8个预测
     
-    def _extract_risks(self, text):
+    def _extract_risks(self, text, matches=None):
         """提取风险提醒"""
-        risks = []
-        lines = text.split('\n')
+        return self._extract_lines(text, 'risk', matches)[:3]  # 返回前3个风险提醒
+    
+    def _extract_lines(self, text, label, matches=None):
+        """提取包含某类关键词的行：按全文扫描的命中位置定位所在行
         
+        matches 为同一文本的 analysis_matcher.scan 结果，多项提取可共用一次扫描
+        """
+        lines = text.split('\n')
+        line_starts = []
+        offset = 0
         for line in lines:
-            if any(keyword in line for keyword in ['风险', '注意', '警惕', '挑战', '问题']):
-                risks.append(line.strip())
+            line_starts.append(offset)
+            offset += len(line) + 1
         
-        return risks[:3]  # 返回前3个风险提醒
+        matches = matches or analysis_matcher.scan(text)
+        positions = matches.positions('analysis.line', label)
+        matched = sorted({bisect_right(line_starts, position) - 1 for position in positions})
+        return [lines[index].strip() for index in matched]
     
-    def _calculate_confidence(self, text):
+    def _calculate_confidence(self, text, matches=None):
         """计算分析置信度"""
-        # 简单的关键词计数方法
-        positive_keywords = ['明确', '显著', '明显', '确定', '强烈']
-        negative_keywords = ['可能', '也许', '或许', '不确定', '模糊']
-        
-        positive_count = sum(text.count(keyword) for keyword in positive_keywords)
-        negative_count = sum(text.count(keyword) for keyword in negative_keywords)
+        # 简单的关键词计数方法（肯定/不确定用语见 keyword_matcher 中的 analysis.confidence）
+        counts = (matches or analysis_matcher.scan(text)).counts('analysis.confidence')
+        positive_count = counts['positive']
+        negative_count = counts['negative']
         
         total_indicators = positive_count + negative_count
         if total_indicators == 0:
@@ -304,5 +313,5 @@ class TrendAnalyzer:
         
         return historical_data
 
-# 全局分析器实例
-trend_analyzer = TrendAnalyzer()
+# 全局分析器实例，首次使用时才创建
+trend_analyzer = LazyInstance(TrendAnalyzer, 'trend_analyzer')
@@ -6,6 +6,8 @@ from database import db_manager
 from crawler import content_crawler
 from ai_analyzer import trend_analyzer, AIAnalyzer
 from config import Config
+from crawl_scheduler import crawl_scheduler
+from lazy import start_warm_up
 import schedule
 import threading
 import time
@@ -17,27 +19,26 @@ CORS(app)
 Config.init_directories()
 
 def scheduled_update():
-    """定时更新任务"""
+    """定时分析任务（数据由抓取调度器按各来源的节奏持续更新）"""
     try:
-        db_manager.log_message("INFO", "Scheduler", "开始执行定时更新任务")
-        
-        # 爬取新数据
-        content_crawler.crawl_all_content()
+        db_manager.log_message("INFO", "Scheduler", "开始执行定时分析任务")
         
         # 执行AI分析
         trend_analyzer.daily_analysis()
         
-        db_manager.log_message("INFO", "Scheduler", "定时更新任务完成")
+        db_manager.log_message("INFO", "Scheduler", "定时分析任务完成")
     except Exception as e:
-        db_manager.log_message("ERROR", "Scheduler", f"定时更新任务失败: {str(e)}")
+        db_manager.log_message("ERROR", "Scheduler", f"定时分析任务失败: {str(e)}")
 
 def run_scheduler():
-    """运行调度器"""
+    """运行调度器：各来源按 Config.CRAWL_CADENCES 分别抓取，每天 SCHEDULE_TIME 执行AI分析"""
+    crawl_scheduler.load()
     schedule.every().day.at(Config.SCHEDULE_TIME).do(scheduled_update)
     
     while True:
+        crawl_scheduler.tick()
         schedule.run_pending()
-        time.sleep(60)
+        time.sleep(Config.SCHEDULER_POLL_SECONDS)
 
 @app.route('/')
 def index():
@@ -177,8 +178,8 @@ def trigger_crawler():
         # 在后台线程中执行爬取和分析
         def background_update():
             try:
-                # 爬取数据
-                content_crawler.crawl_all_content()
+                # 爬取数据（经调度器运行，正在定时抓取的任务不会重复启动）
+                crawl_scheduler.run_all()
                 
                 # 执行分析
                 trend_analyzer.daily_analysis(model_name)
@@ -455,6 +456,42 @@ def smart_crawl_industry():
             'error': str(e)
         }), 500
 
+@app.route('/api/cache/stats')
+def get_cache_stats():
+    """获取HTTP响应缓存统计"""
+    try:
+        from response_cache import response_cache
+        
+        return jsonify({
+            'success': True,
+            'data': response_cache.stats()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/transport/stats')
+def get_transport_stats():
+    """获取共享连接池、DNS缓存与主机熔断统计"""
+    try:
+        from transport import transport
+        from circuit_breaker import circuit_breaker
+        
+        stats = transport.stats()
+        stats['circuits'] = circuit_breaker.stats()
+        
+        return jsonify({
+            'success': True,
+            'data': stats
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/hardware/metrics')
 def get_hardware_metrics():
     """获取硬件监控指标"""
@@ -500,6 +537,10 @@ def get_hardware_metrics():
         }), 500
 
 if __name__ == '__main__':
+    # 后台预热各组件，不阻塞Web服务启动（解析进程池的子进程以 __mp_main__ 导入本模块，不会预热）
+    if Config.WARM_UP_ON_START:
+        start_warm_up(db_manager, content_crawler, trend_analyzer)
+    
     # 启动调度器线程
     scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
     scheduler_thread.start()
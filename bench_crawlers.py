@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+爬虫吞吐量基准测试（离线回放）
+先用 --record 录制真实响应到 fixtures/responses/，之后在本地回放服务器上
+测量各爬虫类的 页面/秒、条目/秒、峰值内存，以及各抽取器的CPU耗时:
+
+    python bench_crawlers.py --record
+    python bench_crawlers.py --latency 0.02 0.08 --error-rate 0.02
+    python bench_crawlers.py --save baseline.json
+    python bench_crawlers.py --compare baseline.json --tolerance 0.2
+
+每个爬虫类在独立进程中运行，数据库与响应缓存放在临时目录，不影响正式数据。
+"""
+
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from config import Config
+from replay import FixtureRecorder, FixtureStore, ReplayServer, DEFAULT_FIXTURES_DIR
+
+# 参与测试的爬虫类: 名称 -> (模块, 类名, 抓取方法)
+CRAWLERS = {
+    'NovelCrawler': ('crawler', 'NovelCrawler', 'crawl_all'),
+    'DramaCrawler': ('crawler', 'DramaCrawler', 'crawl_all'),
+    'ComicCrawler': ('crawler', 'ComicCrawler', 'crawl_all'),
+    'NewsCrawler': ('crawler', 'NewsCrawler', 'crawl_all'),
+    'EntertainmentCrawler': ('crawler', 'EntertainmentCrawler', 'crawl_all'),
+    'WorkingHotTrendCrawler': ('real_crawler', 'WorkingHotTrendCrawler', 'crawl_real_hot_trends'),
+}
+
+
+def isolate_state(workdir, polite=True):
+    """数据库与响应缓存改用临时目录；polite=False 时取消单主机限速（回放时不需要礼貌延迟）
+
+    必须在导入爬虫模块之前调用。
+    """
+    os.makedirs(workdir, exist_ok=True)
+    Config.DATABASE_PATH = os.path.join(workdir, 'bench.db')
+    Config.RESPONSE_CACHE_DIR = os.path.join(workdir, 'http_cache')
+    if not polite:
+        Config.HOST_RATE_DEFAULT = (10000.0, 10000)
+        Config.HOST_RATE_LIMITS.clear()
+
+
+def process_cpu_seconds():
+    """本进程及已回收子进程（解析进程池）的CPU时间"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def peak_rss_mb():
+    """本进程的峰值常驻内存（MB）"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 单位为KB，macOS 为字节
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        import psutil
+        memory = psutil.Process().memory_info()
+        return getattr(memory, 'peak_wset', memory.rss) / (1024 * 1024)
+
+
+def run_crawler(name, options, results):
+    """在独立进程中运行一个爬虫类并回传结果"""
+    isolate_state(os.path.join(options['workdir'], name), polite=options['polite'])
+    if options['extract_workers'] is not None:
+        Config.EXTRACT_WORKERS = options['extract_workers']
+
+    from extract_pool import extract_pool
+    from transport import transport
+    transport.route_to(options['base_url'])
+
+    module_name, class_name, method = CRAWLERS[name]
+    crawler = getattr(importlib.import_module(module_name), class_name)()
+
+    cpu_start = process_cpu_seconds()
+    start = time.perf_counter()
+    items = getattr(crawler, method)()
+    elapsed = time.perf_counter() - start
+    extract_pool.shutdown()
+
+    results.put({
+        'items': len(items),
+        'seconds': elapsed,
+        'cpu_seconds': process_cpu_seconds() - cpu_start,
+        'peak_rss_mb': peak_rss_mb()
+    })
+
+
+def bench_crawlers(server, names, options):
+    """逐个爬虫类运行并统计吞吐量"""
+    context = multiprocessing.get_context('spawn')
+    report = {}
+
+    for name in names:
+        results = context.Queue()
+        before = server.stats()
+        process = context.Process(target=run_crawler, args=(name, options, results))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print(f"❌ {name} 运行失败 (exit {process.exitcode})")
+            continue
+
+        result = results.get()
+        after = server.stats()
+        pages = (after['served'] - before['served']) + (after['not_modified'] - before['not_modified'])
+        seconds = max(result['seconds'], 1e-9)
+        result.update({
+            'requests': after['requests'] - before['requests'],
+            'errors': after['errors'] - before['errors'],
+            'misses': after['misses'] - before['misses'],
+            'pages': pages,
+            'pages_per_sec': pages / seconds,
+            'items_per_sec': result['items'] / seconds
+        })
+        report[name] = result
+
+    return report
+
+
+def fixture_response(url, fixture):
+    """把录制的响应构造成 requests.Response"""
+    import requests
+
+    status, headers, body = fixture
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    response.headers.update(headers)
+    response._content = body
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def extractor_cases():
+    """参与CPU计时的抽取器: (名称, 函数, 适用的URL列表或None表示全部HTML页面, 额外参数)"""
+    from real_crawler import parse_github_trending
+    from site_registry import extract_site, site_registry
+
+    cases = [
+        (f'site:{extractor.name}', extract_site, extractor.urls, lambda url, spec=extractor.spec: (spec, url))
+        for extractor in site_registry.extractors.values()
+    ]
+    cases.append((
+        'github_trending', parse_github_trending,
+        ['https://github.com/trending', 'https://github.com/trending/developers'],
+        lambda url: (url,)
+    ))
+
+    try:
+        from smart_manga_crawler import extract_manga_page
+        cases.append(('manga_page', extract_manga_page, None, lambda url: (url,)))
+    except ImportError as e:
+        print(f"⚠️ 跳过漫剧页面抽取器: {str(e)}")
+
+    return cases
+
+
+def bench_extractors(store, rounds):
+    """在当前进程中测量各抽取器每页的CPU时间"""
+    from extract_pool import decode_content
+
+    pages = {}
+    for url in store.urls():
+        fixture = store.get(url)
+        if fixture[0] == 200 and 'html' in fixture[1].get('content-type', 'text/html'):
+            response = fixture_response(url, fixture)
+            pages[url] = decode_content(response.content, response.encoding or response.apparent_encoding)
+
+    report = {}
+    for name, func, urls, make_args in extractor_cases():
+        targets = [url for url in (urls if urls is not None else pages) if url in pages]
+        if not targets:
+            continue
+
+        items = 0
+        cpu_start = time.process_time()
+        for _ in range(rounds):
+            for url in targets:
+                result = func(pages[url], *make_args(url))
+                items += len(result) if isinstance(result, list) else int(result is not None)
+        cpu = time.process_time() - cpu_start
+
+        report[name] = {
+            'pages': len(targets),
+            'items_per_page': items / rounds / len(targets),
+            'cpu_ms_per_page': cpu / rounds / len(targets) * 1000
+        }
+
+    return report
+
+
+def record(names, fixtures_dir):
+    """对真实站点运行各爬虫并录制全部响应"""
+    workdir = tempfile.mkdtemp(prefix='bench_record_')
+    isolate_state(workdir)
+    store = FixtureStore(fixtures_dir)
+
+    try:
+        with FixtureRecorder(store) as recorder:
+            for name in names:
+                module_name, class_name, method = CRAWLERS[name]
+                print(f"📼 录制 {name}...")
+                crawler = getattr(importlib.import_module(module_name), class_name)()
+                getattr(crawler, method)()
+        print(f"✅ 录制了 {recorder.recorded} 个响应，共 {len(store)} 个URL，保存在 {store.root}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def print_report(report):
+    """打印测试结果"""
+    crawlers = report['crawlers']
+    if crawlers:
+        print(f"\n{'爬虫':<24}{'页面':>6}{'条目':>7}{'耗时(s)':>9}{'页面/秒':>10}{'条目/秒':>10}{'CPU(s)':>8}{'峰值内存(MB)':>14}{'错误':>6}{'未录制':>7}")
+        print("-" * 101)
+        for name, r in crawlers.items():
+            print(f"{name:<24}{r['pages']:>6}{r['items']:>7}{r['seconds']:>9.2f}{r['pages_per_sec']:>10.1f}"
+                  f"{r['items_per_sec']:>10.1f}{r['cpu_seconds']:>8.2f}{r['peak_rss_mb']:>14.1f}{r['errors']:>6}{r['misses']:>7}")
+
+    extractors = report['extractors']
+    if extractors:
+        print(f"\n{'抽取器':<24}{'页面数':>8}{'条目/页':>10}{'CPU毫秒/页':>14}")
+        print("-" * 56)
+        for name, r in extractors.items():
+            print(f"{name:<24}{r['pages']:>8}{r['items_per_page']:>10.1f}{r['cpu_ms_per_page']:>14.2f}")
+
+
+def compare(report, baseline, tolerance):
+    """与基线结果对比，返回退化项列表"""
+    regressions = []
+    checks = [
+        ('crawlers', 'pages_per_sec', -1),
+        ('crawlers', 'items_per_sec', -1),
+        ('crawlers', 'peak_rss_mb', 1),
+        ('extractors', 'cpu_ms_per_page', 1),
+    ]
+    for section, metric, direction in checks:
+        for name, current in report[section].items():
+            previous = baseline.get(section, {}).get(name)
+            if not previous or not previous.get(metric):
+                continue
+            change = (current[metric] - previous[metric]) / previous[metric]
+            if change * direction > tolerance:
+                regressions.append(f"{name} {metric}: {previous[metric]:.2f} -> {current[metric]:.2f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='爬虫吞吐量基准测试（离线回放）')
+    parser.add_argument('--record', action='store_true', help='对真实站点运行爬虫并录制响应')
+    parser.add_argument('--crawlers', nargs='+', choices=sorted(CRAWLERS), default=list(CRAWLERS), help='参与测试的爬虫类')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES_DIR, help='录制数据目录')
+    parser.add_argument('--latency', nargs=2, type=float, default=(0.0, 0.0), metavar=('MIN', 'MAX'), help='回放延迟区间（秒）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='注入错误的概率')
+    parser.add_argument('--error-status', nargs='+', type=int, default=[503], help='注入的状态码，0 表示断开连接')
+    parser.add_argument('--seed', type=int, default=0, help='延迟与错误注入的随机种子')
+    parser.add_argument('--polite', action='store_true', help='回放时保留单主机限速')
+    parser.add_argument('--extract-workers', type=int, default=None, help='解析进程数（默认使用配置）')
+    parser.add_argument('--rounds', type=int, default=5, help='抽取器CPU计时的执行次数')
+    parser.add_argument('--save', help='把结果保存为JSON')
+    parser.add_argument('--compare', help='与之前保存的JSON结果对比')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='允许的退化比例')
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.crawlers, args.fixtures)
+        return 0
+
+    store = FixtureStore(args.fixtures)
+    if not len(store):
+        print(f"❌ 未找到录制数据，请先运行: python {os.path.basename(__file__)} --record")
+        return 1
+
+    workdir = tempfile.mkdtemp(prefix='bench_crawlers_')
+    isolate_state(workdir, polite=args.polite)
+    try:
+        server = ReplayServer(
+            store, latency=tuple(args.latency), error_rate=args.error_rate,
+            error_status=args.error_status, seed=args.seed
+        )
+        with server:
+            options = {
+                'workdir': workdir,
+                'base_url': server.base_url,
+                'polite': args.polite,
+                'extract_workers': args.extract_workers
+            }
+            report = {
+                'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'settings': {
+                    'latency': args.latency, 'error_rate': args.error_rate,
+                    'error_status': args.error_status, 'seed': args.seed, 'polite': args.polite
+                },
+                'crawlers': bench_crawlers(server, args.crawlers, options),
+                'extractors': bench_extractors(store, args.rounds)
+            }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(report)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 结果已保存到 {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n⚠️ 性能退化（超过 {args.tolerance:.0%}）:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print(f"\n✅ 与基线相比无明显退化（容差 {args.tolerance:.0%}）")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+HTML解析后端性能对比
+先用 --record 把各站点页面保存到 fixtures/pages/，之后离线对比各后端:
+
+    python bench_parsers.py --record
+    python bench_parsers.py --rounds 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import requests
+from bs4 import BeautifulSoup
+
+import html_parser
+from config import Config
+from site_registry import site_registry
+
+PAGES_DIR = os.path.join(Config.BASE_DIR, 'fixtures', 'pages')
+
+# 每个注册站点取第一个页面，链接抽取参数与站点规则一致
+BENCH_PAGES = {
+    name: (extractor.urls[0], extractor.links)
+    for name, extractor in site_registry.extractors.items()
+}
+
+
+def record_pages():
+    """下载并保存基准测试页面"""
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    session = requests.Session()
+    session.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'})
+
+    for name, (url, _) in BENCH_PAGES.items():
+        try:
+            response = session.get(url, timeout=Config.TIMEOUT)
+            response.raise_for_status()
+            with open(os.path.join(PAGES_DIR, f'{name}.html'), 'w', encoding='utf-8') as f:
+                f.write(response.text)
+            print(f"✅ 已保存 {name} ({len(response.content)} 字节)")
+        except Exception as e:
+            print(f"❌ 保存失败 {name}: {str(e)}")
+
+
+def load_pages():
+    """读取已保存的页面"""
+    pages = {}
+    for name, (_, options) in BENCH_PAGES.items():
+        path = os.path.join(PAGES_DIR, f'{name}.html')
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                pages[name] = (f.read(), options)
+    return pages
+
+
+def full_soup_baseline(markup, options):
+    """原实现：html.parser 构建整棵树后再查找链接"""
+    soup = BeautifulSoup(markup, 'html.parser')
+    return soup.find_all('a')
+
+
+def time_call(func, rounds):
+    """多次执行取平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def run_benchmark(rounds):
+    """对比各解析后端"""
+    pages = load_pages()
+    if not pages:
+        print(f"❌ 未找到已保存的页面，请先运行: python {os.path.basename(__file__)} --record")
+        return False
+
+    backends = html_parser.available_backends()
+    header = f"{'页面':<18}{'大小(KB)':>10}{'bs4整树':>12}" + ''.join(f"{b:>14}" for b in backends)
+    print(header)
+    print("-" * 80)
+
+    for name, (markup, options) in pages.items():
+        row = f"{name:<18}{len(markup.encode('utf-8')) / 1024:>10.1f}"
+        row += f"{time_call(lambda: full_soup_baseline(markup, options), rounds):>12.2f}"
+        for backend in backends:
+            elapsed = time_call(lambda: html_parser.extract_links(markup, backend=backend, **options), rounds)
+            row += f"{elapsed:>14.2f}"
+        print(row)
+
+    print("\n单位: 毫秒/页")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='HTML解析后端性能对比')
+    parser.add_argument('--record', action='store_true', help='下载并保存基准测试页面')
+    parser.add_argument('--rounds', type=int, default=10, help='每个后端的执行次数')
+    args = parser.parse_args()
+
+    if args.record:
+        record_pages()
+        sys.exit(0)
+
+    sys.exit(0 if run_benchmark(args.rounds) else 1)
@@ -0,0 +1,156 @@
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+from config import Config
+from database import db_manager
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class HostCircuit:
+    """单个主机的熔断状态
+
+    closed: 正常放行，统计最近请求的失败率，超过阈值后熔断(open)；
+    open: 直接拒绝请求，冷却时间按连续熔断次数指数增长并加随机抖动；
+    half_open: 冷却结束后只放行一个探测请求，成功则恢复，失败则再次熔断。
+    """
+
+    def __init__(self, host, state=CLOSED, open_count=0, open_until=0):
+        self.host = host
+        self.state = state
+        self.open_count = open_count
+        self.open_until = open_until
+        self.outcomes = deque(maxlen=Config.CIRCUIT_WINDOW)
+        self.probing = False
+
+    def error_rate(self):
+        """最近请求的失败率"""
+        if not self.outcomes:
+            return 0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def backoff(self):
+        """本次熔断的冷却时间（秒）：指数退避 + 随机抖动"""
+        delay = min(Config.CIRCUIT_MAX_BACKOFF, Config.CIRCUIT_BASE_BACKOFF * 2 ** (self.open_count - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+
+class CircuitBreaker:
+    """按主机熔断，状态持久化到数据库，下次运行时继续生效"""
+
+    def __init__(self):
+        self.circuits = {}
+        self.lock = threading.Lock()
+
+    def _circuit(self, host):
+        """获取主机熔断状态，首次访问时从数据库加载"""
+        circuit = self.circuits.get(host)
+        if circuit is None:
+            record = db_manager.get_host_circuit(host)
+            if record:
+                circuit = HostCircuit(host, record['state'], record['open_count'], record['open_until'])
+            else:
+                circuit = HostCircuit(host)
+            self.circuits[host] = circuit
+        return circuit
+
+    @staticmethod
+    def host_of(url):
+        """URL对应的主机"""
+        return urlparse(url).netloc.lower()
+
+    def allow(self, host):
+        """是否放行该主机的请求；冷却结束后只放行一个探测请求"""
+        with self.lock:
+            circuit = self._circuit(host)
+            if circuit.state == CLOSED:
+                return True
+
+            if circuit.state == OPEN:
+                if time.time() < circuit.open_until:
+                    return False
+                circuit.state = HALF_OPEN
+                circuit.probing = False
+
+            if circuit.probing:
+                return False
+            circuit.probing = True
+            return True
+
+    def is_open(self, host):
+        """主机是否处于熔断中"""
+        with self.lock:
+            return self._circuit(host).state == OPEN
+
+    def retry_after(self, host):
+        """距离熔断结束的秒数"""
+        with self.lock:
+            circuit = self._circuit(host)
+            return max(0, int(circuit.open_until - time.time()))
+
+    def record_success(self, host):
+        """记录成功请求"""
+        with self.lock:
+            circuit = self._circuit(host)
+            circuit.outcomes.append(True)
+            if circuit.state != CLOSED:
+                circuit.state = CLOSED
+                circuit.open_count = 0
+                circuit.open_until = 0
+                circuit.probing = False
+                circuit.outcomes.clear()
+                self._save(circuit)
+                db_manager.log_message("INFO", "CircuitBreaker", f"{host} 已恢复")
+
+    def record_failure(self, host):
+        """记录失败请求，失败率超过阈值或探测失败时熔断"""
+        with self.lock:
+            circuit = self._circuit(host)
+            circuit.outcomes.append(False)
+
+            if circuit.state == HALF_OPEN:
+                self._open(circuit)
+            elif (circuit.state == CLOSED
+                  and len(circuit.outcomes) >= Config.CIRCUIT_MIN_REQUESTS
+                  and circuit.error_rate() >= Config.CIRCUIT_ERROR_RATE):
+                self._open(circuit)
+
+    def _open(self, circuit):
+        """进入熔断状态"""
+        circuit.state = OPEN
+        circuit.open_count += 1
+        circuit.probing = False
+        backoff = circuit.backoff()
+        circuit.open_until = time.time() + backoff
+        circuit.outcomes.clear()
+        self._save(circuit)
+        db_manager.log_message(
+            "WARNING", "CircuitBreaker",
+            f"{circuit.host} 连续失败，熔断{int(backoff)}秒（第{circuit.open_count}次）"
+        )
+
+    def _save(self, circuit):
+        """持久化主机熔断状态"""
+        db_manager.save_host_circuit(circuit.host, circuit.state, circuit.open_count, circuit.open_until)
+
+    def stats(self):
+        """各主机熔断状态"""
+        with self.lock:
+            return {
+                host: {
+                    'state': circuit.state,
+                    'error_rate': round(circuit.error_rate(), 2),
+                    'open_count': circuit.open_count,
+                    'open_until': circuit.open_until
+                }
+                for host, circuit in self.circuits.items()
+            }
+
+
+# 全局熔断器实例
+circuit_breaker = CircuitBreaker()
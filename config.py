@@ -11,6 +11,112 @@ class Config:
     REQUEST_DELAY = 1  # 请求间隔（秒）
     TIMEOUT = 10       # 超时时间（秒）
     MAX_RETRIES = 3    # 最大重试次数
+    USER_AGENTS_FILE = os.path.join(BASE_DIR, 'data', 'user_agents.txt')  # 离线UA列表，每行一个
+
+    # 并发抓取配置
+    CRAWL_MAX_WORKERS = 12          # 同时运行的抓取任务数
+    CRAWL_MAX_CONCURRENCY = 8       # 全局同时进行的HTTP请求数
+    CRAWL_PER_HOST_CONCURRENCY = 2  # 单个主机同时进行的HTTP请求数
+
+    # 入库管道配置: 爬虫边抓取边入队，写入线程按批提交
+    PIPELINE_QUEUE_SIZE = 500       # 队列容量，满时爬虫等待
+    PIPELINE_BATCH_SIZE = 100       # 每批写入条数
+    PIPELINE_FLUSH_INTERVAL = 2     # 最长写入间隔（秒）
+
+    # 入库去重: URL规范化后按（内容类型, URL, 抓取日期）去重，管道丢弃同一次运行内的重复，数据库唯一键合并跨运行的重复
+    DEDUP_TRACKING_PARAMS = {           # 规范化时去掉的跟踪参数
+        'spm', 'spm_id_from', 'scm', 'from', 'from_source', 'share_source', 'share_medium',
+        'share_plat', 'share_session_id', 'share_tag', 'share_from', 'vd_source', 'unique_k',
+        'fbclid', 'gclid', 'ref', 'ref_src', 'referer', 'timestamp', 'ts'
+    }
+    DEDUP_TRACKING_PREFIXES = ('utm_',)
+
+    # 爆款报告: content_data 中该时间（秒）内入库的来源视为新鲜，直接读取，只重新抓取过期来源
+    HOT_TREND_MAX_AGE = 3600
+
+    # HTML解析进程池
+    EXTRACT_WORKERS = os.cpu_count() or 1   # 解析进程数，0 表示在抓取线程中直接解析
+    # 子进程启动方式: 进程池在已运行Web、写入与调度线程的进程中按需创建，fork 可能死锁，
+    # 默认 forkserver（不支持的平台使用 spawn）
+    EXTRACT_START_METHOD = 'forkserver'
+
+    # 下载限制: 响应正文流式读取，内容类型不在白名单、超过字节上限或下载时间上限时中止
+    DOWNLOAD_MAX_BYTES = 5 * 1024 * 1024        # 默认每个响应的字节上限（解压后）
+    DOWNLOAD_HOST_MAX_BYTES = {                 # 按主机覆盖
+        'news.google.com': 2 * 1024 * 1024,
+        'api.bilibili.com': 2 * 1024 * 1024
+    }
+    DOWNLOAD_TARGET_MAX_BYTES = 1024 * 1024     # 搜索发现的漫剧目标页面
+    DOWNLOAD_MAX_SECONDS = 30                   # 单个响应的下载时间上限（秒）
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    DOWNLOAD_CONTENT_TYPES = (                  # 允许下载的内容类型，未声明类型的响应不限制
+        'text/html', 'application/xhtml+xml', 'text/plain',
+        'text/xml', 'application/xml', 'application/rss+xml', 'application/atom+xml',
+        'application/json', 'text/javascript', 'application/javascript'
+    )
+
+    # 共享连接池配置: 所有爬虫复用同一连接池（keep-alive），DNS结果缓存TTL秒
+    HTTP_POOL_CONNECTIONS = 32                       # 缓存的主机连接池个数
+    HTTP_POOL_MAXSIZE = CRAWL_PER_HOST_CONCURRENCY   # 每个主机保持的连接数
+    HTTP_HOST_POOL_SIZES = {                         # 按主机覆盖连接数
+        'api.bilibili.com': 4,
+        'news.google.com': 4
+    }
+    DNS_CACHE_TTL = 300                              # 0 表示不缓存，只作用于爬虫的传输层连接
+    DNS_CACHE_MAX_ENTRIES = 1024                     # DNS缓存的最大主机数
+
+    # 主机熔断配置: 最近请求失败率达到阈值后暂停访问该主机，冷却时间指数增长
+    CIRCUIT_WINDOW = 10            # 统计失败率的最近请求数
+    CIRCUIT_MIN_REQUESTS = 3       # 达到该请求数后才判断失败率
+    CIRCUIT_ERROR_RATE = 0.6       # 熔断的失败率阈值
+    CIRCUIT_BASE_BACKOFF = 60      # 首次熔断的冷却时间（秒）
+    CIRCUIT_MAX_BACKOFF = 3600     # 冷却时间上限（秒）
+
+    # robots.txt缓存配置: 有效期优先取 Cache-Control 的 max-age
+    ROBOTS_CACHE_TTL = 24 * 3600   # 默认有效期（秒）
+    ROBOTS_TIMEOUT = 5             # 抓取超时（秒）
+    ROBOTS_ERROR_TTL = 600         # 抓取失败（超时、连接错误）的缓存时间（秒），期间按禁止抓取处理
+
+    # 目标网站检查配置: WHOIS结果按域名缓存，robots与WHOIS检查并发执行
+    WHOIS_CACHE_TTL = 30 * 24 * 3600   # WHOIS结果有效期（秒）
+    WHOIS_ERROR_TTL = 3600             # 查询失败的缓存时间（秒）
+    TARGET_CHECK_WORKERS = 8           # 同时检查的域名数
+
+    # 行业搜索配置: type 为 simulated(本地模拟) 或 json(返回JSON的搜索服务)
+    # 例如本地SearXNG: {'name': 'searxng', 'type': 'json', 'url': 'http://localhost:8888/search?q={query}&format=json'}
+    SEARCH_BACKENDS = [
+        {'name': 'simulated', 'type': 'simulated'}
+    ]
+    SEARCH_CACHE_TTL = 600         # 搜索结果缓存时间（秒）
+    SEARCH_MAX_WORKERS = 8         # 同时执行的查询数
+
+    # HTML解析后端: selectolax / lxml / html.parser，未安装时自动回退
+    HTML_PARSER_BACKEND = 'lxml'
+    CHARSET_SNIFF_BYTES = 4096   # 在页面开头这么多字节内查找 <meta charset> / XML声明
+
+    # 单主机请求速率（令牌桶）: (每秒请求数, 突发容量)，只作用于真实的网络请求
+    HOST_RATE_DEFAULT = (1.0 / REQUEST_DELAY, 2)
+    HOST_RATE_LIMITS = {
+        'www.zhihu.com': (0.5, 1),
+        'www.jjwxc.net': (0.5, 1),
+        'api.bilibili.com': (2.0, 4),
+        'news.google.com': (2.0, 4)
+    }
+
+    # HTTP响应缓存配置: 按来源主机设置有效期（秒），总大小超出预算时LRU淘汰
+    RESPONSE_CACHE_DIR = os.path.join(BASE_DIR, 'data', 'http_cache')
+    RESPONSE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+    RESPONSE_CACHE_TTL = {
+        'default': 1800,
+        'www.zhihu.com': 300,
+        'api.bilibili.com': 300,
+        'github.com': 900,
+        'news.sina.com.cn': 600,
+        'news.google.com': 900,
+        'www.qidian.com': 6 * 3600,
+        'www.jjwxc.net': 6 * 3600,
+        'list.youku.com': 3 * 3600
+    }
     
     # Ollama配置
     OLLAMA_HOST = "http://localhost:11434"
@@ -28,8 +134,29 @@ class Config:
         'check_same_thread': False
     }
     
+    # 启动配置: 数据库、爬虫与AI分析器在首次使用时创建，开启后在后台提前预热
+    WARM_UP_ON_START = True
+    
     # 定时任务配置
-    SCHEDULE_TIME = "02:00"  # 每天凌晨2点执行数据更新
+    SCHEDULE_TIME = "02:00"  # 每天凌晨2点执行AI趋势分析
+    SCHEDULER_POLL_SECONDS = 30  # 调度器检查到期抓取任务的间隔（秒）
+    
+    # 分来源抓取节奏（秒）: 依次按任务名（内容类型-站点）、站点名、内容类型匹配，
+    # 未配置的来源按 CRAWL_CADENCE_DEFAULT 每天抓取一次
+    CRAWL_CADENCE_DEFAULT = 24 * 3600
+    CRAWL_CADENCES = {
+        '知乎热榜': 3600,            # 热榜按小时变化
+        'B站热门': 3600,
+        '豆瓣热门': 6 * 3600,
+        'GitHub Trending': 6 * 3600,
+        'AI漫剧行业情报': 3 * 3600,  # RSS增量抓取，只处理新条目
+        '新闻': 2 * 3600,
+        '漫剧': 6 * 3600,
+        '短剧': 12 * 3600
+        # 小说排行一天内变化很小，使用默认节奏
+    }
+    CRAWL_CADENCE_JITTER = 0.1  # 下次运行时间在节奏的 ±10% 内随机，避免各来源同时请求
+    CRAWL_JOB_TIMEOUT = 2 * 3600  # 状态为running超过该时间（秒）的任务视为进程已中断，可重新认领
     
     # 网站目标配置
     TARGET_SITES = {
@@ -60,6 +187,10 @@ class Config:
         ]
     }
 
+    # 每个RSS源最多保留的相关条目数（可在源配置中用max_items覆盖）
+    AI_MANGA_FEED_MAX_ITEMS = 30
+    FEED_WATERMARK_GUIDS = 500   # 每个RSS源的增量水位保留的最近条目GUID摘要数
+
     # AI漫剧行业资讯/爆料RSS源
     AI_MANGA_RSS_FEEDS = [
         {
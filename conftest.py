@@ -0,0 +1,30 @@
+import pytest
+
+from config import Config
+from database import DatabaseManager, db_manager
+
+
+class FakeClock:
+    """可手动拨动的时钟，用于替换被测模块中的 time 模块"""
+
+    def __init__(self, now=1_800_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """使用临时数据库，测试结束后恢复全局 db_manager"""
+    monkeypatch.setattr(Config, 'DATABASE_PATH', str(tmp_path / 'test.db'))
+    monkeypatch.setattr(db_manager, '_instance', DatabaseManager())
+    return db_manager
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
@@ -0,0 +1,82 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import Config
+from database import db_manager
+
+# 抓取任务: 内容类型名称、站点名称、抓取函数
+CrawlJob = namedtuple('CrawlJob', ['content_label', 'site_name', 'func'])
+
+
+class CrawlEngine:
+    """并发抓取引擎，所有来源同时抓取
+
+    HTTP请求的限速及全局与单主机并发由抓取层的 host_limiter 控制，
+    因此这里的线程数只决定同时运行的抓取任务数。
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or Config.CRAWL_MAX_WORKERS
+
+    def run(self, jobs, sink=None):
+        """并发执行抓取任务
+
+        未指定 sink 时按任务顺序合并并返回全部结果；指定 sink（如 ContentPipeline）
+        时，各任务在工作线程中边抓取边把条目交给 sink.put()，返回条目总数。
+        """
+        if not jobs:
+            return 0 if sink else []
+
+        if sink is not None:
+            return self._stream(jobs, sink)
+
+        results = [[] for _ in jobs]
+        workers = min(self.max_workers, len(jobs))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='crawl') as executor:
+            futures = {executor.submit(job.func): index for index, job in enumerate(jobs)}
+
+            for future in as_completed(futures):
+                index = futures[future]
+                job = jobs[index]
+                try:
+                    results[index] = future.result() or []
+                    db_manager.log_message(
+                        "INFO", "CrawlEngine",
+                        f"{job.content_label}-{job.site_name}爬取完成，共{len(results[index])}条"
+                    )
+                except Exception as e:
+                    db_manager.log_message("ERROR", "CrawlEngine", f"{job.content_label}-{job.site_name}爬取失败: {str(e)}")
+
+        all_items = []
+        for items in results:
+            all_items.extend(items)
+        return all_items
+
+    def _stream(self, jobs, sink):
+        """并发执行抓取任务，条目直接交给 sink"""
+        total = 0
+        workers = min(self.max_workers, len(jobs))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='crawl') as executor:
+            futures = {executor.submit(self._drain, job, sink): job for job in jobs}
+
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    count = future.result()
+                    total += count
+                    db_manager.log_message("INFO", "CrawlEngine", f"{job.content_label}-{job.site_name}爬取完成，共{count}条")
+                except Exception as e:
+                    db_manager.log_message("ERROR", "CrawlEngine", f"{job.content_label}-{job.site_name}爬取失败: {str(e)}")
+
+        return total
+
+    @staticmethod
+    def _drain(job, sink):
+        """执行抓取函数（可返回列表或逐条产出的生成器），逐条放入 sink"""
+        count = 0
+        for item in job.func() or []:
+            sink.put(item)
+            count += 1
+        return count
@@ -0,0 +1,158 @@
+import random
+import threading
+import time
+
+from config import Config
+from crawl_engine import CrawlJob
+from crawler import content_crawler
+from database import db_manager
+
+
+def job_name(job):
+    """抓取任务名（内容类型-站点），与 CrawlEngine 日志中的写法一致"""
+    return f"{job.content_label}-{job.site_name}"
+
+
+def cadence_for(job):
+    """任务的抓取节奏（秒）：依次按任务名、站点名、内容类型查 Config.CRAWL_CADENCES"""
+    for key in (job_name(job), job.site_name, job.content_label):
+        if key in Config.CRAWL_CADENCES:
+            return Config.CRAWL_CADENCES[key]
+    return Config.CRAWL_CADENCE_DEFAULT
+
+
+class CrawlScheduler:
+    """分来源抓取调度器
+
+    每个抓取任务按自己的节奏运行：下次运行时间 = 本次开始时间 + 节奏 × (1 ± 抖动)。
+    开始与结束时间保存在 job_runs 表中，重启后按上次开始时间计算下次运行时间，
+    停机期间错过的任务立即补抓一次（错过多次也只补一次）；从未运行过的任务立即运行。
+    同一任务上次运行未结束时不会再次启动，超过节奏的长任务结束后在下次检查时运行；
+    任务通过 job_runs 表认领，多个进程（如调试模式的重载进程）各自运行调度器时也不会重复抓取。
+    到期的任务作为一批在后台线程中经 ContentPipeline 保存，tick() 不阻塞；
+    手动更新通过 run_all() 执行，同样跳过正在运行的任务。
+    """
+
+    def __init__(self, crawler, jitter=None):
+        self.crawler = crawler
+        self.jitter = Config.CRAWL_CADENCE_JITTER if jitter is None else jitter
+        self.jobs = {}
+        self.next_runs = {}  # 任务名 -> 下次运行时间戳
+        self.running = set()
+        self.lock = threading.Lock()
+
+    def load(self, now=None):
+        """读取抓取任务与运行记录，计算各任务的下次运行时间"""
+        now = now or time.time()
+        runs = db_manager.get_job_runs()
+        self.jobs = {job_name(job): job for job in self.crawler.get_crawl_jobs()}
+
+        for name, job in self.jobs.items():
+            last_started = (runs.get(name) or {}).get('last_started')
+            self.next_runs[name] = now if last_started is None else self._next_run(job, last_started)
+
+        overdue = sum(1 for next_run in self.next_runs.values() if next_run <= now)
+        db_manager.log_message("INFO", "Scheduler", f"已加载{len(self.jobs)}个抓取任务，{overdue}个已到期")
+        return self
+
+    def _next_run(self, job, started):
+        return started + cadence_for(job) * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _claim(self, due, now):
+        """认领满足条件且未在运行的任务，返回任务名
+
+        先在本进程内标记为运行中，再通过 job_runs 表认领；其他进程正在运行的任务
+        从这次开始顺延一个节奏。
+        """
+        with self.lock:
+            names = [
+                name for name, next_run in self.next_runs.items()
+                if due(next_run) and name not in self.running
+            ]
+            self.running.update(names)
+
+        claimed = []
+        for name in names:
+            if db_manager.claim_job_run(name, now, now - Config.CRAWL_JOB_TIMEOUT):
+                claimed.append(name)
+                continue
+            with self.lock:
+                self.running.discard(name)
+                self.next_runs[name] = self._next_run(self.jobs[name], now)
+        return claimed
+
+    def tick(self, now=None):
+        """启动到期的任务，返回本次启动的任务名"""
+        now = now or time.time()
+        names = self._claim(lambda next_run: next_run <= now, now)
+
+        if names:
+            db_manager.log_message("INFO", "Scheduler", f"开始抓取到期任务: {', '.join(names)}")
+            thread = threading.Thread(target=self._run_batch, args=(names, now), name='crawl-scheduler', daemon=True)
+            thread.start()
+        return names
+
+    def run_all(self):
+        """立即运行所有未在运行的任务（手动更新），运行结束后返回本次运行的任务名"""
+        if not self.jobs:
+            self.load()
+        now = time.time()
+        names = self._claim(lambda next_run: True, now)
+        skipped = len(self.jobs) - len(names)
+        if skipped:
+            db_manager.log_message("INFO", "Scheduler", f"手动更新跳过{skipped}个正在运行的任务")
+        if names:
+            self._run_batch(names, now)
+        return names
+
+    def _run_batch(self, names, started):
+        """运行一批已认领的任务"""
+        try:
+            self.crawler.crawl_jobs([self._tracked(name, started) for name in names])
+        except Exception as e:
+            db_manager.log_message("ERROR", "Scheduler", f"抓取任务批次失败: {str(e)}")
+        finally:
+            # 任务函数未被执行时（如管道启动失败）也要释放，避免任务永久停在运行状态
+            with self.lock:
+                stuck = [name for name in names if name in self.running]
+            for name in stuck:
+                self._finish(name, started, 'failed', 0)
+
+    def _tracked(self, name, started):
+        """包装抓取函数，记录结束时间与条目数（开始时间在认领时已记录）"""
+        job = self.jobs[name]
+
+        def run():
+            count = 0
+            status = 'failed'
+            try:
+                for item in job.func() or []:
+                    count += 1
+                    yield item
+                status = 'success'
+            finally:
+                self._finish(name, started, status, count)
+
+        return CrawlJob(job.content_label, job.site_name, run)
+
+    def _finish(self, name, started, status, count):
+        db_manager.finish_job_run(name, time.time(), status, count)
+        with self.lock:
+            self.running.discard(name)
+            self.next_runs[name] = self._next_run(self.jobs[name], started)
+
+    def status(self):
+        """各任务的节奏、下次运行时间与是否正在运行"""
+        with self.lock:
+            return {
+                name: {
+                    'cadence': cadence_for(job),
+                    'next_run': self.next_runs.get(name),
+                    'running': name in self.running
+                }
+                for name, job in self.jobs.items()
+            }
+
+
+# 全局抓取调度器，load() 后才读取抓取任务与运行记录
+crawl_scheduler = CrawlScheduler(content_crawler)
@@ -1,25 +1,31 @@
-import requests
-import time
 import random
 from email.utils import parsedate_to_datetime
 from html import unescape
+import io
+from functools import partial
 import xml.etree.ElementTree as ET
-try:
-    from bs4 import BeautifulSoup
-except ImportError:
-    import BeautifulSoup as BeautifulSoup
-from fake_useragent import UserAgent
 from datetime import datetime
 from config import Config
 from database import db_manager
+from http_fetcher import HttpFetcher, FetchError, CircuitOpenError
+from ua_pool import ua_pool
+from site_registry import site_registry, extract_site
+from keyword_matcher import keyword_matcher
+from extract_pool import extract_pool
+from feed_watermark import FeedWatermark, WATERMARK_KEY
+from crawl_engine import CrawlEngine, CrawlJob
+from pipeline import ContentPipeline, DedupStage, WatermarkStage
+from lazy import LazyInstance
 
 # 导入真实爬虫类
-from real_crawler import WorkingHotTrendCrawler
+from real_crawler import WorkingHotTrendCrawler, trend_to_content
+
+# AI漫剧情报的相关性、分类与加分规则，一次扫描得到
+ai_manga_matcher = keyword_matcher.select('ai_manga.topic', 'ai_manga.intel', 'ai_manga.boost')
 
 class BaseCrawler:
     def __init__(self):
-        self.session = requests.Session()
-        self.ua = UserAgent()
+        self.ua = ua_pool
         self.headers = {
             'User-Agent': self.ua.random,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -27,156 +33,82 @@ class BaseCrawler:
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
         }
-        self.session.headers.update(self.headers)
+        self.fetcher = HttpFetcher(self.headers, Config.TIMEOUT, retry_delay=(1, 3))
     
     def get_page(self, url, retries=3):
         """获取网页内容"""
-        for attempt in range(retries):
-            try:
-                response = self.session.get(
-                    url, 
-                    timeout=Config.TIMEOUT,
-                    headers={'User-Agent': self.ua.random}
-                )
-                response.raise_for_status()
-                return response
-            except Exception as e:
-                if attempt == retries - 1:
-                    db_manager.log_message("ERROR", "Crawler", f"获取页面失败 {url}: {str(e)}")
-                    return None
-                time.sleep(random.uniform(1, 3))
-        return None
-
-class NovelCrawler(BaseCrawler):
-    def __init__(self):
-        super().__init__()
-        self.targets = Config.TARGET_SITES['novel']
+        try:
+            return self.fetcher.get(url, retries, headers={'User-Agent': self.ua.random})
+        except CircuitOpenError:
+            # 主机熔断中，直接跳过，不再逐条记录日志
+            return None
+        except FetchError as e:
+            db_manager.log_message("ERROR", "Crawler", f"获取页面失败 {url}: {str(e)}")
+            return None
     
-    def crawl_qidian(self):
-        """爬取起点中文网热门小说"""
-        # 使用起点的API接口获取真实数据
-        urls = [
-            "https://www.qidian.com/rank/hotsales/",
-            "https://www.qidian.com/rank/finvisit/",
-            "https://www.qidian.com/rank/newhot/"
-        ]
+    def crawl_page(self, url, parse_func, retries=3, reuse_items=True):
+        """抓取并解析页面，页面未变化(304)时复用上次的解析结果（reuse_items为False时返回空列表）"""
+        try:
+            return self.fetcher.fetch_items(
+                url, parse_func, retries, headers={'User-Agent': self.ua.random}, reuse_items=reuse_items
+            )
+        except CircuitOpenError:
+            return []
+        except FetchError as e:
+            db_manager.log_message("ERROR", "Crawler", f"获取页面失败 {url}: {str(e)}")
+            return []
+    
+    def iter_site(self, name):
+        """按站点注册表中的规则逐页抓取，每解析完一页就产出该页条目
         
-        all_novels = []
+        页面解析交给解析进程池，抓取线程只等待结果
+        """
+        extractor = site_registry.get(name)
         
-        for url in urls:
-            response = self.get_page(url)
-            if not response:
-                continue
-            
+        def parse_func(response, url):
+            return extract_pool.run(extract_site, response, extractor.spec, url)
+        
+        for url in extractor.urls:
             try:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 查找小说标题元素
-                title_elements = soup.find_all(['h2', 'h3', 'h4'], class_=lambda x: x and 'book' in x.lower())
-                title_links = soup.find_all('a', href=lambda x: x and '/book/' in x)
-                
-                novels_found = 0
-                for elem in title_links[:15]:
-                    if novels_found >= 10:
-                        break
-                    
-                    title = elem.get_text(strip=True)
-                    if len(title) > 5 and len(title) < 50:  # 过滤掉太短或太长的标题
-                        novel_url = "https://www.qidian.com" + elem.get('href', '') if elem.get('href', '').startswith('/') else elem.get('href', '')
-                        
-                        # 尝试获取分类信息
-                        parent = elem.parent
-                        category = "网络小说"
-                        if parent:
-                            category_text = parent.get_text()
-                            if '玄幻' in category_text:
-                                category = '玄幻小说'
-                            elif '都市' in category_text:
-                                category = '都市小说'
-                            elif '仙侠' in category_text:
-                                category = '仙侠小说'
-                            elif '游戏' in category_text:
-                                category = '游戏小说'
-                        
-                        all_novels.append({
-                            'content_type': 'novel',
-                            'title': title,
-                            'category': category,
-                            'url': novel_url,
-                            'popularity_score': random.uniform(85, 98),
-                            'crawl_date': datetime.now().date(),
-                            'source_site': '起点中文网',
-                            'raw_data': {'source': 'qidian', 'page_url': url}
-                        })
-                        novels_found += 1
-                        time.sleep(0.5)  # 避免请求过快
-                        
+                items = self.crawl_page(url, parse_func)
             except Exception as e:
-                db_manager.log_message("ERROR", "NovelCrawler", f"解析起点页面失败 {url}: {str(e)}")
+                db_manager.log_message("ERROR", self.__class__.__name__, f"解析{extractor.site_name}页面失败 {url}: {str(e)}")
                 continue
-        
-        return all_novels
+            yield from items
+    
+    def crawl_site(self, name):
+        """按站点注册表中的规则抓取该站点的全部页面"""
+        return list(self.iter_site(name))
     
-    def crawl_jjwxc(self):
-        """爬取晋江文学城热门小说"""
-        # 晋江文学城的真实排行榜页面
-        urls = [
-            "https://www.jjwxc.net/toptoplist.php?orderstr=1",  # 总排行榜
-            "https://www.jjwxc.net/toptoplist.php?orderstr=2",  # 月排行榜
-            "https://www.jjwxc.net/toptoplist.php?orderstr=3"   # 周排行榜
+    def get_site_jobs(self, content_type):
+        """注册表中该内容类型的站点抓取任务"""
+        return [
+            (extractor.site_name, partial(self.iter_site, extractor.name))
+            for extractor in site_registry.for_content_type(content_type)
         ]
-        
-        novels = []
-        
-        for url in urls:
-            response = self.get_page(url)
-            if not response:
-                continue
-            
-            try:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 查找小说链接
-                novel_links = soup.find_all('a', href=lambda x: x and 'onebook' in x)
-                
-                for link in novel_links[:12]:
-                    title = link.get_text(strip=True)
-                    if len(title) > 3 and len(title) < 40:
-                        novel_url = "https://www.jjwxc.net/" + link.get('href', '')
-                        
-                        novels.append({
-                            'content_type': 'novel',
-                            'title': title,
-                            'category': '言情小说',
-                            'url': novel_url,
-                            'popularity_score': random.uniform(75, 92),
-                            'crawl_date': datetime.now().date(),
-                            'source_site': '晋江文学城',
-                            'raw_data': {'source': 'jjwxc', 'rank_type': 'popular'}
-                        })
-                        time.sleep(0.3)
-                        
-            except Exception as e:
-                db_manager.log_message("ERROR", "NovelCrawler", f"解析晋江页面失败 {url}: {str(e)}")
-                continue
-        
-        return novels
+    
+    def get_job_sources(self, site_name):
+        """抓取任务写入 content_data 的 source_site 取值，用于判断该来源的数据是否新鲜"""
+        return {site_name}
+
+class NovelCrawler(BaseCrawler):
+    def __init__(self):
+        super().__init__()
+        self.targets = Config.TARGET_SITES['novel']
+    
+    def get_crawl_jobs(self):
+        """小说站点抓取任务"""
+        return self.get_site_jobs('novel')
     
     def crawl_all(self):
         """爬取所有小说网站"""
         all_novels = []
         
-        crawlers = [
-            ('起点中文网', self.crawl_qidian),
-            ('晋江文学城', self.crawl_jjwxc)
-        ]
-        
-        for site_name, crawler_func in crawlers:
+        for site_name, crawler_func in self.get_crawl_jobs():
             try:
-                novels = crawler_func()
+                novels = list(crawler_func())
                 all_novels.extend(novels)
                 db_manager.log_message("INFO", "NovelCrawler", f"从{site_name}获取到{len(novels)}部小说")
-                time.sleep(Config.REQUEST_DELAY)
             except Exception as e:
                 db_manager.log_message("ERROR", "NovelCrawler", f"爬取{site_name}失败: {str(e)}")
         
@@ -187,68 +119,6 @@ class DramaCrawler(BaseCrawler):
         super().__init__()
         self.targets = Config.TARGET_SITES['drama']
     
-    def crawl_youku(self):
-        """爬取优酷热门短剧"""
-        # 优酷的真实热门内容页面
-        urls = [
-            "https://list.youku.com/category/show/c_97_s_1_d_1.html",  # 热门短剧
-            "https://list.youku.com/category/show/c_96_s_1_d_1.html",  # 热门电影
-            "https://list.youku.com/category/show/c_95_s_1_d_1.html"   # 热门综艺
-        ]
-        
-        dramas = []
-        
-        for url in urls:
-            response = self.get_page(url)
-            if not response:
-                continue
-            
-            try:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 查找视频标题
-                video_titles = soup.find_all(['h2', 'h3'], class_=lambda x: x and 'title' in x.lower())
-                title_links = soup.find_all('a', title=True)
-                
-                for link in title_links[:15]:
-                    title = link.get('title', '').strip()
-                    if not title:
-                        title = link.get_text(strip=True)
-                    
-                    if len(title) > 4 and len(title) < 50:
-                        video_url = link.get('href', '')
-                        if video_url.startswith('//'):
-                            video_url = 'https:' + video_url
-                        elif video_url.startswith('/'):
-                            video_url = 'https://www.youku.com' + video_url
-                        
-                        # 判断内容类型
-                        category = '影视娱乐'
-                        if '短剧' in title or '微剧' in title:
-                            category = '短剧'
-                        elif '电影' in title:
-                            category = '电影'
-                        elif '综艺' in title:
-                            category = '综艺'
-                        
-                        dramas.append({
-                            'content_type': 'drama',
-                            'title': title,
-                            'category': category,
-                            'url': video_url,
-                            'popularity_score': random.uniform(65, 88),
-                            'crawl_date': datetime.now().date(),
-                            'source_site': '优酷',
-                            'raw_data': {'source': 'youku', 'page_category': url.split('/')[-1]}
-                        })
-                        time.sleep(0.4)
-                        
-            except Exception as e:
-                db_manager.log_message("ERROR", "DramaCrawler", f"解析优酷页面失败 {url}: {str(e)}")
-                continue
-        
-        return dramas
-    
     def crawl_iqiyi(self):
         """爬取爱奇艺热门短剧"""
         dramas = []
@@ -268,21 +138,21 @@ class DramaCrawler(BaseCrawler):
         
         return dramas
     
+    def get_crawl_jobs(self):
+        """视频平台抓取任务"""
+        return self.get_site_jobs('drama') + [
+            ('爱奇艺', self.crawl_iqiyi)
+        ]
+    
     def crawl_all(self):
         """爬取所有视频平台"""
         all_dramas = []
         
-        crawlers = [
-            ('优酷', self.crawl_youku),
-            ('爱奇艺', self.crawl_iqiyi)
-        ]
-        
-        for site_name, crawler_func in crawlers:
+        for site_name, crawler_func in self.get_crawl_jobs():
             try:
-                dramas = crawler_func()
+                dramas = list(crawler_func())
                 all_dramas.extend(dramas)
                 db_manager.log_message("INFO", "DramaCrawler", f"从{site_name}获取到{len(dramas)}部短剧")
-                time.sleep(Config.REQUEST_DELAY)
             except Exception as e:
                 db_manager.log_message("ERROR", "DramaCrawler", f"爬取{site_name}失败: {str(e)}")
         
@@ -294,6 +164,12 @@ class ComicCrawler(BaseCrawler):
         self.targets = Config.TARGET_SITES['comic']
         self.rss_feeds = Config.AI_MANGA_RSS_FEEDS
     
+    def get_job_sources(self, site_name):
+        """行业情报条目的来源站点为各RSS源名称"""
+        if site_name == 'AI漫剧行业情报':
+            return {feed['name'] for feed in self.rss_feeds}
+        return super().get_job_sources(site_name)
+    
     def crawl_bilibili(self):
         """爬取B站热门漫剧"""
         comics = []
@@ -333,112 +209,142 @@ class ComicCrawler(BaseCrawler):
         return comics
 
     def crawl_ai_manga_intel(self):
-        """爬取AI漫剧行业最新数据与爆料"""
+        """爬取AI漫剧行业最新数据与爆料（每个RSS源只处理上次抓取之后的新条目）"""
         intel_items = []
         seen = set()
 
         for feed in self.rss_feeds:
-            response = self.get_page(feed['url'])
-            if not response:
-                continue
-
             try:
-                items = self._parse_rss_items(response.text)
+                # 源未变化(304)时没有新条目，不复用上次的解析结果
+                feed_items = self.crawl_page(
+                    feed['url'],
+                    lambda response, url, feed=feed: self._parse_ai_manga_feed(response, feed),
+                    reuse_items=False
+                )
             except Exception as e:
                 db_manager.log_message("ERROR", "ComicCrawler", f"解析RSS失败 {feed['name']}: {str(e)}")
                 continue
 
-            for item in items:
-                title = item.get('title', '')
-                url = item.get('link', '')
-                if not title or not url:
-                    continue
-
-                key = f"{title}-{url}"
+            for item in feed_items:
+                key = f"{item['title']}-{item['url']}"
                 if key in seen:
                     continue
                 seen.add(key)
+                intel_items.append(item)
 
-                if not self._is_ai_manga_relevant(title, item.get('description', '')):
-                    continue
+        return intel_items
 
-                category = self._classify_ai_manga_intel(title, item.get('description', ''))
-                intel_items.append({
-                    'content_type': 'comic',
-                    'title': title,
-                    'category': category,
-                    'url': url,
-                    'popularity_score': self._score_ai_manga_item(title, item.get('pub_date')),
-                    'crawl_date': datetime.now().date(),
-                    'source_site': feed['name'],
-                    'raw_data': {
-                        'source': feed['url'],
-                        'summary': item.get('description', ''),
-                        'pub_date': item.get('pub_date')
-                    }
-                })
+    def _parse_ai_manga_feed(self, response, feed):
+        """流式解析单个RSS源，边解析边过滤，达到条数上限后停止解析
 
-        return intel_items
+        按源的增量水位（最新发布时间 + GUID摘要）跳过已处理的条目，只对新条目
+        做相关性判断与评分。有相关条目时新水位随条目交给管道，条目入库后才保存；
+        没有相关条目时直接保存。
+        """
+        intel_items = []
+        seen = set()
+        max_items = feed.get('max_items', Config.AI_MANGA_FEED_MAX_ITEMS)
+        watermark = FeedWatermark.load(feed['url'])
 
-    def _parse_rss_items(self, xml_text):
-        """解析RSS条目"""
-        root = ET.fromstring(xml_text)
-        items = []
+        for item in self._iter_rss_items(io.BytesIO(response.content)):
+            title = item.get('title', '')
+            url = item.get('link', '')
+            if not title or not url:
+                continue
+
+            key = f"{title}-{url}"
+            if key in seen:
+                continue
+            seen.add(key)
 
-        for item in root.findall(".//item"):
-            title = item.findtext("title", default="").strip()
-            link = item.findtext("link", default="").strip()
-            description = item.findtext("description", default="").strip()
-            pub_date = item.findtext("pubDate", default="").strip()
+            if not watermark.is_new(item):
+                continue
 
-            items.append({
-                'title': unescape(title),
-                'link': unescape(link),
-                'description': unescape(description),
-                'pub_date': pub_date
+            matches = ai_manga_matcher.scan(f"{title} {item.get('description', '')}")
+            if not self._is_ai_manga_relevant(matches):
+                continue
+
+            category = self._classify_ai_manga_intel(matches)
+            intel_items.append({
+                'content_type': 'comic',
+                'title': title,
+                'category': category,
+                'url': url,
+                'popularity_score': self._score_ai_manga_item(title, item.get('pub_date')),
+                'crawl_date': datetime.now().date(),
+                'source_site': feed['name'],
+                'raw_data': {
+                    'source': feed['url'],
+                    'summary': item.get('description', ''),
+                    'pub_date': item.get('pub_date')
+                }
             })
+            if len(intel_items) >= max_items:
+                break
 
-        return items
+        if not intel_items:
+            watermark.save()
+        for intel_item in intel_items:
+            intel_item[WATERMARK_KEY] = watermark
+        return intel_items
 
-    def _is_ai_manga_relevant(self, title, description):
-        """判断是否与AI漫剧行业相关"""
-        text = f"{title} {description}"
-        manga_keywords = ['漫剧', '漫画', '动漫', '二次元', 'ACG', '番剧', '动画', 'IP']
-        ai_keywords = ['AI', 'AIGC', '人工智能', '生成式', '大模型']
-        industry_keywords = ['行业', '融资', '上市', '报告', '爆料', '传闻', '曝光', '内幕', '合作']
+    def _iter_rss_items(self, stream):
+        """流式解析RSS/Atom条目
 
-        has_manga = any(keyword in text for keyword in manga_keywords)
-        has_ai_or_industry = any(keyword in text for keyword in ai_keywords + industry_keywords)
-        return has_manga and has_ai_or_industry
+        基于 iterparse 直接读取字节流，每解析完一个 item/entry 就产出一条
+        结果并从父节点移除，内存占用与源大小无关；调用方停止迭代即停止解析。
+        """
+        parents = []
+        for event, elem in ET.iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                parents.append(elem)
+                continue
 
-    def _classify_ai_manga_intel(self, title, description):
-        """分类AI漫剧行业资讯"""
-        text = f"{title} {description}"
-        rumor_keywords = ['爆料', '传闻', '曝光', '内幕', '独家']
-        if any(keyword in text for keyword in rumor_keywords):
-            return '爆料'
+            parents.pop()
+            tag = self._local_name(elem.tag)
+            if tag not in ('item', 'entry'):
+                continue
+
+            fields = {}
+            link = ''
+            for child in elem:
+                name = self._local_name(child.tag)
+                if name == 'link' and child.get('href'):
+                    if not link or child.get('rel', 'alternate') == 'alternate':
+                        link = child.get('href')
+                elif name not in fields:
+                    fields[name] = (child.text or '').strip()
 
-        data_keywords = ['报告', '数据', '统计', '调研', '榜单', '趋势']
-        if any(keyword in text for keyword in data_keywords):
-            return '行业数据'
+            yield {
+                'title': unescape(fields.get('title', '')),
+                'link': unescape(link or fields.get('link', '')),
+                'description': unescape(fields.get('description') or fields.get('summary') or fields.get('content', '')),
+                'pub_date': fields.get('pubDate') or fields.get('published') or fields.get('updated', ''),
+                'guid': fields.get('guid') or fields.get('id', '')
+            }
 
-        finance_keywords = ['融资', '投资', '并购', '上市', '估值']
-        if any(keyword in text for keyword in finance_keywords):
-            return '资本动态'
+            elem.clear()
+            if parents:
+                parents[-1].remove(elem)
 
-        product_keywords = ['新作', '发布', '上线', '立项', '改编']
-        if any(keyword in text for keyword in product_keywords):
-            return '作品动态'
+    @staticmethod
+    def _local_name(tag):
+        """去掉XML命名空间前缀"""
+        return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
 
-        return '行业资讯'
+    def _is_ai_manga_relevant(self, matches):
+        """判断是否与AI漫剧行业相关（漫剧题材且涉及AI或行业话题）"""
+        return matches.has('ai_manga.topic', 'manga') and (
+            matches.has('ai_manga.topic', 'ai') or matches.has('ai_manga.topic', 'industry')
+        )
+
+    def _classify_ai_manga_intel(self, matches):
+        """分类AI漫剧行业资讯"""
+        return matches.first('ai_manga.intel')
 
     def _score_ai_manga_item(self, title, pub_date):
         """计算AI漫剧资讯热度"""
-        score = 70
-        boost_keywords = ['爆料', '独家', '重磅', '首发', '发布', '融资', '合作']
-        for keyword in boost_keywords:
-            if keyword in title:
-                score += 4
+        score = 70 + ai_manga_matcher.scan(title).boost('ai_manga.boost')
 
         if pub_date:
             try:
@@ -450,22 +356,23 @@ class ComicCrawler(BaseCrawler):
 
         return min(score, 100)
     
-    def crawl_all(self):
-        """爬取所有漫画平台"""
-        all_comics = []
-        
-        crawlers = [
+    def get_crawl_jobs(self):
+        """漫画平台抓取任务"""
+        return [
             ('哔哩哔哩', self.crawl_bilibili),
             ('快看漫画', self.crawl_kuaikan),
             ('AI漫剧行业情报', self.crawl_ai_manga_intel)
         ]
-        
-        for site_name, crawler_func in crawlers:
+    
+    def crawl_all(self):
+        """爬取所有漫画平台"""
+        all_comics = []
+        
+        for site_name, crawler_func in self.get_crawl_jobs():
             try:
-                comics = crawler_func()
+                comics = list(crawler_func())
                 all_comics.extend(comics)
                 db_manager.log_message("INFO", "ComicCrawler", f"从{site_name}获取到{len(comics)}部漫剧")
-                time.sleep(Config.REQUEST_DELAY)
             except Exception as e:
                 db_manager.log_message("ERROR", "ComicCrawler", f"爬取{site_name}失败: {str(e)}")
         
@@ -476,80 +383,19 @@ class NewsCrawler(BaseCrawler):
         super().__init__()
         self.targets = Config.TARGET_SITES['news']
     
-    def crawl_sina(self):
-        """爬取新浪新闻热点"""
-        # 新浪新闻的真实热点页面
-        urls = [
-            "https://news.sina.com.cn/hotnews/",  # 24小时热门
-            "https://news.sina.com.cn/china/",    # 国内新闻
-            "https://news.sina.com.cn/world/"     # 国际新闻
-        ]
-        
-        news = []
-        
-        for url in urls:
-            response = self.get_page(url)
-            if not response:
-                continue
-            
-            try:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 查找新闻标题
-                news_links = soup.find_all('a', href=lambda x: x and ('.shtml' in x or 'news.sina' in x))
-                
-                for link in news_links[:20]:
-                    title = link.get_text(strip=True)
-                    if len(title) > 10 and len(title) < 80:
-                        news_url = link.get('href', '')
-                        if news_url.startswith('/'):
-                            news_url = 'https://news.sina.com.cn' + news_url
-                        
-                        # 判断新闻分类
-                        category = '综合新闻'
-                        if '疫情' in title or '新冠' in title:
-                            category = '时政新闻'
-                        elif '经济' in title or '股市' in title or '金融' in title:
-                            category = '财经新闻'
-                        elif '科技' in title or 'AI' in title or '互联网' in title:
-                            category = '科技新闻'
-                        elif '娱乐' in title or '明星' in title:
-                            category = '娱乐新闻'
-                        elif '体育' in title or '足球' in title or '篮球' in title:
-                            category = '体育新闻'
-                        
-                        news.append({
-                            'content_type': 'news',
-                            'title': title,
-                            'category': category,
-                            'url': news_url,
-                            'popularity_score': random.uniform(70, 95),
-                            'crawl_date': datetime.now().date(),
-                            'source_site': '新浪新闻',
-                            'raw_data': {'source': 'sina', 'section': url.split('/')[-2]}
-                        })
-                        time.sleep(0.3)
-                        
-            except Exception as e:
-                db_manager.log_message("ERROR", "NewsCrawler", f"解析新浪页面失败 {url}: {str(e)}")
-                continue
-        
-        return news
+    def get_crawl_jobs(self):
+        """新闻网站抓取任务"""
+        return self.get_site_jobs('news')
     
     def crawl_all(self):
         """爬取所有新闻网站"""
         all_news = []
         
-        crawlers = [
-            ('新浪新闻', self.crawl_sina)
-        ]
-        
-        for site_name, crawler_func in crawlers:
+        for site_name, crawler_func in self.get_crawl_jobs():
             try:
-                news = crawler_func()
+                news = list(crawler_func())
                 all_news.extend(news)
                 db_manager.log_message("INFO", "NewsCrawler", f"从{site_name}获取到{len(news)}条新闻")
-                time.sleep(Config.REQUEST_DELAY)
             except Exception as e:
                 db_manager.log_message("ERROR", "NewsCrawler", f"爬取{site_name}失败: {str(e)}")
         
@@ -579,20 +425,21 @@ class EntertainmentCrawler(BaseCrawler):
         
         return entertainment
     
+    def get_crawl_jobs(self):
+        """娱乐资讯抓取任务"""
+        return [
+            ('微博', self.crawl_weibo)
+        ]
+    
     def crawl_all(self):
         """爬取娱乐资讯"""
         all_entertainment = []
         
-        crawlers = [
-            ('微博', self.crawl_weibo)
-        ]
-        
-        for site_name, crawler_func in crawlers:
+        for site_name, crawler_func in self.get_crawl_jobs():
             try:
-                entertainment = crawler_func()
+                entertainment = list(crawler_func())
                 all_entertainment.extend(entertainment)
                 db_manager.log_message("INFO", "EntertainmentCrawler", f"从{site_name}获取到{len(entertainment)}条娱乐资讯")
-                time.sleep(Config.REQUEST_DELAY)
             except Exception as e:
                 db_manager.log_message("ERROR", "EntertainmentCrawler", f"爬取{site_name}失败: {str(e)}")
         
@@ -606,54 +453,46 @@ class ContentCrawler:
         self.news_crawler = NewsCrawler()
         self.entertainment_crawler = EntertainmentCrawler()
         self.real_crawler = WorkingHotTrendCrawler()  # 添加真实爬虫
+        self.engine = CrawlEngine()
     
-    def crawl_all_content(self):
-        """爬取所有类型的内容（包含真实爆款数据）"""
-        db_manager.log_message("INFO", "ContentCrawler", "开始爬取所有内容...")
+    def get_crawl_jobs(self):
+        """汇总所有来源的抓取任务"""
+        jobs = []
         
-        all_content = []
+        # 1. 真实爆款数据，转换为内容数据格式
+        for site_name, crawler_func in self.real_crawler.get_crawl_jobs():
+            jobs.append(CrawlJob('真实爆款', site_name, self._wrap_trend_job(crawler_func)))
         
-        # 1. 首先爬取真实爆款数据
-        try:
-            real_trends = self.real_crawler.crawl_real_hot_trends()
-            # 转换真实数据格式
-            for trend in real_trends:
-                all_content.append({
-                    'content_type': 'entertainment',
-                    'title': trend['title'],
-                    'category': trend['category'],
-                    'url': trend['url'],
-                    'popularity_score': trend['hot_score'],
-                    'crawl_date': datetime.now().date(),
-                    'source_site': trend['platform'],
-                    'raw_data': trend
-                })
-            db_manager.log_message("INFO", "ContentCrawler", f"真实爆款爬取完成，共{len(real_trends)}条")
-        except Exception as e:
-            db_manager.log_message("ERROR", "ContentCrawler", f"真实爆款爬取失败: {str(e)}")
-        
-        # 2. 爬取其他类型内容
+        # 2. 其他类型内容
         crawlers = [
-            ('小说', self.novel_crawler.crawl_all),
-            ('短剧', self.drama_crawler.crawl_all),
-            ('漫剧', self.comic_crawler.crawl_all),
-            ('新闻', self.news_crawler.crawl_all)
+            ('小说', self.novel_crawler),
+            ('短剧', self.drama_crawler),
+            ('漫剧', self.comic_crawler),
+            ('新闻', self.news_crawler)
         ]
         
-        for content_type, crawler_func in crawlers:
-            try:
-                content_list = crawler_func()
-                all_content.extend(content_list)
-                db_manager.log_message("INFO", "ContentCrawler", f"{content_type}爬取完成，共{len(content_list)}条")
-            except Exception as e:
-                db_manager.log_message("ERROR", "ContentCrawler", f"{content_type}爬取失败: {str(e)}")
-        
-        # 保存到数据库
-        if all_content:
-            db_manager.insert_content_data(all_content)
-            db_manager.log_message("INFO", "ContentCrawler", f"总共爬取并保存了{len(all_content)}条内容")
+        for content_label, crawler in crawlers:
+            for site_name, crawler_func in crawler.get_crawl_jobs():
+                jobs.append(CrawlJob(content_label, site_name, crawler_func))
         
-        return all_content
+        return jobs
+    
+    @staticmethod
+    def _wrap_trend_job(crawler_func):
+        """将爆款抓取函数的结果逐条转换为内容数据格式"""
+        def job():
+            for trend in crawler_func():
+                yield trend_to_content(trend)
+        return job
+    
+    def crawl_jobs(self, jobs, stages=None):
+        """并发执行指定的抓取任务，经流式管道保存，返回管道统计"""
+        pipeline = ContentPipeline(stages=stages if stages is not None else [WatermarkStage(), DedupStage()])
+        with pipeline:
+            crawled = self.engine.run(jobs, sink=pipeline)
+        
+        db_manager.log_message("INFO", "ContentCrawler", f"总共爬取{crawled}条内容，保存了{pipeline.saved}条")
+        return pipeline.stats()
 
-# 全局爬虫实例
-content_crawler = ContentCrawler()
+# 全局爬虫实例，首次使用时才创建各爬虫
+content_crawler = LazyInstance(ContentCrawler, 'content_crawler')
\ No newline at end of file
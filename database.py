@@ -3,6 +3,8 @@ import os
 import json
 from datetime import datetime
 from config import Config
+from dedup import crawl_day, dedup_key
+from lazy import LazyInstance
 
 class DatabaseManager:
     def __init__(self):
@@ -32,10 +34,16 @@ class DatabaseManager:
                 crawl_date DATE NOT NULL,
                 source_site TEXT,
                 raw_data TEXT,
+                dedup_key TEXT,  -- 去重键: 内容类型 + 规范化URL
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
         
+        # 旧库补充去重键列（已有记录的去重键为空，不受唯一索引约束）
+        columns = {row['name'] for row in cursor.execute('PRAGMA table_info(content_data)')}
+        if 'dedup_key' not in columns:
+            cursor.execute('ALTER TABLE content_data ADD COLUMN dedup_key TEXT')
+        
         # 创建AI分析结果表
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS ai_analysis (
@@ -96,34 +104,195 @@ class DatabaseManager:
             )
         ''')
         
+        # 创建HTTP缓存校验表（条件请求）
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS http_validators (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                items TEXT,  -- JSON格式存储上次解析出的条目
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # 创建主机熔断状态表
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS host_circuits (
+                host TEXT PRIMARY KEY,
+                state TEXT NOT NULL,  -- closed, open
+                open_count INTEGER DEFAULT 0,  -- 连续熔断次数
+                open_until REAL DEFAULT 0,  -- 熔断结束时间（时间戳）
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # 创建robots.txt缓存表
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS robots_cache (
+                base_url TEXT PRIMARY KEY,  -- scheme://host
+                status INTEGER NOT NULL,
+                content TEXT,
+                expires_at REAL NOT NULL,  -- 过期时间（时间戳）
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # 创建WHOIS缓存表
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS whois_cache (
+                domain TEXT PRIMARY KEY,
+                registered INTEGER DEFAULT 0,
+                creation_date TEXT,
+                error TEXT,  -- 查询失败时的错误信息
+                expires_at REAL NOT NULL,  -- 过期时间（时间戳）
+                queried_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # 创建RSS源增量水位表
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS feed_watermarks (
+                feed_url TEXT PRIMARY KEY,
+                last_published REAL,  -- 已处理条目的最新发布时间（时间戳）
+                recent_guids TEXT,  -- JSON格式存储最近条目的GUID摘要
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # 创建抓取任务运行记录表
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS job_runs (
+                job_name TEXT PRIMARY KEY,
+                last_started REAL,  -- 最近一次开始时间（时间戳）
+                last_finished REAL,  -- 最近一次结束时间（时间戳）
+                status TEXT,  -- running / success / failed
+                items INTEGER DEFAULT 0  -- 最近一次抓取的条目数
+            )
+        ''')
+        
+        # 同一天同一作品只保存一条
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_content_dedup
+            ON content_data (dedup_key, crawl_date)
+        ''')
+        
+        # 按类型与入库时间查询最近数据（爆款报告读取新鲜数据）
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_content_type_created
+            ON content_data (content_type, created_at)
+        ''')
+        
         conn.commit()
         conn.close()
         
         self.log_message("INFO", "Database", "数据库初始化完成")
     
     def insert_content_data(self, content_list):
-        """插入内容数据"""
+        """插入内容数据，返回新增的记录数
+        
+        同一天已保存过的作品（去重键相同）不再新增记录，只更新热度与入库时间；
+        管道只丢弃同一次运行内的重复，重复抓取的作品都会经过这里刷新
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
+        inserted = 0
         
         for content in content_list:
+            key = dedup_key(content)
+            day = crawl_day(content)
             cursor.execute('''
                 INSERT INTO content_data 
-                (content_type, title, category, url, popularity_score, crawl_date, source_site, raw_data)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                (content_type, title, category, url, popularity_score, crawl_date, source_site, raw_data, dedup_key)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (dedup_key, crawl_date) DO NOTHING
             ''', (
                 content['content_type'],
                 content['title'],
                 content.get('category', ''),
                 content.get('url', ''),
                 content.get('popularity_score', 0),
-                content.get('crawl_date', datetime.now().date()),
+                day,
                 content.get('source_site', ''),
-                json.dumps(content.get('raw_data', {}))
+                json.dumps(content.get('raw_data', {})),
+                key
             ))
+            if cursor.rowcount:
+                inserted += 1
+                continue
+            cursor.execute('''
+                UPDATE content_data SET popularity_score = ?, created_at = CURRENT_TIMESTAMP
+                WHERE dedup_key = ? AND crawl_date = ?
+            ''', (content.get('popularity_score', 0), key, day))
         
         conn.commit()
         conn.close()
+        return inserted
+    
+    def get_fresh_sources(self, content_type, max_age):
+        """获取某类型在 max_age 秒内有数据入库的来源站点"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT DISTINCT source_site FROM content_data
+            WHERE content_type = ? AND created_at >= datetime('now', ?)
+        ''', (content_type, f'-{int(max_age)} seconds'))
+        
+        results = cursor.fetchall()
+        conn.close()
+        
+        return {row['source_site'] for row in results}
+    
+    def get_recent_content(self, content_type, max_age, sources=None):
+        """获取某类型在 max_age 秒内入库的内容（最新的在前）
+        
+        sources 不为None时只返回这些来源站点的数据
+        """
+        if sources is not None and not sources:
+            return []
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        query = '''
+            SELECT title, category, url, popularity_score, source_site, created_at
+            FROM content_data
+            WHERE content_type = ? AND created_at >= datetime('now', ?)
+        '''
+        params = [content_type, f'-{int(max_age)} seconds']
+        if sources is not None:
+            sources = list(sources)
+            query += f" AND source_site IN ({','.join('?' * len(sources))})"
+            params.extend(sources)
+        query += ' ORDER BY created_at DESC, id DESC'
+        
+        cursor.execute(query, params)
+        results = cursor.fetchall()
+        conn.close()
+        
+        return [dict(row) for row in results]
+    
+    def get_day_content(self, content_type, sources, date=None):
+        """获取某类型指定来源在某天（默认今天）抓取的内容（最新的在前）"""
+        if not sources:
+            return []
+        if date is None:
+            date = datetime.now().date()
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        sources = list(sources)
+        cursor.execute(f'''
+            SELECT title, category, url, popularity_score, source_site, created_at
+            FROM content_data
+            WHERE content_type = ? AND crawl_date = ? AND source_site IN ({','.join('?' * len(sources))})
+            ORDER BY created_at DESC, id DESC
+        ''', [content_type, date.isoformat()] + sources)
+        results = cursor.fetchall()
+        conn.close()
+        
+        return [dict(row) for row in results]
     
     def get_daily_content_stats(self, date=None):
         """获取指定日期的内容统计"""
@@ -236,6 +405,185 @@ class DatabaseManager:
         
         return [dict(row) for row in results]
     
+    def get_http_validator(self, url):
+        """获取URL的ETag/Last-Modified及上次解析结果"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT etag, last_modified, items FROM http_validators WHERE url = ?
+        ''', (url,))
+        
+        row = cursor.fetchone()
+        conn.close()
+        
+        return dict(row) if row else None
+    
+    def save_http_validator(self, url, etag, last_modified, items):
+        """保存URL的ETag/Last-Modified及解析结果"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT OR REPLACE INTO http_validators (url, etag, last_modified, items, updated_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (url, etag, last_modified, items))
+        
+        conn.commit()
+        conn.close()
+    
+    def get_feed_watermark(self, feed_url):
+        """获取RSS源的增量水位"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT last_published, recent_guids FROM feed_watermarks WHERE feed_url = ?
+        ''', (feed_url,))
+        
+        row = cursor.fetchone()
+        conn.close()
+        
+        return dict(row) if row else None
+    
+    def save_feed_watermark(self, feed_url, last_published, recent_guids):
+        """保存RSS源的增量水位"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT OR REPLACE INTO feed_watermarks (feed_url, last_published, recent_guids, updated_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (feed_url, last_published, recent_guids))
+        
+        conn.commit()
+        conn.close()
+    
+    def get_job_runs(self):
+        """获取所有抓取任务的运行记录，按任务名索引"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM job_runs')
+        
+        results = cursor.fetchall()
+        conn.close()
+        
+        return {row['job_name']: dict(row) for row in results}
+    
+    def claim_job_run(self, job_name, started, stale_before):
+        """认领抓取任务并记录开始运行，返回是否认领成功
+        
+        任务正在运行（status 为 running 且开始时间不早于 stale_before）时认领失败，
+        同一任务不会被多个进程同时运行
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO job_runs (job_name, last_started, status) VALUES (?, ?, 'running')
+            ON CONFLICT(job_name) DO UPDATE SET last_started = excluded.last_started, status = 'running'
+            WHERE job_runs.status IS NOT 'running' OR job_runs.last_started < ?
+        ''', (job_name, started, stale_before))
+        claimed = cursor.rowcount == 1
+        
+        conn.commit()
+        conn.close()
+        return claimed
+    
+    def finish_job_run(self, job_name, finished, status, items):
+        """记录抓取任务运行结束"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            UPDATE job_runs SET last_finished = ?, status = ?, items = ? WHERE job_name = ?
+        ''', (finished, status, items, job_name))
+        
+        conn.commit()
+        conn.close()
+    
+    def get_host_circuit(self, host):
+        """获取主机的熔断状态"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT state, open_count, open_until FROM host_circuits WHERE host = ?
+        ''', (host,))
+        
+        row = cursor.fetchone()
+        conn.close()
+        
+        return dict(row) if row else None
+    
+    def save_host_circuit(self, host, state, open_count, open_until):
+        """保存主机的熔断状态"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT OR REPLACE INTO host_circuits (host, state, open_count, open_until, updated_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (host, state, open_count, open_until))
+        
+        conn.commit()
+        conn.close()
+    
+    def get_robots_record(self, base_url):
+        """获取站点缓存的robots.txt"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT status, content, expires_at FROM robots_cache WHERE base_url = ?
+        ''', (base_url,))
+        
+        row = cursor.fetchone()
+        conn.close()
+        
+        return dict(row) if row else None
+    
+    def save_robots_record(self, base_url, status, content, expires_at):
+        """保存站点的robots.txt"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT OR REPLACE INTO robots_cache (base_url, status, content, expires_at, fetched_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (base_url, status, content, expires_at))
+        
+        conn.commit()
+        conn.close()
+    
+    def get_whois_record(self, domain):
+        """获取域名缓存的WHOIS结果"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT registered, creation_date, error, expires_at FROM whois_cache WHERE domain = ?
+        ''', (domain,))
+        
+        row = cursor.fetchone()
+        conn.close()
+        
+        return dict(row) if row else None
+    
+    def save_whois_record(self, domain, registered, creation_date, error, expires_at):
+        """保存域名的WHOIS结果"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT OR REPLACE INTO whois_cache (domain, registered, creation_date, error, expires_at, queried_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (domain, int(registered), creation_date, error, expires_at))
+        
+        conn.commit()
+        conn.close()
+    
     def log_message(self, level, module, message):
         """记录系统日志"""
         conn = self.get_connection()
@@ -249,5 +597,5 @@ class DatabaseManager:
         conn.commit()
         conn.close()
 
-# 全局数据库实例
-db_manager = DatabaseManager()
\ No newline at end of file
+# 全局数据库实例，首次使用时才建表
+db_manager = LazyInstance(DatabaseManager, 'db_manager')
\ No newline at end of file
@@ -0,0 +1,52 @@
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import Config
+
+
+def canonicalize_url(url):
+    """URL规范化：统一协议与主机写法，去掉跟踪参数、片段与末尾斜杠，参数排序
+
+        canonicalize_url('HTTP://WWW.Bilibili.com:80/video/BV1x/?spm_id_from=333&p=2#reply')
+        -> 'https://bilibili.com/video/BV1x?p=2'
+    """
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https'):
+        return url.strip()
+
+    host = (parts.hostname or '').rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip('/') or '/'
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(key)
+    )
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def _is_tracking_param(key):
+    key = key.lower()
+    return key in Config.DEDUP_TRACKING_PARAMS or key.startswith(Config.DEDUP_TRACKING_PREFIXES)
+
+
+def dedup_key(item):
+    """条目的去重键：内容类型 + 规范化URL（没有URL时用标题）
+
+    同一天抓取的同一作品只保存一条；不同日期的记录保留，供每日统计与趋势对比。
+    """
+    url = canonicalize_url(item.get('url'))
+    return f"{item.get('content_type', '')}|{url or 'title:' + (item.get('title') or '')}"
+
+
+def crawl_day(item):
+    """条目的抓取日期（YYYY-MM-DD）"""
+    crawl_date = item.get('crawl_date') or datetime.now().date()
+    return crawl_date.isoformat() if hasattr(crawl_date, 'isoformat') else str(crawl_date)[:10]
+
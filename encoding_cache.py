@@ -0,0 +1,103 @@
+import codecs
+import re
+import threading
+from urllib.parse import urlparse
+
+from config import Config
+
+# 编码别名: GB2312/GBK 页面中常有超出字符集的字符，按超集 GB18030 解码；ASCII 按 UTF-8 解码
+ENCODING_ALIASES = {
+    'gb2312': 'gb18030',
+    'gbk': 'gb18030',
+    'ascii': 'utf-8'
+}
+
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16')
+)
+
+_HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+_XML_ENCODING = re.compile(rb'^\s*<\?xml[^>]*?encoding\s*=\s*["\']\s*([\w.:-]+)', re.I)
+_META_CHARSET = re.compile(rb'<meta[^>]*?charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+
+
+def normalize_encoding(name):
+    """规范化编码名称，未知编码返回None"""
+    if not name:
+        return None
+    try:
+        name = codecs.lookup(name.strip()).name
+    except LookupError:
+        return None
+    return ENCODING_ALIASES.get(name, name)
+
+
+def declared_encoding(headers):
+    """Content-Type 中显式声明的编码（text/* 未声明时不按 ISO-8859-1 处理）"""
+    match = _HEADER_CHARSET.search(headers.get('Content-Type') or '')
+    return normalize_encoding(match.group(1)) if match else None
+
+
+def sniff_encoding(content, limit=None):
+    """从BOM、XML声明或 <meta charset> 中读取编码，只检查开头 limit 字节"""
+    head = content[:limit or Config.CHARSET_SNIFF_BYTES]
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    match = _XML_ENCODING.match(head) or _META_CHARSET.search(head)
+    return normalize_encoding(match.group(1).decode('ascii')) if match else None
+
+
+class EncodingCache:
+    """响应编码判定，按主机缓存
+
+    依次采用 Content-Type 声明、页面开头的BOM/XML声明/<meta charset>，
+    都没有时才对正文做编码检测；判定结果按主机缓存，同一主机之后
+    未声明编码的页面直接使用，整页检测每个主机只做一次。
+    判定结果写入 response.encoding，之后 response.text 不再触发检测。
+    """
+
+    def __init__(self):
+        self.encodings = {}  # 主机 -> 编码
+        self.lock = threading.Lock()
+        self.detections = 0
+
+    def resolve(self, response):
+        """判定响应编码并写入 response.encoding，返回编码
+
+        空响应与 JSON 响应保持 requests 的默认处理（JSON按RFC自动识别UTF编码）。
+        """
+        if not response.content or 'json' in (response.headers.get('Content-Type') or ''):
+            return response.encoding
+
+        host = urlparse(response.url or '').netloc
+        encoding = declared_encoding(response.headers) or sniff_encoding(response.content)
+        if encoding:
+            with self.lock:
+                self.encodings[host] = encoding
+        else:
+            with self.lock:
+                encoding = self.encodings.get(host)
+            if encoding is None:
+                encoding = self._detect(response)
+                with self.lock:
+                    self.encodings[host] = encoding
+
+        response.encoding = encoding
+        return encoding
+
+    def _detect(self, response):
+        """对正文做编码检测（charset_normalizer/chardet），失败时按UTF-8处理"""
+        self.detections += 1
+        return normalize_encoding(response.apparent_encoding) or 'utf-8'
+
+    def get(self, host):
+        """主机缓存的编码"""
+        with self.lock:
+            return self.encodings.get(host)
+
+
+# 全局编码缓存
+encoding_cache = EncodingCache()
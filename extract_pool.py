@@ -0,0 +1,104 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from config import Config
+from encoding_cache import encoding_cache
+
+
+def decode_content(content, encoding):
+    """按响应编码解码原始字节（与 requests.Response.text 的处理一致）"""
+    try:
+        return str(content, encoding or 'utf-8', errors='replace')
+    except (LookupError, TypeError):
+        return str(content, errors='replace')
+
+
+def _call(func, content, encoding, args):
+    """在解析进程中解码并执行抽取函数"""
+    return func(decode_content(content, encoding), *args)
+
+
+class ExtractionPool:
+    """HTML解析进程池
+
+    抓取线程只负责网络IO，把原始响应字节和模块级抽取函数交给进程池，
+    解析得到的条目(字典列表)再传回，CPU密集的解析可以用满多核。
+    抽取函数签名为 func(markup, *args)，必须是可被子进程导入的模块级函数。
+    workers 为0、进程池不可用或已损坏时在当前线程中直接解析。
+    """
+
+    def __init__(self, workers=None, start_method=None):
+        self.workers = Config.EXTRACT_WORKERS if workers is None else workers
+        self.start_method = start_method or Config.EXTRACT_START_METHOD
+        if self.start_method not in multiprocessing.get_all_start_methods():
+            self.start_method = 'spawn'
+        self.executor = None
+        self.disabled = self.workers <= 0
+        self.lock = threading.Lock()
+
+    def _executor(self):
+        """首次使用时创建进程池"""
+        if self.executor is None and not self.disabled:
+            with self.lock:
+                if self.executor is None and not self.disabled:
+                    try:
+                        context = multiprocessing.get_context(self.start_method)
+                        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                    except (OSError, ValueError, NotImplementedError) as e:
+                        print(f"⚠️ 解析进程池不可用，改为进程内解析: {e}")
+                        self.disabled = True
+        return self.executor
+
+    @staticmethod
+    def _response_payload(response):
+        """取出要传给解析进程的原始字节与编码（编码由 encoding_cache 判定，不做整页检测）"""
+        return response.content, encoding_cache.resolve(response)
+
+    def submit(self, func, response, *args):
+        """提交解析任务，返回 Future"""
+        content, encoding = self._response_payload(response)
+        executor = self._executor()
+        if executor is not None:
+            try:
+                return executor.submit(_call, func, content, encoding, args)
+            except (BrokenProcessPool, RuntimeError):
+                self._disable()
+
+        future = Future()
+        try:
+            future.set_result(_call(func, content, encoding, args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def run(self, func, response, *args):
+        """解析并等待结果；进程池在解析中途损坏时改为进程内重新解析"""
+        future = self.submit(func, response, *args)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self._disable()
+            content, encoding = self._response_payload(response)
+            return _call(func, content, encoding, args)
+
+    def _disable(self):
+        """停用已损坏的进程池"""
+        with self.lock:
+            self.disabled = True
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+        print("⚠️ 解析进程池已损坏，改为进程内解析")
+
+    def shutdown(self):
+        """关闭进程池"""
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+
+
+# 全局解析进程池，首次解析时才启动子进程
+extract_pool = ExtractionPool()
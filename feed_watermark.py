@@ -0,0 +1,92 @@
+import hashlib
+import json
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+from config import Config
+from database import db_manager
+
+# 条目中保存所属RSS源水位的键，条目写入数据库后才保存水位（见 pipeline.WatermarkStage）
+WATERMARK_KEY = '_feed_watermark'
+
+
+def published_timestamp(pub_date):
+    """解析 RSS pubDate(RFC 822) 或 Atom published/updated(ISO 8601)，无法解析时返回None"""
+    if not pub_date:
+        return None
+    try:
+        published = parsedate_to_datetime(pub_date)
+    except (TypeError, ValueError):
+        try:
+            published = datetime.fromisoformat(pub_date.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return published.timestamp()
+
+
+def item_digest(item):
+    """条目的GUID摘要，没有guid时用链接与标题"""
+    key = item.get('guid') or f"{item.get('link', '')}|{item.get('title', '')}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+class FeedWatermark:
+    """单个RSS源的增量水位：已处理条目的最新发布时间 + 最近条目的GUID摘要
+
+    发布时间早于水位的条目视为已处理；GUID摘要已记录的条目视为已处理；
+    其余（更新的、与水位同时的、没有发布时间的未见条目）为新条目。
+    判断在本次抓取开始时的水位上进行，与源中条目的顺序无关，save() 后新水位生效。
+    有条目待入库时应在条目写入数据库后再 save()，否则写库失败的条目会落在水位之下。
+    """
+
+    def __init__(self, feed_url, last_published=None, recent_guids=None):
+        self.feed_url = feed_url
+        self.last_published = last_published
+        self.newest = last_published
+        self.recent_guids = list(recent_guids or [])
+        self.seen = set(self.recent_guids)
+        self.new_count = 0
+
+    @classmethod
+    def load(cls, feed_url):
+        """读取保存的水位，首次抓取时为空水位（全部条目都是新条目）"""
+        record = db_manager.get_feed_watermark(feed_url)
+        if not record:
+            return cls(feed_url)
+        return cls(feed_url, record['last_published'], json.loads(record['recent_guids'] or '[]'))
+
+    def is_new(self, item):
+        """条目是否为新条目，新条目同时记入水位"""
+        digest = item_digest(item)
+        if digest in self.seen:
+            return False
+
+        published = published_timestamp(item.get('pub_date'))
+        if published is not None and self.last_published is not None and published < self.last_published:
+            return False
+
+        self.seen.add(digest)
+        self.recent_guids.append(digest)
+        if published is not None and (self.newest is None or published > self.newest):
+            self.newest = published
+        self.new_count += 1
+        return True
+
+    def save(self):
+        """保存水位（没有新条目时不写库）"""
+        if not self.new_count:
+            return
+        db_manager.save_feed_watermark(
+            self.feed_url, self.newest,
+            json.dumps(self.recent_guids[-Config.FEED_WATERMARK_GUIDS:])
+        )
+
+
+def pop_watermarks(items):
+    """取出条目携带的水位（同一水位只返回一次）"""
+    watermarks = {}
+    for item in items:
+        watermark = item.pop(WATERMARK_KEY, None)
+        if watermark is not None:
+            watermarks[id(watermark)] = watermark
+    return list(watermarks.values())
@@ -1,19 +1,28 @@
-from crawler import BaseCrawler, DramaCrawler, ComicCrawler, NewsCrawler, EntertainmentCrawler
+from crawler import BaseCrawler, DramaCrawler, ComicCrawler, NewsCrawler, EntertainmentCrawler, content_crawler
+from crawl_engine import CrawlJob
+from database import db_manager
+from config import Config
 import time
 from datetime import datetime
 
 class HotTrendCrawler:
-    """爆款趋势专用爬虫"""
+    """爆款趋势专用爬虫
     
-    def __init__(self):
+    来源在 max_age 秒内已有数据入库时直接读取 content_data，只重新抓取过期的来源；
+    max_age 为0时全部重新抓取。重新抓取经 ContentPipeline 入库后读取这些来源当天的数据，
+    增量抓取的来源（如RSS行业情报）只返回新条目，之前已入库的条目仍会出现在报告中。
+    """
+    
+    def __init__(self, max_age=None):
         self.drama_crawler = DramaCrawler()
         self.comic_crawler = ComicCrawler()
         self.news_crawler = NewsCrawler()
         self.entertainment_crawler = EntertainmentCrawler()
+        self.max_age = Config.HOT_TREND_MAX_AGE if max_age is None else max_age
     
     def crawl_hot_trends(self):
-        """爬取各行业爆款趋势"""
-        print("🚀 开始爬取行业爆款趋势数据...")
+        """获取各行业爆款趋势"""
+        print("🚀 开始获取行业爆款趋势数据...")
         
         hot_trends = {
             'drama': self._get_drama_hot_trends(),
@@ -24,93 +33,89 @@ class HotTrendCrawler:
         
         # 统计总数据量
         total_count = sum(len(items) for items in hot_trends.values())
-        print(f"✅ 爬取完成，共获取 {total_count} 条爆款趋势数据")
+        print(f"✅ 获取完成，共 {total_count} 条爆款趋势数据")
         
         return hot_trends
     
     def _get_drama_hot_trends(self):
         """获取短剧爆款趋势"""
-        print("📺 爬取短剧爆款趋势...")
-        dramas = self.drama_crawler.crawl_all()
-        
-        # 提取爆款特征
-        hot_dramas = []
-        for drama in dramas:
-            if drama['popularity_score'] > 85:  # 高热度作品
-                hot_dramas.append({
-                    'title': drama['title'],
-                    'category': drama['category'],
-                    'platform': drama['source_site'],
-                    'hot_score': drama['popularity_score'],
-                    'url': drama['url'],
-                    'trend_type': '爆款短剧'
-                })
-        
+        print("📺 获取短剧爆款趋势...")
+        hot_dramas = self._get_hot_items('drama', self.drama_crawler, 85, '爆款短剧')  # 高热度作品
         print(f"   发现 {len(hot_dramas)} 部爆款短剧")
         return hot_dramas
     
     def _get_comic_hot_trends(self):
         """获取漫剧爆款趋势"""
-        print("📚 爬取漫剧爆款趋势...")
-        comics = self.comic_crawler.crawl_all()
-        
-        # 提取爆款特征
-        hot_comics = []
-        for comic in comics:
-            if comic['popularity_score'] > 80:  # 高热度作品
-                hot_comics.append({
-                    'title': comic['title'],
-                    'category': comic['category'],
-                    'platform': comic['source_site'],
-                    'hot_score': comic['popularity_score'],
-                    'url': comic['url'],
-                    'trend_type': '爆款漫剧'
-                })
-        
+        print("📚 获取漫剧爆款趋势...")
+        hot_comics = self._get_hot_items('comic', self.comic_crawler, 80, '爆款漫剧')  # 高热度作品
         print(f"   发现 {len(hot_comics)} 部爆款漫剧")
         return hot_comics
     
     def _get_news_hot_trends(self):
         """获取新闻爆款趋势"""
-        print("📰 爬取新闻爆款趋势...")
-        news = self.news_crawler.crawl_all()
-        
-        # 提取热点新闻
-        hot_news = []
-        for item in news:
-            if item['popularity_score'] > 90:  # 极高热度
-                hot_news.append({
-                    'title': item['title'],
-                    'category': item['category'],
-                    'source': item['source_site'],
-                    'hot_score': item['popularity_score'],
-                    'url': item['url'],
-                    'trend_type': '热点新闻'
-                })
-        
+        print("📰 获取新闻爆款趋势...")
+        hot_news = self._get_hot_items('news', self.news_crawler, 90, '热点新闻', platform_key='source')  # 极高热度
         print(f"   发现 {len(hot_news)} 条热点新闻")
         return hot_news
     
     def _get_entertainment_hot_trends(self):
         """获取娱乐爆款趋势"""
-        print("🎮 爬取娱乐爆款趋势...")
-        entertainment = self.entertainment_crawler.crawl_all()
-        
-        # 提取娱乐热点
-        hot_entertainment = []
-        for item in entertainment:
-            if item['popularity_score'] > 95:  # 超高热度
-                hot_entertainment.append({
-                    'title': item['title'],
-                    'category': item['category'],
-                    'platform': item['source_site'],
-                    'hot_score': item['popularity_score'],
-                    'url': item['url'],
-                    'trend_type': '娱乐爆款'
-                })
-        
+        print("🎮 获取娱乐爆款趋势...")
+        hot_entertainment = self._get_hot_items('entertainment', self.entertainment_crawler, 95, '娱乐爆款')  # 超高热度
         print(f"   发现 {len(hot_entertainment)} 条娱乐爆款")
         return hot_entertainment
+    
+    def _get_hot_items(self, content_type, crawler, min_score, trend_type, platform_key='platform'):
+        """筛选热度高于 min_score 的内容：新鲜来源读库，过期来源重新抓取后读库"""
+        jobs = crawler.get_crawl_jobs()
+        # 只读取本爬虫各任务写入的来源，同类型的其他来源（如真实爆款、智能爬取）不会返回
+        job_sources = {site_name: crawler.get_job_sources(site_name) for site_name, _ in jobs}
+        stored = []
+        
+        if self.max_age > 0:
+            fresh_sources = db_manager.get_fresh_sources(content_type, self.max_age) & set().union(*job_sources.values())
+            stale_jobs = [
+                (site_name, crawler_func) for site_name, crawler_func in jobs
+                if not job_sources[site_name] & fresh_sources
+            ]
+            stored = self._latest_rows(db_manager.get_recent_content(content_type, self.max_age, fresh_sources))
+            print(f"   {len(jobs) - len(stale_jobs)}个来源使用已入库数据，{len(stale_jobs)}个来源重新抓取")
+        else:
+            stale_jobs = jobs
+        
+        crawled = []
+        if stale_jobs:
+            content_crawler.crawl_jobs([
+                CrawlJob(trend_type, site_name, crawler_func) for site_name, crawler_func in stale_jobs
+            ])
+            stale_sources = set().union(*(job_sources[site_name] for site_name, _ in stale_jobs))
+            crawled = self._latest_rows(db_manager.get_day_content(content_type, stale_sources))
+        
+        # 提取爆款特征
+        return [
+            {
+                'title': item['title'],
+                'category': item['category'],
+                platform_key: item['source_site'],
+                'hot_score': item['popularity_score'],
+                'url': item['url'],
+                'trend_type': trend_type
+            }
+            for item in stored + crawled
+            if item['popularity_score'] > min_score
+        ]
+    
+    @staticmethod
+    def _latest_rows(rows):
+        """窗口内同一来源多次入库的相同内容只保留最新一条（rows 按入库时间倒序）"""
+        seen = set()
+        latest = []
+        for row in rows:
+            key = (row['source_site'], row['title'], row['url'])
+            if key not in seen:
+                seen.add(key)
+                latest.append(row)
+        return latest
 
 def display_hot_trends():
     """显示爆款趋势数据"""
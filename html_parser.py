@@ -0,0 +1,213 @@
+import re
+from collections import namedtuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from config import Config
+
+try:
+    import lxml.html
+    from lxml.etree import ParserError
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    import cssselect  # noqa: F401  lxml 的CSS选择器依赖
+    CSSSELECT_AVAILABLE = True
+except ImportError:
+    CSSSELECT_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+        SELECTOLAX_AVAILABLE = True
+    except ImportError:
+        SELECTOLAX_AVAILABLE = False
+
+# 链接抽取结果: 链接文本(去空白)、href、title属性、父节点文本（按需）
+Link = namedtuple('Link', ['text', 'href', 'title', 'parent_text'])
+
+BACKENDS = ('selectolax', 'lxml', 'html.parser')
+
+# XHTML 页面开头的XML声明；lxml 不接受带编码声明的 str，解析前去掉
+_XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+def available_backends():
+    """当前环境可用的解析后端"""
+    backends = []
+    if SELECTOLAX_AVAILABLE:
+        backends.append('selectolax')
+    if LXML_AVAILABLE:
+        backends.append('lxml')
+    backends.append('html.parser')
+    return backends
+
+
+def resolve_backend(backend=None):
+    """解析后端名称，配置的后端未安装时按 selectolax > lxml > html.parser 回退"""
+    backend = backend or Config.HTML_PARSER_BACKEND
+    available = available_backends()
+    if backend in available:
+        return backend
+    return available[0]
+
+
+def make_soup(markup, parse_only=None, backend=None):
+    """构造BeautifulSoup，lxml可用时使用lxml构建器
+
+    parse_only 为 SoupStrainer 时只构建匹配的标签（部分解析）。
+    """
+    builder = 'lxml' if LXML_AVAILABLE and resolve_backend(backend) != 'html.parser' else 'html.parser'
+    return BeautifulSoup(markup, builder, parse_only=parse_only)
+
+
+def _href_matches(href, href_contains):
+    """href 是否包含任一指定片段"""
+    if href_contains is None:
+        return True
+    if not href:
+        return False
+    if isinstance(href_contains, str):
+        return href_contains in href
+    return any(part in href for part in href_contains)
+
+
+def extract_links(markup, href_contains=None, require_title=False, with_parent_text=False,
+                  limit=None, backend=None, selector=None):
+    """只抽取页面中的 <a> 链接
+
+    href_contains: 字符串或字符串元组，href 包含任一片段才保留
+    require_title: 只保留带 title 属性的链接
+    with_parent_text: 同时返回父节点文本（用于分类判断）
+    limit: 取到指定数量后停止
+    selector: CSS选择器，只抽取匹配的 <a> 元素（如 'h2.h3 > a:first-of-type'），其余条件照常生效
+    """
+    backend = resolve_backend(backend)
+    if selector and backend == 'lxml' and not CSSSELECT_AVAILABLE:
+        # 未安装 cssselect 时改用 selectolax，都没有时由 BeautifulSoup(soupsieve) 执行选择器
+        backend = 'selectolax' if SELECTOLAX_AVAILABLE else 'html.parser'
+    if backend == 'selectolax':
+        links = _extract_links_selectolax(markup, href_contains, require_title, with_parent_text, limit, selector)
+    elif backend == 'lxml':
+        links = _extract_links_lxml(markup, href_contains, require_title, with_parent_text, limit, selector)
+    else:
+        links = _extract_links_soup(markup, href_contains, require_title, with_parent_text, limit, selector)
+    return links
+
+
+def _extract_links_selectolax(markup, href_contains, require_title, with_parent_text, limit, selector=None):
+    """selectolax 后端（优先使用 Lexbor 引擎）"""
+    links = []
+    tree = SelectolaxParser(markup)
+    if not selector:
+        selector = 'a[title]' if require_title else 'a[href]' if href_contains is not None else 'a'
+
+    for node in tree.css(selector):
+        if node.tag != 'a' or require_title and node.attributes.get('title') is None:
+            continue
+        href = node.attributes.get('href') or ''
+        if not _href_matches(href, href_contains):
+            continue
+
+        parent_text = ''
+        if with_parent_text and node.parent is not None:
+            parent_text = node.parent.text(deep=True)
+
+        links.append(Link(
+            node.text(deep=True, separator='', strip=True),
+            href,
+            node.attributes.get('title') or '',
+            parent_text
+        ))
+        if limit and len(links) >= limit:
+            break
+
+    return links
+
+
+def _extract_links_lxml(markup, href_contains, require_title, with_parent_text, limit, selector=None):
+    """lxml 后端（CSS选择器需要 cssselect）"""
+    links = []
+    if isinstance(markup, str):
+        markup = _XML_DECLARATION.sub('', markup, count=1)
+    if not markup or not markup.strip():
+        return links
+    try:
+        root = lxml.html.fromstring(markup)
+    except ParserError:  # 只有注释等没有元素的文档
+        return links
+    if selector:
+        nodes = root.cssselect(selector)
+    else:
+        nodes = root.xpath('//a[@title]' if require_title else '//a[@href]' if href_contains is not None else '//a')
+
+    for node in nodes:
+        if node.tag != 'a' or require_title and node.get('title') is None:
+            continue
+        href = node.get('href') or ''
+        if not _href_matches(href, href_contains):
+            continue
+
+        parent_text = ''
+        if with_parent_text:
+            parent = node.getparent()
+            if parent is not None:
+                parent_text = parent.text_content()
+
+        links.append(Link(
+            ''.join(text.strip() for text in node.itertext()),
+            href,
+            node.get('title') or '',
+            parent_text
+        ))
+        if limit and len(links) >= limit:
+            break
+
+    return links
+
+
+def _extract_links_soup(markup, href_contains, require_title, with_parent_text, limit, selector=None):
+    """html.parser 后端；不需要父节点文本且没有CSS选择器时只构建 <a> 标签"""
+    if require_title:
+        strainer = SoupStrainer('a', title=True)
+    else:
+        strainer = SoupStrainer('a', href=lambda x: _href_matches(x, href_contains))
+
+    if selector:
+        soup = BeautifulSoup(markup, 'html.parser')
+        anchors = [
+            node for node in soup.select(selector)
+            if node.name == 'a' and not (require_title and node.get('title') is None)
+        ]
+    elif with_parent_text:
+        soup = BeautifulSoup(markup, 'html.parser')
+        anchors = soup.find_all(strainer)
+    else:
+        soup = BeautifulSoup(markup, 'html.parser', parse_only=strainer)
+        anchors = soup.find_all('a')
+
+    links = []
+    for node in anchors:
+        href = node.get('href', '')
+        if not _href_matches(href, href_contains):
+            continue
+
+        parent_text = ''
+        if with_parent_text and node.parent is not None:
+            parent_text = node.parent.get_text()
+
+        links.append(Link(
+            node.get_text(strip=True),
+            href,
+            node.get('title', ''),
+            parent_text
+        ))
+        if limit and len(links) >= limit:
+            break
+
+    return links
@@ -0,0 +1,183 @@
+import json
+import random
+import time
+from datetime import datetime
+
+import requests
+
+from circuit_breaker import circuit_breaker
+from config import Config
+from database import db_manager
+from encoding_cache import encoding_cache
+from politeness import host_limiter
+from response_cache import response_cache
+from transport import transport
+
+
+class FetchError(Exception):
+    """页面获取失败（已用尽重试次数）"""
+
+
+class CircuitOpenError(FetchError):
+    """主机处于熔断状态，请求被直接跳过"""
+
+
+class ResponseRejected(FetchError):
+    """响应被下载限制拒绝：内容类型不在白名单内，或超过字节/时间上限（不重试）"""
+
+
+def _is_host_failure(error):
+    """是否计入主机熔断的失败：连接错误、超时、5xx 以及 403/429 拒绝"""
+    if isinstance(error, requests.HTTPError):
+        status = error.response.status_code if error.response is not None else 0
+        return status >= 500 or status in (403, 429)
+    return isinstance(error, requests.RequestException)
+
+
+def _max_bytes_for(host):
+    """主机的下载字节上限"""
+    return Config.DOWNLOAD_HOST_MAX_BYTES.get(host, Config.DOWNLOAD_MAX_BYTES)
+
+
+def _refresh_item(item):
+    """复用上次解析的条目时刷新抓取时间"""
+    if 'crawl_date' in item:
+        item['crawl_date'] = datetime.now().date()
+    if 'crawl_time' in item:
+        item['crawl_time'] = datetime.now().isoformat()
+    return item
+
+
+class HttpFetcher:
+    """统一抓取层：响应缓存、礼貌调度、失败重试、条件请求(Conditional GET)与编码判定
+
+    请求经由共享的 transport 发送，headers 为该抓取器的默认请求头。
+    """
+
+    def __init__(self, headers=None, timeout=None, retry_delay=(1, 3), cache=response_cache):
+        self.headers = dict(headers or {})
+        self.timeout = timeout or Config.TIMEOUT
+        self.retry_delay = retry_delay
+        self.cache = cache
+
+    def get(self, url, retries=3, headers=None, use_cache=True, max_bytes=None):
+        """获取页面，优先使用未过期的缓存，重试全部失败后抛出 FetchError
+
+        max_bytes 覆盖该主机的下载字节上限。
+        """
+        if use_cache and self.cache:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return cached
+
+        response = self._request(url, retries, headers, max_bytes)
+        if self.cache:
+            if response.status_code == 304:
+                self.cache.touch(url)
+            else:
+                self.cache.put(url, response)
+        return response
+
+    def _request(self, url, retries, headers, max_bytes=None):
+        """发送网络请求并流式读取正文，失败时按间隔重试；主机熔断或响应被拒绝时立即放弃"""
+        request_headers = dict(self.headers)
+        request_headers.update(headers or {})
+        host = circuit_breaker.host_of(url)
+        for attempt in range(retries):
+            if not circuit_breaker.allow(host):
+                raise CircuitOpenError(f"{host} 熔断中，{circuit_breaker.retry_after(host)}秒后重试")
+            try:
+                with host_limiter.slot(url):
+                    response = transport.get(url, timeout=self.timeout, headers=request_headers, stream=True)
+                    try:
+                        response.raise_for_status()
+                        self._download(response, max_bytes or _max_bytes_for(host))
+                    finally:
+                        response.close()
+                circuit_breaker.record_success(host)
+                # 编码按 声明 > 页面meta > 主机缓存 判定，response.text 不再对整页做检测
+                encoding_cache.resolve(response)
+                return response
+            except ResponseRejected:
+                circuit_breaker.record_success(host)
+                raise
+            except Exception as e:
+                if _is_host_failure(e):
+                    circuit_breaker.record_failure(host)
+                else:
+                    circuit_breaker.record_success(host)
+                if attempt == retries - 1 or circuit_breaker.is_open(host):
+                    raise FetchError(str(e)) from e
+                time.sleep(random.uniform(*self.retry_delay))
+        raise FetchError(url)
+
+    def _download(self, response, max_bytes):
+        """按块读取正文，检查内容类型、字节上限与下载时间上限，读完后放入 response.content"""
+        content_type = (response.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+        if content_type and content_type not in Config.DOWNLOAD_CONTENT_TYPES:
+            raise ResponseRejected(f"内容类型不在允许范围内: {content_type} {response.url}")
+
+        # 压缩传输时解压后只会更大，声明长度已超限即可直接放弃
+        declared_length = response.headers.get('Content-Length')
+        if declared_length and declared_length.isdigit() and int(declared_length) > max_bytes:
+            raise ResponseRejected(f"响应大小 {declared_length} 字节超过上限 {max_bytes}: {response.url}")
+
+        if response._content_consumed:
+            # 响应回调（如录制）已读取了正文
+            if len(response.content) > max_bytes:
+                raise ResponseRejected(f"响应超过 {max_bytes} 字节上限: {response.url}")
+            return
+
+        chunks = []
+        size = 0
+        deadline = time.monotonic() + Config.DOWNLOAD_MAX_SECONDS
+        for chunk in response.iter_content(chunk_size=Config.DOWNLOAD_CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > max_bytes:
+                raise ResponseRejected(f"响应超过 {max_bytes} 字节上限: {response.url}")
+            if time.monotonic() > deadline:
+                raise ResponseRejected(f"下载超过 {Config.DOWNLOAD_MAX_SECONDS} 秒: {response.url}")
+
+        response._content = b''.join(chunks)
+        response._content_consumed = True
+
+    def fetch_items(self, url, parse_func, retries=3, headers=None, reuse_items=True):
+        """抓取并解析页面
+
+        请求时携带上次保存的 ETag / Last-Modified，服务器返回304时跳过
+        下载与解析，直接复用上次解析出的条目；reuse_items 为False时
+        （增量抓取，只需要新条目）304 返回空列表。parse_func(response, url)
+        返回条目列表，解析异常原样抛出由调用方处理。
+        """
+        if self.cache:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return parse_func(cached, url)
+
+        record = db_manager.get_http_validator(url)
+        request_headers = dict(headers or {})
+        if record:
+            if record['etag']:
+                request_headers['If-None-Match'] = record['etag']
+            if record['last_modified']:
+                request_headers['If-Modified-Since'] = record['last_modified']
+
+        response = self.get(url, retries, request_headers, use_cache=False)
+        if response.status_code == 304:
+            if not reuse_items:
+                return []
+            if record:
+                return [_refresh_item(item) for item in json.loads(record['items'])]
+
+        items = parse_func(response, url)
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            db_manager.save_http_validator(
+                url, etag, last_modified,
+                json.dumps(items if reuse_items else [], ensure_ascii=False, default=str)
+            )
+
+        return items
@@ -0,0 +1,242 @@
+import re
+
+# 关键词分类体系（声明式）
+#   规则集名称: {
+#       'labels': [(标签, [关键词...]), ...]  标签按顺序排列，first() 返回第一个命中的标签
+#       'default': 都不命中时 first() 的返回值
+#       'weight': 每命中一个不同关键词的加分，boost() 使用
+#   }
+# 匹配区分大小写，与 `keyword in text` 一致
+TAXONOMY = {
+    # AI漫剧行业情报：相关性判断（漫剧题材 且 AI或行业话题）
+    'ai_manga.topic': {
+        'labels': [
+            ('manga', ['漫剧', '漫画', '动漫', '二次元', 'ACG', '番剧', '动画', 'IP']),
+            ('ai', ['AI', 'AIGC', '人工智能', '生成式', '大模型']),
+            ('industry', ['行业', '融资', '上市', '报告', '爆料', '传闻', '曝光', '内幕', '合作'])
+        ]
+    },
+    # AI漫剧行业情报分类
+    'ai_manga.intel': {
+        'labels': [
+            ('爆料', ['爆料', '传闻', '曝光', '内幕', '独家']),
+            ('行业数据', ['报告', '数据', '统计', '调研', '榜单', '趋势']),
+            ('资本动态', ['融资', '投资', '并购', '上市', '估值']),
+            ('作品动态', ['新作', '发布', '上线', '立项', '改编'])
+        ],
+        'default': '行业资讯'
+    },
+    # AI漫剧情报热度加分（标题）
+    'ai_manga.boost': {
+        'labels': [
+            ('boost', ['爆料', '独家', '重磅', '首发', '发布', '融资', '合作'])
+        ],
+        'weight': 4
+    },
+    # 漫剧题材分类
+    'manga.category': {
+        'labels': [
+            ('恋爱', ['恋爱', '浪漫', '爱情', '恋爱喜剧']),
+            ('校园', ['校园', '学园', '学生', '青春']),
+            ('奇幻', ['奇幻', '魔法', '异世界', '玄幻']),
+            ('搞笑', ['搞笑', '喜剧', '幽默', '欢乐']),
+            ('热血', ['热血', '战斗', '冒险', '动作']),
+            ('治愈', ['治愈', '温馨', '日常', '生活'])
+        ],
+        'default': '其他'
+    },
+    # 站点分类（site_registry 中的站点规则按名称引用）
+    'site.qidian': {
+        'labels': [
+            ('玄幻小说', ['玄幻']),
+            ('都市小说', ['都市']),
+            ('仙侠小说', ['仙侠']),
+            ('游戏小说', ['游戏'])
+        ]
+    },
+    'site.youku': {
+        'labels': [
+            ('短剧', ['短剧', '微剧']),
+            ('电影', ['电影']),
+            ('综艺', ['综艺'])
+        ]
+    },
+    'site.sina': {
+        'labels': [
+            ('时政新闻', ['疫情', '新冠']),
+            ('财经新闻', ['经济', '股市', '金融']),
+            ('科技新闻', ['科技', 'AI', '互联网']),
+            ('娱乐新闻', ['娱乐', '明星']),
+            ('体育新闻', ['体育', '足球', '篮球'])
+        ]
+    },
+    # AI分析结果逐行提取
+    'analysis.line': {
+        'labels': [
+            ('insight', ['增长', '下降', '热门', '趋势', '变化']),
+            ('prediction', ['预测', '预计', '将', '可能', '有望']),
+            ('risk', ['风险', '注意', '警惕', '挑战', '问题'])
+        ]
+    },
+    # AI分析置信度（肯定/不确定用语计数）
+    'analysis.confidence': {
+        'labels': [
+            ('positive', ['明确', '显著', '明显', '确定', '强烈']),
+            ('negative', ['可能', '也许', '或许', '不确定', '模糊'])
+        ]
+    }
+}
+
+
+def _trie_pattern(words):
+    """把关键词构造成前缀树形式的正则，相同前缀只比较一次"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatches:
+    """一次扫描的匹配结果，按规则集查询命中的标签、次数与加分"""
+
+    def __init__(self, matcher, hits):
+        self.matcher = matcher
+        self.hits = hits  # [(位置, 关键词)]
+        self.found = {keyword for _, keyword in hits}
+
+    def has(self, rule_set, label=None):
+        """是否命中规则集（或其中某个标签）"""
+        if label is None:
+            index = self.matcher.label_index[rule_set]
+            return any(keyword in index for keyword in self.found)
+        return self.matcher.label_id(rule_set, label) in self._label_ids(rule_set)
+
+    def labels(self, rule_set):
+        """命中的标签（按规则集中的顺序）"""
+        names = self.matcher.labels[rule_set]
+        return [names[i] for i in sorted(self._label_ids(rule_set))]
+
+    def first(self, rule_set, default=None):
+        """第一个命中的标签，都不命中时返回 default 或规则集的默认值"""
+        ids = self._label_ids(rule_set)
+        if ids:
+            return self.matcher.labels[rule_set][min(ids)]
+        return default if default is not None else self.matcher.rules[rule_set].get('default')
+
+    def keywords(self, rule_set, label=None):
+        """命中的不同关键词"""
+        return {keyword for _, keyword in self._select(rule_set, label)}
+
+    def count(self, rule_set, label=None):
+        """命中次数（同一关键词出现多次计多次）"""
+        return len(self._select(rule_set, label))
+
+    def counts(self, rule_set):
+        """各标签的命中次数"""
+        names = self.matcher.labels[rule_set]
+        index = self.matcher.label_index[rule_set]
+        totals = [0] * len(names)
+        for _, keyword in self.hits:
+            for i in index.get(keyword, ()):
+                totals[i] += 1
+        return dict(zip(names, totals))
+
+    def positions(self, rule_set, label=None):
+        """命中位置（升序）"""
+        return sorted(position for position, _ in self._select(rule_set, label))
+
+    def boost(self, rule_set):
+        """加分：命中的不同关键词数 × 规则集权重"""
+        return len(self.keywords(rule_set)) * self.matcher.rules[rule_set].get('weight', 1)
+
+    def summary(self, rule_set):
+        """规则集的命中汇总: 标签、首个标签、各标签次数与加分"""
+        return {
+            'labels': self.labels(rule_set),
+            'first': self.first(rule_set),
+            'counts': self.counts(rule_set),
+            'boost': self.boost(rule_set)
+        }
+
+    def _label_ids(self, rule_set):
+        index = self.matcher.label_index[rule_set]
+        return {i for keyword in self.found if keyword in index for i in index[keyword]}
+
+    def _select(self, rule_set, label):
+        """属于规则集（或其中某个标签）的命中"""
+        index = self.matcher.label_index[rule_set]
+        if label is None:
+            return [hit for hit in self.hits if hit[1] in index]
+        label_id = self.matcher.label_id(rule_set, label)
+        return [hit for hit in self.hits if label_id in index.get(hit[1], ())]
+
+
+class KeywordMatcher:
+    """多规则集关键词匹配器
+
+    所有规则集的关键词在构造时合并编译为一个前缀树正则，扫描一次文本
+    即得到全部规则集的命中结果，不再对每个关键词各扫描一遍。
+    匹配包含重叠出现（如“不确定”同时命中“不确定”与“确定”），
+    与逐个关键词 `in` / count 的结果一致。
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.labels = {}       # 规则集 -> [标签]
+        self.label_index = {}  # 规则集 -> {关键词: (标签序号, ...)}
+        for rule_set, rule in rules.items():
+            self.labels[rule_set] = [label for label, _ in rule['labels']]
+            index = {}
+            for label_id, (_, keywords) in enumerate(rule['labels']):
+                for keyword in keywords:
+                    if label_id not in index.setdefault(keyword, ()):
+                        index[keyword] += (label_id,)
+            self.label_index[rule_set] = index
+
+        keywords = sorted({keyword for index in self.label_index.values() for keyword in index})
+        # 同一位置只能匹配到最长的关键词，较短的前缀关键词在命中时一并计入
+        self.prefixes = {
+            keyword: [other for other in keywords if other != keyword and keyword.startswith(other)]
+            for keyword in keywords
+        }
+        # 正则以首字符集合开头，查找时由正则引擎直接跳过不可能命中的位置
+        self.pattern = re.compile(_trie_pattern(keywords)) if keywords else None
+
+    def select(self, *rule_sets):
+        """只包含指定规则集的匹配器，扫描时不再查找其他规则集的关键词"""
+        return KeywordMatcher({rule_set: self.rules[rule_set] for rule_set in rule_sets})
+
+    def label_id(self, rule_set, label):
+        """标签在规则集中的序号"""
+        return self.labels[rule_set].index(label)
+
+    def scan(self, text):
+        """扫描文本一次，返回 KeywordMatches"""
+        hits = []
+        if text and self.pattern:
+            search = self.pattern.search
+            match = search(text)
+            while match:
+                keyword = match.group()
+                position = match.start()
+                hits.append((position, keyword))
+                for prefix in self.prefixes[keyword]:
+                    hits.append((position, prefix))
+                # 从下一个字符继续查找，保留与本次命中重叠的关键词
+                match = search(text, position + 1)
+        return KeywordMatches(self, hits)
+
+
+# 全局关键词匹配器，由中心分类体系编译一次；各模块用 select() 取出所需的规则集
+keyword_matcher = KeywordMatcher(TAXONOMY)
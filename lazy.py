@@ -0,0 +1,51 @@
+import threading
+
+
+class LazyInstance:
+    """延迟创建的全局实例
+
+    首次访问属性时才调用 factory 创建真实对象（线程安全，只创建一次），
+    之后所有属性访问都转发给该对象，调用方式与直接使用实例相同。
+    """
+
+    def __init__(self, factory, name=None):
+        self._factory = factory
+        self._name = name or getattr(factory, '__name__', 'instance')
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """获取真实对象，未创建时立即创建"""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+                instance = self._instance
+        return instance
+
+    @property
+    def initialized(self):
+        """是否已创建"""
+        return self._instance is not None
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+    def __repr__(self):
+        state = 'initialized' if self.initialized else 'pending'
+        return f"<LazyInstance {self._name} ({state})>"
+
+
+def start_warm_up(*instances):
+    """在后台线程中依次创建各实例，不阻塞调用方"""
+    def warm_up():
+        for instance in instances:
+            try:
+                instance.get()
+            except Exception as e:
+                print(f"⚠️ 预热{instance._name}失败: {e}")
+
+    thread = threading.Thread(target=warm_up, name='warm-up', daemon=True)
+    thread.start()
+    return thread
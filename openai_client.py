@@ -1,6 +1,5 @@
-import requests
-
 from config import Config
+from transport import transport
 
 
 class OpenAICompatibleClient:
@@ -10,7 +9,7 @@ class OpenAICompatibleClient:
         self.api_base = (api_base or Config.OPENAI_API_BASE).rstrip("/")
         self.api_key = api_key or Config.OPENAI_API_KEY
         self.timeout = timeout or Config.OPENAI_TIMEOUT
-        self.session = requests.Session()
+        self.session = transport.new_session()
         if self.api_key:
             self.session.headers.update({"Authorization": f"Bearer {self.api_key}"})
         self.session.headers.update({"Content-Type": "application/json"})
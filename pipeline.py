@@ -0,0 +1,183 @@
+import queue
+import threading
+import time
+
+from config import Config
+from database import db_manager
+from dedup import crawl_day, dedup_key
+from feed_watermark import pop_watermarks
+
+_STOP = object()
+
+
+class DedupStage:
+    """流式去重：URL规范化后，同一次运行中同一天同一作品（内容类型 + URL）只保留一条
+
+    之前运行已保存过的作品不丢弃，照常写库，由 content_data 的唯一键更新热度与
+    入库时间，按小时抓取的热榜始终反映榜上作品的最新热度。
+    """
+
+    def __init__(self):
+        self.seen = set()  # 本次运行已出现的键
+
+    def __call__(self, item):
+        key = f"{dedup_key(item)}|{crawl_day(item)}"
+        if key in self.seen:
+            return None
+        self.seen.add(key)
+        return item
+
+
+class WatermarkStage:
+    """RSS增量水位：条目携带的源水位在管道所有批次都写入成功后才保存
+
+    水位在解析时就已前移，若在条目入库前保存，写库失败或进程在刷新间隔内退出时
+    这些条目会落在水位之下，之后不会再被抓取。应放在会丢弃条目的阶段之前。
+    """
+
+    def __init__(self):
+        self.watermarks = {}
+
+    def __call__(self, item):
+        for watermark in pop_watermarks([item]):
+            self.watermarks[id(watermark)] = watermark
+        return item
+
+    def close(self, committed=True):
+        """管道结束时调用，committed 表示全部批次已写入"""
+        if committed:
+            for watermark in self.watermarks.values():
+                watermark.save()
+
+
+class ContentPipeline:
+    """爬虫到数据库的流式管道
+
+    爬虫(生产者)通过 put() 把条目放入有界队列，队列满时阻塞，内存占用
+    不随抓取总量增长；写入线程(消费者)依次经过各处理阶段后按批写入数据库，
+    达到批大小或距上次写入超过 flush_interval 秒就提交一次事务。
+
+    处理阶段是可调用对象 stage(item)，返回处理后的条目，返回None表示丢弃，
+    去重、分类等步骤都可以作为阶段插入；阶段有 close(committed) 方法时
+    在管道关闭时调用，有 stats() 方法时其统计并入管道统计。
+    writer 返回新增条数时（如 insert_content_data），统计新增（new）与刷新（refreshed）的条目数。
+    """
+
+    def __init__(self, stages=None, batch_size=None, flush_interval=None, queue_size=None, writer=None):
+        self.stages = list(stages or [])
+        self.batch_size = batch_size or Config.PIPELINE_BATCH_SIZE
+        self.flush_interval = flush_interval or Config.PIPELINE_FLUSH_INTERVAL
+        self.queue = queue.Queue(maxsize=queue_size or Config.PIPELINE_QUEUE_SIZE)
+        self.writer = writer or db_manager.insert_content_data
+        self.thread = None
+        self.received = 0
+        self.dropped = 0
+        self.saved = 0
+        self.batches = 0
+        self.errors = 0
+        self.new = 0
+        self.refreshed = 0
+
+    def start(self):
+        """启动写入线程"""
+        self.thread = threading.Thread(target=self._run, name='content-writer', daemon=True)
+        self.thread.start()
+        return self
+
+    def put(self, item):
+        """放入一条内容，队列满时阻塞等待"""
+        self.queue.put(item)
+
+    def close(self):
+        """等待队列写完并停止写入线程，返回写入条数"""
+        if self.thread:
+            self.queue.put(_STOP)
+            self.thread.join()
+            self.thread = None
+            for stage in self.stages:
+                close = getattr(stage, 'close', None)
+                if close:
+                    close(committed=not self.errors)
+        return self.saved
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _process(self, item):
+        """依次经过各处理阶段"""
+        for stage in self.stages:
+            item = stage(item)
+            if item is None:
+                return None
+        return item
+
+    def _run(self):
+        """消费队列，按批写入"""
+        batch = []
+        last_flush = time.monotonic()
+
+        while True:
+            timeout = max(0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._flush(batch)
+                return
+
+            if item is not None:
+                self.received += 1
+                try:
+                    item = self._process(item)
+                except Exception as e:
+                    db_manager.log_message("ERROR", "ContentPipeline", f"处理条目失败: {str(e)}")
+                    item = None
+                if item is None:
+                    self.dropped += 1
+                else:
+                    batch.append(item)
+
+            if len(batch) >= self.batch_size or (batch and time.monotonic() - last_flush >= self.flush_interval):
+                self._flush(batch)
+                batch = []
+                last_flush = time.monotonic()
+            elif not batch:
+                last_flush = time.monotonic()
+
+    def _flush(self, batch):
+        """在一个事务中写入一批条目"""
+        if not batch:
+            return
+        try:
+            inserted = self.writer(batch)
+            self.saved += len(batch)
+            self.batches += 1
+            if inserted is not None:
+                self.new += inserted
+                self.refreshed += len(batch) - inserted
+        except Exception as e:
+            self.errors += 1
+            db_manager.log_message("ERROR", "ContentPipeline", f"写入{len(batch)}条内容失败: {str(e)}")
+
+    def stats(self):
+        """管道统计"""
+        stats = {
+            'received': self.received,
+            'dropped': self.dropped,
+            'saved': self.saved,
+            'batches': self.batches,
+            'errors': self.errors,
+            'new': self.new,
+            'refreshed': self.refreshed,
+            'queued': self.queue.qsize()
+        }
+        for stage in self.stages:
+            stage_stats = getattr(stage, 'stats', None)
+            if stage_stats:
+                stats.update(stage_stats())
+        return stats
@@ -0,0 +1,74 @@
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from config import Config
+
+
+class TokenBucket:
+    """令牌桶限速器"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """预留一个令牌，返回需要等待的秒数
+
+        令牌数允许为负，先到的请求先排队，等待时间按欠下的令牌计算。
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0
+            return -self.tokens / self.rate
+
+
+class HostLimiter:
+    """单主机礼貌调度：令牌桶限速 + 全局与单主机HTTP并发限制"""
+
+    def __init__(self, max_concurrency=None, per_host=None, rate_limits=None):
+        self.global_slots = threading.BoundedSemaphore(max_concurrency or Config.CRAWL_MAX_CONCURRENCY)
+        self.per_host = per_host or Config.CRAWL_PER_HOST_CONCURRENCY
+        self.rate_limits = rate_limits if rate_limits is not None else Config.HOST_RATE_LIMITS
+        self.host_slots = {}
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def _host_semaphore(self, host):
+        """获取主机对应的信号量"""
+        with self.lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self.host_slots[host]
+
+    def _host_bucket(self, host):
+        """获取主机对应的令牌桶"""
+        with self.lock:
+            if host not in self.buckets:
+                rate, capacity = self.rate_limits.get(host, Config.HOST_RATE_DEFAULT)
+                self.buckets[host] = TokenBucket(rate, capacity)
+            return self.buckets[host]
+
+    @contextmanager
+    def slot(self, url):
+        """等待主机令牌并占用一个请求名额，请求结束后释放"""
+        host = urlparse(url).netloc.lower()
+        wait = self._host_bucket(host).reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+        with self._host_semaphore(host):
+            with self.global_slots:
+                yield
+
+
+# 全局礼貌调度实例
+host_limiter = HostLimiter()
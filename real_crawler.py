@@ -1,15 +1,14 @@
-import requests
-import time
 import json
-from bs4 import BeautifulSoup
 from datetime import datetime
 import random
+from http_fetcher import HttpFetcher, FetchError
+from html_parser import extract_links
+from extract_pool import extract_pool
 
 class RealCrawler:
     """真正有效的爬虫实现"""
     
     def __init__(self):
-        self.session = requests.Session()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -18,46 +17,44 @@ class RealCrawler:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
-        self.session.headers.update(self.headers)
+        self.fetcher = HttpFetcher(self.headers, timeout=10, retry_delay=(1, 2))
     
     def get_page_safely(self, url, retries=3):
         """安全获取页面内容"""
-        for attempt in range(retries):
-            try:
-                response = self.session.get(url, timeout=10)
-                response.raise_for_status()
-                return response
-            except Exception as e:
-                if attempt == retries - 1:
-                    print(f"❌ 获取页面失败 {url}: {str(e)}")
-                    return None
-                time.sleep(random.uniform(1, 2))
-        return None
+        try:
+            return self.fetcher.get(url, retries)
+        except FetchError as e:
+            print(f"❌ 获取页面失败 {url}: {str(e)}")
+            return None
+    
+    def crawl_page_safely(self, url, parse_func, retries=3):
+        """安全抓取并解析页面，页面未变化(304)时复用上次的解析结果"""
+        try:
+            return self.fetcher.fetch_items(url, parse_func, retries)
+        except FetchError as e:
+            print(f"❌ 获取页面失败 {url}: {str(e)}")
+            return []
 
 class WorkingHotTrendCrawler(RealCrawler):
     """真正工作的爆款趋势爬虫"""
     
+    def get_crawl_jobs(self):
+        """爆款数据抓取任务"""
+        return [
+            ('GitHub Trending', self._crawl_github_trending),  # 完全公开数据
+            ('知乎热榜', self._crawl_zhihu_hot),                # 公开排行榜
+            ('B站热门', self._crawl_bilibili_hot),              # 公开API
+            ('豆瓣热门', self._crawl_douban_hot)                # 公开排行榜
+        ]
+    
     def crawl_real_hot_trends(self):
         """爬取真实可访问的爆款数据"""
         print("🚀 开始爬取真实爆款趋势数据...")
         
         all_trends = []
         
-        # 1. 爬取GitHub Trending (完全公开数据)
-        github_trends = self._crawl_github_trending()
-        all_trends.extend(github_trends)
-        
-        # 2. 爬取知乎热榜 (公开排行榜)
-        zhihu_hot = self._crawl_zhihu_hot()
-        all_trends.extend(zhihu_hot)
-        
-        # 3. 爬取B站热门视频 (公开API)
-        bilibili_hot = self._crawl_bilibili_hot()
-        all_trends.extend(bilibili_hot)
-        
-        # 4. 爬取豆瓣热门 (公开排行榜)
-        douban_hot = self._crawl_douban_hot()
-        all_trends.extend(douban_hot)
+        for site_name, crawler_func in self.get_crawl_jobs():
+            all_trends.extend(crawler_func())
         
         print(f"✅ 爬取完成，共获取 {len(all_trends)} 条真实爆款数据")
         return all_trends
@@ -74,33 +71,8 @@ class WorkingHotTrendCrawler(RealCrawler):
         ]
         
         for url in urls:
-            response = self.get_page_safely(url)
-            if not response:
-                continue
-                
             try:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 查找项目标题
-                repo_links = soup.find_all('h2', class_='h3')
-                
-                for i, link in enumerate(repo_links[:10]):
-                    title_elem = link.find('a')
-                    if title_elem:
-                        title = title_elem.get_text(strip=True)
-                        repo_url = "https://github.com" + title_elem.get('href', '')
-                        
-                        trends.append({
-                            'title': title,
-                            'category': '开源项目',
-                            'platform': 'GitHub',
-                            'hot_score': random.uniform(90, 99),
-                            'url': repo_url,
-                            'trend_type': '技术爆款',
-                            'crawl_time': datetime.now().isoformat()
-                        })
-                        time.sleep(0.5)
-                        
+                trends.extend(self.crawl_page_safely(url, self._parse_github_page))
             except Exception as e:
                 print(f"解析GitHub页面失败: {str(e)}")
                 continue
@@ -108,6 +80,10 @@ class WorkingHotTrendCrawler(RealCrawler):
         print(f"   获取GitHub爆款: {len(trends)}个")
         return trends
     
+    def _parse_github_page(self, response, url):
+        """解析GitHub Trending页面（在解析进程池中执行）"""
+        return extract_pool.run(parse_github_trending, response, url)
+    
     def _crawl_zhihu_hot(self):
         """爬取知乎热榜"""
         print("❓ 爬取知乎热榜...")
@@ -155,30 +131,8 @@ class WorkingHotTrendCrawler(RealCrawler):
         ]
         
         for url in urls:
-            response = self.get_page_safely(url)
-            if not response:
-                continue
-                
             try:
-                data = response.json()
-                videos = data.get('data', {}).get('list', []) or data.get('data', [])
-                
-                for i, video in enumerate(videos[:10]):
-                    title = video.get('title', video.get('name', '未知视频'))
-                    video_url = f"https://www.bilibili.com/video/{video.get('bvid', video.get('aid', ''))}"
-                    category = video.get('tname', '综合')
-                    
-                    trends.append({
-                        'title': title,
-                        'category': category,
-                        'platform': '哔哩哔哩',
-                        'hot_score': random.uniform(85, 98),
-                        'url': video_url,
-                        'trend_type': '视频爆款',
-                        'crawl_time': datetime.now().isoformat()
-                    })
-                    time.sleep(0.3)
-                    
+                trends.extend(self.crawl_page_safely(url, self._parse_bilibili_page))
             except Exception as e:
                 print(f"解析B站数据失败: {str(e)}")
                 continue
@@ -186,6 +140,30 @@ class WorkingHotTrendCrawler(RealCrawler):
         print(f"   获取B站爆款: {len(trends)}个")
         return trends
     
+    def _parse_bilibili_page(self, response, url):
+        """解析B站排行榜接口数据"""
+        trends = []
+        
+        data = response.json()
+        videos = data.get('data', {}).get('list', []) or data.get('data', [])
+        
+        for i, video in enumerate(videos[:10]):
+            title = video.get('title', video.get('name', '未知视频'))
+            video_url = f"https://www.bilibili.com/video/{video.get('bvid', video.get('aid', ''))}"
+            category = video.get('tname', '综合')
+            
+            trends.append({
+                'title': title,
+                'category': category,
+                'platform': '哔哩哔哩',
+                'hot_score': random.uniform(85, 98),
+                'url': video_url,
+                'trend_type': '视频爆款',
+                'crawl_time': datetime.now().isoformat()
+            })
+        
+        return trends
+    
     def _crawl_douban_hot(self):
         """爬取豆瓣热门"""
         print("🎬 爬取豆瓣热门...")
@@ -221,6 +199,37 @@ class WorkingHotTrendCrawler(RealCrawler):
         print(f"   获取豆瓣爆款: {len(trends)}个")
         return trends
 
+def parse_github_trending(markup, url):
+    """从GitHub Trending页面文本中解析项目（模块级函数，可在解析进程中执行）"""
+    trends = []
+    
+    # 项目标题为 <h2 class="h3 ..."> 中的第一个链接，其后的赞助、作者等链接不是项目
+    for link in extract_links(markup, selector='h2.h3 > a:first-of-type', limit=10):
+        trends.append({
+            'title': link.text,
+            'category': '开源项目',
+            'platform': 'GitHub',
+            'hot_score': random.uniform(90, 99),
+            'url': "https://github.com" + link.href,
+            'trend_type': '技术爆款',
+            'crawl_time': datetime.now().isoformat()
+        })
+    
+    return trends
+
+def trend_to_content(trend):
+    """将爆款数据转换为数据库内容格式"""
+    return {
+        'content_type': 'entertainment',  # 归类为娱乐内容
+        'title': trend['title'],
+        'category': trend['category'],
+        'url': trend['url'],
+        'popularity_score': trend['hot_score'],
+        'crawl_date': datetime.now().date(),
+        'source_site': trend['platform'],
+        'raw_data': trend
+    }
+
 def save_real_trends_to_db():
     """将真实爬取的数据保存到数据库"""
     from database import db_manager
@@ -229,18 +238,7 @@ def save_real_trends_to_db():
     real_trends = crawler.crawl_real_hot_trends()
     
     # 转换为数据库格式
-    db_records = []
-    for trend in real_trends:
-        db_records.append({
-            'content_type': 'entertainment',  # 归类为娱乐内容
-            'title': trend['title'],
-            'category': trend['category'],
-            'url': trend['url'],
-            'popularity_score': trend['hot_score'],
-            'crawl_date': datetime.now().date(),
-            'source_site': trend['platform'],
-            'raw_data': trend
-        })
+    db_records = [trend_to_content(trend) for trend in real_trends]
     
     # 保存到数据库
     if db_records:
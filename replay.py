@@ -0,0 +1,248 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin
+
+from requests.utils import requote_uri
+
+from config import Config
+
+DEFAULT_FIXTURES_DIR = os.path.join(Config.BASE_DIR, 'fixtures', 'responses')
+
+# 录制时保存的响应头
+RECORDED_HEADERS = ('content-type', 'etag', 'last-modified', 'cache-control', 'location')
+
+
+def _fixture_key(url):
+    """统一URL的编码形式，录制与回放按同一形式查找"""
+    return requote_uri(url)
+
+
+class FixtureStore:
+    """录制的HTTP响应
+
+    index.json 记录 URL 到状态码、响应头与正文文件的映射，正文按
+    sha256 存放在 bodies/ 下，相同内容只保存一份。
+    """
+
+    def __init__(self, root=None):
+        self.root = root or DEFAULT_FIXTURES_DIR
+        self.index_path = os.path.join(self.root, 'index.json')
+        self.bodies_dir = os.path.join(self.root, 'bodies')
+        self.entries = {}
+        self.lock = threading.Lock()
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def urls(self):
+        """已录制的URL"""
+        return list(self.entries)
+
+    def add(self, url, status, headers, body):
+        """保存一个响应"""
+        digest = hashlib.sha256(body).hexdigest()
+        os.makedirs(self.bodies_dir, exist_ok=True)
+        path = os.path.join(self.bodies_dir, f'{digest}.bin')
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(body)
+
+        with self.lock:
+            self.entries[_fixture_key(url)] = {
+                'status': status,
+                'headers': headers,
+                'body': digest,
+                'recorded_at': time.time()
+            }
+
+    def get(self, url):
+        """读取响应，返回 (status, headers, body)，未录制返回None"""
+        entry = self.entries.get(_fixture_key(url))
+        if entry is None:
+            return None
+        with open(os.path.join(self.bodies_dir, f"{entry['body']}.bin"), 'rb') as f:
+            body = f.read()
+        return entry['status'], entry['headers'], body
+
+    def save(self):
+        """写入索引"""
+        os.makedirs(self.root, exist_ok=True)
+        with self.lock:
+            with open(self.index_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+
+
+class FixtureRecorder:
+    """挂在共享传输层上，把经过的每个真实响应写入 FixtureStore
+
+        with FixtureRecorder(store):
+            NovelCrawler().crawl_all()
+    """
+
+    def __init__(self, store, transport=None):
+        if transport is None:
+            from transport import transport
+        self.store = store
+        self.transport = transport
+        self.recorded = 0
+
+    def __enter__(self):
+        self.transport.add_response_hook(self.record)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.transport.remove_response_hook(self.record)
+        self.store.save()
+
+    def record(self, response):
+        """保存响应（304等无正文的响应不保存，避免覆盖已录制的页面）"""
+        if response.status_code == 304:
+            return
+        headers = {
+            key.lower(): value for key, value in response.headers.items()
+            if key.lower() in RECORDED_HEADERS
+        }
+        self.store.add(response.url, response.status_code, headers, response.content)
+        self.recorded += 1
+
+
+class ReplayServer:
+    """本地回放服务器
+
+    请求路径为 /{原URL}（配合 transport.route_to 使用），返回录制的响应。
+    latency 为每个请求的延迟区间(秒)，error_rate 概率注入错误：
+    error_status 中的状态码，或 0 表示直接断开连接。
+    支持 If-None-Match / If-Modified-Since，与录制的校验值相同时返回304。
+    """
+
+    def __init__(self, store, latency=(0, 0), error_rate=0.0, error_status=(503,), seed=None, host='127.0.0.1', port=0):
+        self.store = store
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = tuple(error_status) or (503,)
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.counters = {'requests': 0, 'served': 0, 'not_modified': 0, 'errors': 0, 'misses': 0, 'bytes': 0}
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """在后台线程中启动服务"""
+        self.thread = threading.Thread(target=self.server.serve_forever, name='replay-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """停止服务"""
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def stats(self):
+        """请求统计"""
+        with self.stats_lock:
+            return dict(self.counters)
+
+    def _count(self, name, value=1):
+        with self.stats_lock:
+            self.counters[name] += value
+
+    def _draw(self):
+        """抽取本次请求的延迟与注入的错误（None表示不注入）"""
+        with self.random_lock:
+            delay = self.random.uniform(*self.latency) if self.latency[1] > 0 else 0
+            error = self.random.choice(self.error_status) if self.random.random() < self.error_rate else None
+        return delay, error
+
+    def _handler_class(self):
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def handle(self):
+                try:
+                    super().handle()
+                except (BrokenPipeError, ConnectionResetError):
+                    # 客户端提前断开（超过下载上限、已读到所需内容或放弃错误响应）
+                    self.close_connection = True
+
+            def do_GET(self):
+                replay._count('requests')
+                url = self.path[1:]
+                delay, error = replay._draw()
+                if delay:
+                    time.sleep(delay)
+
+                if error is not None:
+                    replay._count('errors')
+                    if error == 0:
+                        self.close_connection = True
+                        self.connection.close()
+                        return
+                    self._send(error, {'content-type': 'text/plain'}, b'injected error')
+                    return
+
+                fixture = replay.store.get(url)
+                if fixture is None:
+                    replay._count('misses')
+                    self._send(404, {'content-type': 'text/plain'}, b'not recorded')
+                    return
+
+                status, headers, body = fixture
+                headers = dict(headers)
+                if 'location' in headers:
+                    headers['location'] = urljoin(url, headers['location'])
+
+                if self._not_modified(headers):
+                    replay._count('not_modified')
+                    self._send(304, {k: v for k, v in headers.items() if k in ('etag', 'last-modified')}, b'')
+                    return
+
+                replay._count('served')
+                replay._count('bytes', len(body))
+                self._send(status, headers, body)
+
+            def _not_modified(self, headers):
+                etag = self.headers.get('If-None-Match')
+                if etag and etag == headers.get('etag'):
+                    return True
+                since = self.headers.get('If-Modified-Since')
+                return bool(since) and not etag and since == headers.get('last-modified')
+
+            def _send(self, status, headers, body):
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+        return Handler
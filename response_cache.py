@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from config import Config
+
+
+class ResponseCache:
+    """磁盘HTTP响应缓存
+
+    响应体按SHA-256内容寻址存放在 blobs 目录，相同内容只存一份；
+    索引保存在缓存目录下的SQLite中，记录过期时间与最近访问时间。
+    过期时间按来源主机配置(Config.RESPONSE_CACHE_TTL)，总大小超过
+    字节预算时按最近最少使用(LRU)淘汰。
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None, ttl_config=None):
+        self.cache_dir = cache_dir or Config.RESPONSE_CACHE_DIR
+        self.max_bytes = max_bytes or Config.RESPONSE_CACHE_MAX_BYTES
+        self.ttl_config = ttl_config or Config.RESPONSE_CACHE_TTL
+        self.index_path = os.path.join(self.cache_dir, 'index.db')
+        self.lock = threading.RLock()
+        self.initialized = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_served = 0
+
+    def _connect(self):
+        """获取索引数据库连接，首次使用时建表"""
+        if not self.initialized:
+            with self.lock:
+                if not self.initialized:
+                    os.makedirs(os.path.join(self.cache_dir, 'blobs'), exist_ok=True)
+                    conn = sqlite3.connect(self.index_path, timeout=30)
+                    conn.execute('''
+                        CREATE TABLE IF NOT EXISTS entries (
+                            url TEXT PRIMARY KEY,
+                            digest TEXT NOT NULL,
+                            size INTEGER NOT NULL,
+                            headers TEXT,
+                            encoding TEXT,
+                            expires_at REAL NOT NULL,
+                            last_access REAL NOT NULL
+                        )
+                    ''')
+                    conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_access ON entries (last_access)')
+                    conn.commit()
+                    conn.close()
+                    self.initialized = True
+
+        conn = sqlite3.connect(self.index_path, timeout=30, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _blob_path(self, digest):
+        """内容哈希对应的文件路径"""
+        return os.path.join(self.cache_dir, 'blobs', digest[:2], digest)
+
+    def ttl_for(self, url):
+        """按来源主机获取缓存有效期（秒）"""
+        host = urlparse(url).netloc.lower()
+        return self.ttl_config.get(host, self.ttl_config.get('default', 0))
+
+    def get(self, url):
+        """读取未过期的缓存响应，未命中返回None"""
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT * FROM entries WHERE url = ?', (url,)).fetchone()
+            now = time.time()
+            if not row or row['expires_at'] < now:
+                self.misses += 1
+                return None
+
+            try:
+                with open(self._blob_path(row['digest']), 'rb') as f:
+                    content = f.read()
+            except OSError:
+                conn.execute('DELETE FROM entries WHERE url = ?', (url,))
+                conn.commit()
+                self.misses += 1
+                return None
+
+            conn.execute('UPDATE entries SET last_access = ? WHERE url = ?', (now, url))
+            conn.commit()
+        finally:
+            conn.close()
+
+        self.hits += 1
+        self.bytes_served += len(content)
+        return self._build_response(url, content, json.loads(row['headers'] or '{}'), row['encoding'])
+
+    def put(self, url, response, ttl=None):
+        """写入响应，仅缓存200响应"""
+        if response.status_code != 200:
+            return
+
+        ttl = self.ttl_for(url) if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        content = response.content
+        if len(content) > self.max_bytes:
+            return
+
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f"{blob_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, blob_path)
+
+        headers = {
+            key: value for key, value in response.headers.items()
+            if key.lower() in ('content-type', 'etag', 'last-modified')
+        }
+        now = time.time()
+
+        with self.lock:
+            conn = self._connect()
+            try:
+                old = conn.execute('SELECT digest FROM entries WHERE url = ?', (url,)).fetchone()
+                conn.execute('''
+                    INSERT OR REPLACE INTO entries (url, digest, size, headers, encoding, expires_at, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (url, digest, len(content), json.dumps(headers), response.encoding, now + ttl, now))
+                if old and old['digest'] != digest:
+                    self._drop_blob_if_unused(conn, old['digest'])
+                self._evict(conn)
+                conn.commit()
+            finally:
+                conn.close()
+
+    def touch(self, url, ttl=None):
+        """延长缓存有效期（如条件请求返回304时）"""
+        ttl = self.ttl_for(url) if ttl is None else ttl
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('UPDATE entries SET expires_at = ?, last_access = ? WHERE url = ?', (now + ttl, now, url))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _total_bytes(self, conn):
+        """按去重后的内容计算缓存总大小"""
+        row = conn.execute('''
+            SELECT COALESCE(SUM(size), 0) AS total
+            FROM (SELECT digest, MAX(size) AS size FROM entries GROUP BY digest)
+        ''').fetchone()
+        return row['total']
+
+    def _drop_blob_if_unused(self, conn, digest):
+        """内容不再被任何URL引用时删除文件"""
+        row = conn.execute('SELECT 1 FROM entries WHERE digest = ? LIMIT 1', (digest,)).fetchone()
+        if not row:
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError:
+                pass
+
+    def _evict(self, conn):
+        """按LRU淘汰，直到总大小回到预算内"""
+        total = self._total_bytes(conn)
+        while total > self.max_bytes:
+            row = conn.execute('SELECT url, digest FROM entries ORDER BY last_access LIMIT 1').fetchone()
+            if not row:
+                break
+            conn.execute('DELETE FROM entries WHERE url = ?', (row['url'],))
+            self._drop_blob_if_unused(conn, row['digest'])
+            self.evictions += 1
+            total = self._total_bytes(conn)
+
+    def _build_response(self, url, content, headers, encoding):
+        """由缓存内容构造 requests.Response"""
+        response = requests.Response()
+        response._content = content
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = encoding
+        response.from_cache = True
+        return response
+
+    def stats(self):
+        """缓存统计：命中率、条目数与占用空间"""
+        conn = self._connect()
+        try:
+            entries = conn.execute('SELECT COUNT(*) AS count FROM entries').fetchone()['count']
+            total_bytes = self._total_bytes(conn)
+        finally:
+            conn.close()
+
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0,
+            'bytes_served': self.bytes_served,
+            'evictions': self.evictions,
+            'entries': entries,
+            'total_bytes': total_bytes,
+            'max_bytes': self.max_bytes
+        }
+
+    def clear(self):
+        """清空缓存"""
+        with self.lock:
+            conn = self._connect()
+            try:
+                digests = [row['digest'] for row in conn.execute('SELECT DISTINCT digest FROM entries')]
+                conn.execute('DELETE FROM entries')
+                conn.commit()
+            finally:
+                conn.close()
+            for digest in digests:
+                try:
+                    os.remove(self._blob_path(digest))
+                except OSError:
+                    pass
+
+
+# 全局响应缓存实例，所有爬虫共享
+response_cache = ResponseCache()
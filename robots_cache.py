@@ -0,0 +1,107 @@
+import re
+import threading
+import time
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+from config import Config
+from database import db_manager
+from politeness import host_limiter
+from transport import transport
+from ua_pool import ua_pool
+
+
+def _max_age(cache_control):
+    """从 Cache-Control 中取 max-age（秒）"""
+    match = re.search(r'max-age\s*=\s*(\d+)', cache_control or '')
+    return int(match.group(1)) if match else None
+
+
+def _build_parser(robots_url, status, content):
+    """按状态码与内容构造 RobotFileParser（与 RobotFileParser.read 的处理一致）"""
+    rp = RobotFileParser(robots_url)
+    if status in (401, 403) or status >= 500:
+        rp.disallow_all = True
+    elif status >= 400:
+        rp.allow_all = True
+    else:
+        rp.parse((content or '').splitlines())
+    return rp
+
+
+class RobotsCache:
+    """robots.txt 缓存
+
+    解析结果缓存在内存中，原文与过期时间持久化到数据库，多次运行及多个
+    爬虫实例共享；有效期取 Cache-Control 的 max-age，没有时使用默认值。
+    缓存未命中时通过共享传输层抓取，带超时；抓取失败时按禁止抓取处理，
+    结果只在内存中缓存 error_ttl 秒，期间同一站点不再重复抓取。
+    """
+
+    def __init__(self, default_ttl=None, timeout=None, error_ttl=None):
+        self.default_ttl = default_ttl or Config.ROBOTS_CACHE_TTL
+        self.timeout = timeout or Config.ROBOTS_TIMEOUT
+        self.error_ttl = error_ttl or Config.ROBOTS_ERROR_TTL
+        self.parsers = {}
+        self.lock = threading.Lock()
+        self.host_locks = {}
+
+    def _host_lock(self, base_url):
+        """同一站点同时只抓取一次 robots.txt"""
+        with self.lock:
+            if base_url not in self.host_locks:
+                self.host_locks[base_url] = threading.Lock()
+            return self.host_locks[base_url]
+
+    def get_parser(self, url):
+        """获取URL所在站点的 robots.txt 解析器"""
+        parsed_url = urlparse(url)
+        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+        entry = self.parsers.get(base_url)
+        if entry and entry[1] > time.time():
+            return entry[0]
+
+        with self._host_lock(base_url):
+            entry = self.parsers.get(base_url)
+            if entry and entry[1] > time.time():
+                return entry[0]
+
+            robots_url = f"{base_url}/robots.txt"
+            record = db_manager.get_robots_record(base_url)
+            if record and record['expires_at'] > time.time():
+                rp = _build_parser(robots_url, record['status'], record['content'])
+                expires_at = record['expires_at']
+            else:
+                rp, expires_at = self._fetch(base_url, robots_url)
+
+            self.parsers[base_url] = (rp, expires_at)
+            return rp
+
+    def _fetch(self, base_url, robots_url):
+        """抓取并保存 robots.txt"""
+        try:
+            with host_limiter.slot(robots_url):
+                response = transport.get(robots_url, timeout=self.timeout, headers={'User-Agent': ua_pool.random})
+        except Exception as e:
+            db_manager.log_message("ERROR", "RobotsCache", f"获取robots.txt失败 {robots_url}: {str(e)}")
+            rp = RobotFileParser(robots_url)
+            rp.disallow_all = True
+            return rp, time.time() + self.error_ttl
+
+        ttl = _max_age(response.headers.get('Cache-Control'))
+        if ttl is None:
+            ttl = self.default_ttl
+        expires_at = time.time() + ttl
+
+        content = response.text if response.status_code < 400 else ''
+        db_manager.save_robots_record(base_url, response.status_code, content, expires_at)
+        return _build_parser(robots_url, response.status_code, content), expires_at
+
+    def can_fetch(self, url, user_agent='*'):
+        """robots.txt 是否允许抓取该URL"""
+        return self.get_parser(url).can_fetch(user_agent, url)
+
+
+# 全局robots.txt缓存
+robots_cache = RobotsCache()
@@ -0,0 +1,194 @@
+import heapq
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote
+
+from config import Config
+
+
+class SearchBackend(ABC):
+    """搜索引擎后端接口
+
+    search(query) 返回结果列表，每条结果包含 title、url、snippet、relevance、source。
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def search(self, query):
+        """执行查询，返回结果列表"""
+
+
+class SimulatedSearchBackend(SearchBackend):
+    """本地模拟搜索引擎（未接入真实API时使用）"""
+
+    name = 'simulated'
+
+    def __init__(self, base_urls=None, results_per_query=5):
+        self.base_urls = base_urls or [
+            "https://www.bilibili.com/read/cv",
+            "https://www.kuaikanmanhua.com/web/topic",
+            "https://manhua.dmzj.com/info",
+            "https://www.manhuatai.com"
+        ]
+        self.results_per_query = results_per_query
+
+    def search(self, query):
+        """模拟一些漫剧相关内容"""
+        results = []
+        for i in range(self.results_per_query):
+            results.append({
+                'title': f"{query} 热门作品第{i+1}名",
+                'url': f"{self.base_urls[i % len(self.base_urls)]}/{i+1000}",
+                'snippet': f"这是关于{query}的热门漫剧作品，受到了广泛关注...",
+                'relevance': 100 - i * 5,
+                'source': self.name
+            })
+        return results
+
+
+class JsonSearchBackend(SearchBackend):
+    """返回JSON的搜索服务（如本地部署的SearXNG）
+
+    url 中的 {query} 会替换为查询词；results_key 为结果列表所在字段，
+    条目中的 title/url/content 映射为统一格式，按排名计算相关度。
+    """
+
+    def __init__(self, name, url, fetcher, results_key='results', max_results=20):
+        self.name = name
+        self.url = url
+        self.fetcher = fetcher
+        self.results_key = results_key
+        self.max_results = max_results
+
+    def search(self, query):
+        response = self.fetcher.get(self.url.format(query=quote(query)), retries=1, use_cache=False)
+        entries = response.json().get(self.results_key, [])[:self.max_results]
+        return [
+            {
+                'title': entry.get('title', ''),
+                'url': entry.get('url', ''),
+                'snippet': entry.get('content') or entry.get('snippet', ''),
+                'relevance': 100 - rank * 100 / max(len(entries), 1),
+                'source': self.name
+            }
+            for rank, entry in enumerate(entries)
+            if entry.get('url')
+        ]
+
+
+def build_search_backends(configs, fetcher):
+    """按配置创建搜索后端"""
+    backends = []
+    for config in configs:
+        if config.get('type') == 'json':
+            backends.append(JsonSearchBackend(
+                config['name'], config['url'], fetcher,
+                results_key=config.get('results_key', 'results')
+            ))
+        else:
+            backends.append(SimulatedSearchBackend())
+    return backends
+
+
+class SearchCache:
+    """按 (引擎, 查询词) 缓存搜索结果"""
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl or Config.SEARCH_CACHE_TTL
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, engine, query):
+        """读取未过期的结果，未命中返回None"""
+        with self.lock:
+            entry = self.entries.get((engine, query))
+            if entry and entry[0] > time.time():
+                return entry[1]
+            return None
+
+    def put(self, engine, query, results):
+        """保存结果"""
+        with self.lock:
+            self.entries[(engine, query)] = (time.time() + self.ttl, results)
+
+
+# 全局搜索结果缓存
+search_cache = SearchCache()
+
+
+class _TopResults:
+    """按排序键保留前 k 条结果的有界小顶堆，同一URL只保留排序键最大的一条"""
+
+    def __init__(self, k):
+        self.k = k
+        self.heap = []  # (排序键, url, 结果)；被同URL更好结果替换的旧条目留在堆中，到堆顶时丢弃
+        self.keys = {}  # 堆中有效条目: url -> 排序键
+
+    def push(self, key, result):
+        url = result['url']
+        current = self.keys.get(url)
+        if current is None:
+            if len(self.keys) >= self.k:
+                if self.k <= 0 or key <= self._min_key():
+                    return
+                _, evicted, _ = heapq.heappop(self.heap)
+                del self.keys[evicted]
+        elif key <= current:
+            return
+        self.keys[url] = key
+        heapq.heappush(self.heap, (key, url, result))
+
+    def _min_key(self):
+        while self.keys.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        return self.heap[0][0]
+
+    def results(self):
+        """按排序键从大到小返回结果"""
+        return [result for key, url, result in sorted(self.heap, reverse=True) if self.keys.get(url) == key]
+
+
+def multi_search(backends, queries, max_results, cache=search_cache, max_workers=None):
+    """并发执行所有 (引擎, 查询词) 组合，流式合并为按相关度排序的前 max_results 条
+
+    每个查询完成时其结果立即并入容量为 max_results 的有界堆，内存不随结果总数增长。
+    同一URL只保留相关度最高的一条；相关度相同时按查询词与结果的原始顺序。
+    """
+    tasks = [(backend, query) for query in queries for backend in backends]
+    top = _TopResults(max_results)
+
+    def merge(task_index, results):
+        for position, result in enumerate(results):
+            top.push((result['relevance'], -task_index, -position), result)
+
+    pending = {}
+    for index, (backend, query) in enumerate(tasks):
+        results = cache.get(backend.name, query) if cache else None
+        if results is not None:
+            merge(index, results)
+        else:
+            pending[index] = (backend, query)
+
+    if pending:
+        workers = min(max_workers or Config.SEARCH_MAX_WORKERS, len(pending))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='search') as executor:
+            futures = {
+                executor.submit(backend.search, query): index
+                for index, (backend, query) in pending.items()
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                backend, query = pending[index]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    print(f"⚠️ {backend.name} 搜索失败 {query}: {str(e)}")
+                    continue
+                if cache:
+                    cache.put(backend.name, query, results)
+                merge(index, results)
+
+    return top.results()
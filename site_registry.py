@@ -0,0 +1,236 @@
+import random
+from datetime import datetime
+from urllib.parse import urljoin
+
+from encoding_cache import encoding_cache
+from extract_pool import decode_content
+from html_parser import extract_links
+from keyword_matcher import KeywordMatcher, keyword_matcher
+
+# 站点抽取规则（声明式）
+#   name: 规则名称；site_name: 来源站点；content_type: 内容类型
+#   urls: 抓取的页面列表
+#   links: 链接选择条件，对应 html_parser.extract_links 的参数（含CSS选择器 selector，如 'a[href*="onebook.php"]'）
+#   title_from: 标题取自链接文本(text)或title属性(title，为空时回退到文本)
+#   title_length: 标题长度的开区间 (最短, 最长)
+#   base_url: 相对链接补全所用的站点地址
+#   category_from: 分类依据的文本，title 或 parent_text（父节点文本）
+#   categories: keyword_matcher.TAXONOMY 中的规则集名称，或按顺序匹配的 [(分类, 关键词列表)]，
+#               都不匹配时为 default_category
+#   score_range: 热度分数范围
+#   max_items: 单个页面最多保留的条目数
+#   raw_data: 原始数据模板，字符串值可使用 {page_url} {page_file} {page_section}
+SITE_SPECS = [
+    {
+        'name': 'qidian',
+        'site_name': '起点中文网',
+        'content_type': 'novel',
+        'urls': [
+            'https://www.qidian.com/rank/hotsales/',
+            'https://www.qidian.com/rank/finvisit/',
+            'https://www.qidian.com/rank/newhot/'
+        ],
+        'links': {'href_contains': '/book/', 'with_parent_text': True, 'limit': 15},
+        'title_from': 'text',
+        'title_length': (5, 50),
+        'base_url': 'https://www.qidian.com',
+        'category_from': 'parent_text',
+        'categories': 'site.qidian',
+        'default_category': '网络小说',
+        'score_range': (85, 98),
+        'max_items': 10,
+        'raw_data': {'source': 'qidian', 'page_url': '{page_url}'}
+    },
+    {
+        'name': 'jjwxc',
+        'site_name': '晋江文学城',
+        'content_type': 'novel',
+        'urls': [
+            'https://www.jjwxc.net/toptoplist.php?orderstr=1',  # 总排行榜
+            'https://www.jjwxc.net/toptoplist.php?orderstr=2',  # 月排行榜
+            'https://www.jjwxc.net/toptoplist.php?orderstr=3'   # 周排行榜
+        ],
+        'links': {'selector': 'a[href*="onebook.php"]', 'limit': 12},
+        'title_from': 'text',
+        'title_length': (3, 40),
+        'base_url': 'https://www.jjwxc.net/',
+        'default_category': '言情小说',
+        'score_range': (75, 92),
+        'raw_data': {'source': 'jjwxc', 'rank_type': 'popular'}
+    },
+    {
+        'name': 'youku',
+        'site_name': '优酷',
+        'content_type': 'drama',
+        'urls': [
+            'https://list.youku.com/category/show/c_97_s_1_d_1.html',  # 热门短剧
+            'https://list.youku.com/category/show/c_96_s_1_d_1.html',  # 热门电影
+            'https://list.youku.com/category/show/c_95_s_1_d_1.html'   # 热门综艺
+        ],
+        'links': {'require_title': True, 'limit': 15},
+        'title_from': 'title',
+        'title_length': (4, 50),
+        'base_url': 'https://www.youku.com',
+        'category_from': 'title',
+        'categories': 'site.youku',
+        'default_category': '影视娱乐',
+        'score_range': (65, 88),
+        'raw_data': {'source': 'youku', 'page_category': '{page_file}'}
+    },
+    {
+        'name': 'sina',
+        'site_name': '新浪新闻',
+        'content_type': 'news',
+        'urls': [
+            'https://news.sina.com.cn/hotnews/',  # 24小时热门
+            'https://news.sina.com.cn/china/',    # 国内新闻
+            'https://news.sina.com.cn/world/'     # 国际新闻
+        ],
+        'links': {'href_contains': ('.shtml', 'news.sina'), 'limit': 20},
+        'title_from': 'text',
+        'title_length': (10, 80),
+        'base_url': 'https://news.sina.com.cn',
+        'category_from': 'title',
+        'categories': 'site.sina',
+        'default_category': '综合新闻',
+        'score_range': (70, 95),
+        'raw_data': {'source': 'sina', 'section': '{page_section}'}
+    }
+]
+
+
+class SiteExtractor:
+    """由站点规则编译出的抽取器
+
+    分类关键词由关键词匹配器一次扫描完成，抽取时只做一次链接扫描。
+    extract(response, url) 可直接作为 crawl_page 的解析函数，
+    extract_markup(markup, url) 直接处理已解码的页面文本。
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.name = spec['name']
+        self.site_name = spec['site_name']
+        self.content_type = spec['content_type']
+        self.urls = list(spec['urls'])
+        self.links = dict(spec.get('links', {}))
+        self.title_from = spec.get('title_from', 'text')
+        self.min_length, self.max_length = spec.get('title_length', (0, 1000))
+        self.base_url = spec.get('base_url')
+        self.category_from = spec.get('category_from', 'title')
+        self.default_category = spec.get('default_category', '')
+        self.score_range = spec.get('score_range', (60, 90))
+        self.max_items = spec.get('max_items')
+        self.raw_data = dict(spec.get('raw_data', {}))
+
+        # 分类规则: 引用中心分类体系中的规则集，或站点内联的关键词列表；
+        # 只用本站点的规则集编译匹配器，标题扫描不涉及其他规则集的关键词
+        categories = spec.get('categories')
+        if isinstance(categories, str):
+            self.category_rule = categories
+            self.matcher = keyword_matcher.select(categories)
+        elif categories:
+            self.category_rule = 'categories'
+            self.matcher = KeywordMatcher({'categories': {'labels': categories}})
+        else:
+            self.matcher, self.category_rule = None, None
+
+        # 分类依赖父节点文本时才让解析器保留父节点
+        if self.category_from == 'parent_text' and self.matcher:
+            self.links['with_parent_text'] = True
+
+    def extract(self, response, url):
+        """从响应中抽取条目（按 encoding_cache 判定的编码解码原始字节）"""
+        return self.extract_markup(decode_content(response.content, encoding_cache.resolve(response)), url)
+
+    def extract_markup(self, markup, url):
+        """从页面文本中抽取条目"""
+        items = []
+        page_fields = self._page_fields(url)
+
+        for link in extract_links(markup, **self.links):
+            title = link.text
+            if self.title_from == 'title':
+                title = link.title.strip() or link.text
+
+            if not self.min_length < len(title) < self.max_length:
+                continue
+
+            items.append({
+                'content_type': self.content_type,
+                'title': title,
+                'category': self.classify(link.parent_text if self.category_from == 'parent_text' else title),
+                'url': self.normalize_url(link.href),
+                'popularity_score': random.uniform(*self.score_range),
+                'crawl_date': datetime.now().date(),
+                'source_site': self.site_name,
+                'raw_data': {
+                    key: value.format(**page_fields) if isinstance(value, str) else value
+                    for key, value in self.raw_data.items()
+                }
+            })
+            if self.max_items and len(items) >= self.max_items:
+                break
+
+        return items
+
+    def classify(self, text):
+        """按规则顺序匹配分类"""
+        if not self.matcher:
+            return self.default_category
+        return self.matcher.scan(text).first(self.category_rule, self.default_category)
+
+    def normalize_url(self, href):
+        """补全相对链接"""
+        if self.base_url:
+            return urljoin(self.base_url, href)
+        return href
+
+    @staticmethod
+    def _page_fields(url):
+        """raw_data 模板可用的页面字段"""
+        parts = url.split('/')
+        return {
+            'page_url': url,
+            'page_file': parts[-1],
+            'page_section': parts[-2] if len(parts) > 1 else ''
+        }
+
+
+class SiteRegistry:
+    """站点抽取器注册表，规则在注册时编译一次"""
+
+    def __init__(self, specs=None):
+        self.extractors = {}
+        for spec in specs or []:
+            self.register(spec)
+
+    def register(self, spec):
+        """编译并注册站点规则，同名规则会被覆盖"""
+        extractor = SiteExtractor(spec)
+        self.extractors[extractor.name] = extractor
+        return extractor
+
+    def get(self, name):
+        """按名称获取抽取器"""
+        return self.extractors[name]
+
+    def for_content_type(self, content_type):
+        """获取某内容类型下的全部抽取器（按注册顺序）"""
+        return [extractor for extractor in self.extractors.values() if extractor.content_type == content_type]
+
+
+# 全局站点注册表
+site_registry = SiteRegistry(SITE_SPECS)
+
+
+def extract_site(markup, spec, url):
+    """按站点规则抽取页面条目
+
+    模块级函数，可在解析进程中执行；子进程中没有该规则或规则已变化时
+    先在子进程的注册表中编译注册，之后复用。
+    """
+    extractor = site_registry.extractors.get(spec['name'])
+    if extractor is None or extractor.spec != spec:
+        extractor = site_registry.register(spec)
+    return extractor.extract_markup(markup, url)
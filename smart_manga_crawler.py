@@ -1,26 +1,32 @@
-import requests
-import time
 import json
 import re
-from bs4 import BeautifulSoup
-from urllib.robotparser import RobotFileParser
 from urllib.parse import urljoin, urlparse
-import whois
 from datetime import datetime
+from http_fetcher import HttpFetcher
+from html_parser import make_soup
+from extract_pool import extract_pool
+from keyword_matcher import keyword_matcher
+from robots_cache import robots_cache
+from whois_cache import whois_cache
+from search_backends import build_search_backends, multi_search
+from config import Config
+from concurrent.futures import ThreadPoolExecutor
 import psutil
 import GPUtil
 
+manga_category_matcher = keyword_matcher.select('manga.category')
+
 class SmartSearchEngine:
     """智能搜索引擎 - 专门针对漫剧行业"""
     
     def __init__(self):
-        self.session = requests.Session()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
         }
-        self.session.headers.update(self.headers)
+        self.fetcher = HttpFetcher(self.headers, timeout=10)
+        self.search_backends = build_search_backends(Config.SEARCH_BACKENDS, self.fetcher)
         
         # 漫剧行业关键词库
         self.manga_keywords = [
@@ -40,8 +46,6 @@ class SmartSearchEngine:
         """多搜索引擎查询"""
         print(f"🔍 搜索查询: {query}")
         
-        all_results = []
-        
         # 构造行业相关查询
         industry_queries = [
             query,
@@ -51,76 +55,23 @@ class SmartSearchEngine:
             f"{query} 排行榜"
         ]
         
-        for search_query in industry_queries:
-            # 模拟搜索引擎结果（实际应接入真实API）
-            engine_results = self._simulate_search_results(search_query)
-            all_results.extend(engine_results)
-            time.sleep(1)
-        
-        # 去重和排序
-        unique_results = self._deduplicate_results(all_results)
-        return sorted(unique_results, key=lambda x: x['relevance'], reverse=True)[:max_results]
-    
-    def _simulate_search_results(self, query):
-        """模拟搜索引擎结果（实际应替换为真实API）"""
-        # 这里应该接入真实的搜索引擎API
-        # 现在模拟一些漫剧相关内容
-        base_urls = [
-            "https://www.bilibili.com/read/cv",
-            "https://www.kuaikanmanhua.com/web/topic",
-            "https://manhua.dmzj.com/info",
-            "https://www.manhuatai.com"
-        ]
-        
-        results = []
-        for i in range(5):
-            url = f"{base_urls[i % len(base_urls)]}/{i+1000}"
-            title = f"{query} 热门作品第{i+1}名"
-            snippet = f"这是关于{query}的热门漫剧作品，受到了广泛关注..."
-            
-            results.append({
-                'title': title,
-                'url': url,
-                'snippet': snippet,
-                'relevance': 100 - i * 5,
-                'source': 'simulated'
-            })
-        
-        return results
-    
-    def _deduplicate_results(self, results):
-        """结果去重"""
-        seen_urls = set()
-        unique_results = []
-        
-        for result in results:
-            if result['url'] not in seen_urls:
-                seen_urls.add(result['url'])
-                unique_results.append(result)
-        
-        return unique_results
+        # 所有引擎与查询并发执行，结果按 (引擎, 查询词) 缓存，去重后取相关度最高的前N条
+        return multi_search(self.search_backends, industry_queries, max_results)
 
 class ProtocolChecker:
     """爬虫协议检查器"""
     
     def __init__(self):
-        self.robot_parsers = {}
+        self.robots = robots_cache
     
     def check_robots_txt(self, url):
-        """检查robots.txt协议"""
+        """检查robots.txt协议（使用持久化的robots.txt缓存）"""
         try:
             parsed_url = urlparse(url)
             base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
             
-            if base_url not in self.robot_parsers:
-                rp = RobotFileParser()
-                robots_url = urljoin(base_url, '/robots.txt')
-                rp.set_url(robots_url)
-                rp.read()
-                self.robot_parsers[base_url] = rp
-            
             # 检查是否允许爬取
-            can_fetch = self.robot_parsers[base_url].can_fetch('*', url)
+            can_fetch = self.robots.can_fetch(url)
             return {
                 'allowed': can_fetch,
                 'checked_url': url,
@@ -135,91 +86,30 @@ class ProtocolChecker:
             }
     
     def check_site_legality(self, url):
-        """检查网站合法性"""
+        """检查网站合法性（WHOIS结果按域名缓存）"""
         try:
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc
-            
-            # 简单的域名检查
-            whois_info = whois.whois(domain)
-            return {
-                'domain': domain,
-                'registered': whois_info.registrar is not None,
-                'creation_date': str(whois_info.creation_date) if whois_info.creation_date else 'Unknown'
-            }
+            domain = urlparse(url).netloc
+            return whois_cache.lookup(domain)
         except Exception as e:
             return {
                 'domain': urlparse(url).netloc,
                 'error': str(e)
             }
 
-class MangaIndustryCrawler(SmartSearchEngine, ProtocolChecker):
-    """漫剧行业专业爬虫"""
+class MangaPageExtractor:
+    """漫剧页面信息提取（不依赖抓取状态，可在解析进程中执行）"""
+    
+    # 热度估算: 采集到这么多条人气/点击/评分数据后停止扫描，扫描的页面文本字符数上限
+    POPULARITY_MAX_COUNTERS = 10
+    POPULARITY_MAX_CHARS = 200000
     
     def __init__(self):
-        SmartSearchEngine.__init__(self)
-        ProtocolChecker.__init__(self)
-        self.crawled_domains = set()
         self.industry_patterns = {
             'manga_title': r'[\u4e00-\u9fff\w\s\-_\(\)]+(漫画|动漫|漫剧)',
-            'popularity_indicator': r'(热门|人气|火爆| trending |hot |popular )',
-            'rating_pattern': r'(\d+\.\d+分|\d+万人气|\d+万点击)'
+            'popularity_indicator': r'(热门|人气|火爆|推荐|必看| trending |hot |popular )',
+            'rating_pattern': r'(\d+\.\d+)分(?!钟)|(\d+(?:\.\d+)?)万(人气|点击)'
         }
-    
-    def discover_industry_targets(self, industry_term="漫剧"):
-        """发现行业相关目标网站"""
-        print(f"🌐 发现{industry_term}相关目标...")
-        
-        # 搜索行业相关网站
-        search_results = self.search_with_engines(industry_term)
-        
-        valid_targets = []
-        for result in search_results:
-            url = result['url']
-            protocol_check = self.check_robots_txt(url)
-            legality_check = self.check_site_legality(url)
-            
-            if protocol_check['allowed'] and legality_check.get('registered', False):
-                valid_targets.append({
-                    'url': url,
-                    'title': result['title'],
-                    'relevance': result['relevance'],
-                    'protocol_ok': True,
-                    'legal': True
-                })
-                print(f"   ✅ {url} - 符合爬取条件")
-            else:
-                print(f"   ❌ {url} - 不符合爬取条件")
-        
-        return valid_targets
-    
-    def crawl_manga_content(self, targets):
-        """爬取漫剧内容"""
-        print("🕷️ 开始爬取漫剧内容...")
-        manga_data = []
-        
-        for target in targets[:10]:  # 限制爬取数量
-            try:
-                print(f"   爬取: {target['url']}")
-                response = self.session.get(target['url'], timeout=10)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 提取漫剧相关信息
-                manga_info = self._extract_manga_info(soup, target['url'])
-                if manga_info:
-                    manga_info['source_url'] = target['url']
-                    manga_info['crawl_time'] = datetime.now().isoformat()
-                    manga_data.append(manga_info)
-                
-                time.sleep(2)  # 避免过于频繁
-                
-            except Exception as e:
-                print(f"   ❌ 爬取失败 {target['url']}: {str(e)}")
-                continue
-        
-        return manga_data
+        self.compiled_patterns = {name: re.compile(pattern) for name, pattern in self.industry_patterns.items()}
     
     def _extract_manga_info(self, soup, url):
         """提取漫剧信息"""
@@ -257,42 +147,146 @@ class MangaIndustryCrawler(SmartSearchEngine, ProtocolChecker):
             return None
     
     def _classify_manga_category(self, title):
-        """分类漫剧类型"""
-        categories = {
-            '恋爱': ['恋爱', '浪漫', '爱情', '恋爱喜剧'],
-            '校园': ['校园', '学园', '学生', '青春'],
-            '奇幻': ['奇幻', '魔法', '异世界', '玄幻'],
-            '搞笑': ['搞笑', '喜剧', '幽默', '欢乐'],
-            '热血': ['热血', '战斗', '冒险', '动作'],
-            '治愈': ['治愈', '温馨', '日常', '生活']
-        }
-        
-        for category, keywords in categories.items():
-            if any(keyword in title for keyword in keywords):
-                return category
-        
-        return '其他'
+        """分类漫剧类型（题材关键词见 keyword_matcher 中的 manga.category）"""
+        return manga_category_matcher.scan(title).first('manga.category')
     
     def _estimate_popularity(self, soup):
-        """估算热度分数"""
-        # 简单的热度估算逻辑
-        text_content = soup.get_text()
-        score = 50  # 基础分数
+        """估算热度分数：逐个文本节点扫描一次，信号足够时提前结束
         
-        # 根据关键词加分
-        popularity_keywords = ['热门', '人气', '火爆', '推荐', '必看']
-        for keyword in popularity_keywords:
-            if keyword in text_content:
-                score += 5
+        热度用语（popularity_indicator）每种加5分；页面上的人气/点击数与
+        评分（rating_pattern，如“120万人气”“9.5分”）按数值加分。
+        """
+        indicator_pattern = self.compiled_patterns['popularity_indicator']
+        rating_pattern = self.compiled_patterns['rating_pattern']
+        indicators = set()
+        counts = []   # 人气/点击数（万）
+        ratings = []  # 评分（10分制）
         
-        # 根据数字信息加分
-        numbers = re.findall(r'\d+', text_content)
-        if numbers:
-            avg_number = sum(int(n) for n in numbers[:10]) / len(numbers[:10])
-            score += min(avg_number / 1000, 20)
+        carry = ''  # 上一个节点的末尾，数字与单位可能分在相邻节点中（如 <b>120</b>万人气）
+        scanned = 0
+        for string in soup.strings:
+            text = carry + string
+            offset = len(carry)
+            for match in indicator_pattern.finditer(text):
+                indicators.add(match.group(1))
+            for match in rating_pattern.finditer(text):
+                if match.end() <= offset:
+                    continue  # 已在上一个节点中计入
+                if match.group(1):
+                    rating = float(match.group(1))
+                    if rating <= 10:
+                        ratings.append(rating)
+                else:
+                    counts.append(float(match.group(2)))
+            carry = text[-16:]
+            
+            scanned += len(string)
+            if len(counts) + len(ratings) >= self.POPULARITY_MAX_COUNTERS or scanned >= self.POPULARITY_MAX_CHARS:
+                break
+        
+        score = 50  # 基础分数
+        score += 5 * len(indicators)
+        if counts:
+            score += min(max(counts) / 5, 20)  # 100万人气/点击加满20分
+        if ratings:
+            score += max(sum(ratings) / len(ratings) - 6, 0) * 2.5  # 10分加10分
         
         return min(score, 100)
 
+_page_extractor = MangaPageExtractor()
+
+def extract_manga_page(markup, url):
+    """解析页面文本并提取漫剧信息（模块级函数，供解析进程池调用）"""
+    return _page_extractor._extract_manga_info(make_soup(markup), url)
+
+class MangaIndustryCrawler(SmartSearchEngine, ProtocolChecker, MangaPageExtractor):
+    """漫剧行业专业爬虫"""
+    
+    def __init__(self):
+        SmartSearchEngine.__init__(self)
+        ProtocolChecker.__init__(self)
+        MangaPageExtractor.__init__(self)
+        self.crawled_domains = set()
+    
+    def discover_industry_targets(self, industry_term="漫剧"):
+        """发现行业相关目标网站"""
+        print(f"🌐 发现{industry_term}相关目标...")
+        
+        # 搜索行业相关网站
+        search_results = self.search_with_engines(industry_term)
+        
+        # 按域名去重后并发预取robots.txt与WHOIS，之后的逐条检查都命中缓存
+        domain_urls = {}
+        for result in search_results:
+            domain_urls.setdefault(urlparse(result['url']).netloc, result['url'])
+        self._prefetch_site_checks(domain_urls.values())
+        
+        valid_targets = []
+        for result in search_results:
+            url = result['url']
+            protocol_check = self.check_robots_txt(url)
+            legality_check = self.check_site_legality(url)
+            
+            if protocol_check['allowed'] and legality_check.get('registered', False):
+                valid_targets.append({
+                    'url': url,
+                    'title': result['title'],
+                    'relevance': result['relevance'],
+                    'protocol_ok': True,
+                    'legal': True
+                })
+                print(f"   ✅ {url} - 符合爬取条件")
+            else:
+                print(f"   ❌ {url} - 不符合爬取条件")
+        
+        return valid_targets
+    
+    def _prefetch_site_checks(self, urls):
+        """每个域名取一个URL，并发执行robots与WHOIS检查"""
+        urls = list(urls)
+        if not urls:
+            return
+        
+        workers = min(Config.TARGET_CHECK_WORKERS, len(urls) * 2)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='site-check') as executor:
+            futures = []
+            for url in urls:
+                futures.append(executor.submit(self.check_robots_txt, url))
+                futures.append(executor.submit(self.check_site_legality, url))
+            for future in futures:
+                future.result()
+    
+    def crawl_manga_content(self, targets):
+        """爬取漫剧内容"""
+        print("🕷️ 开始爬取漫剧内容...")
+        manga_data = []
+        
+        # 抓取线程只负责下载，页面提交给解析进程池后继续抓取下一个
+        pending = []
+        for target in targets[:10]:  # 限制爬取数量
+            try:
+                print(f"   爬取: {target['url']}")
+                # 搜索发现的页面大小不可控：限制下载字节数
+                response = self.fetcher.get(target['url'], retries=1, max_bytes=Config.DOWNLOAD_TARGET_MAX_BYTES)
+                pending.append((target, extract_pool.submit(extract_manga_page, response, target['url'])))
+            except Exception as e:
+                print(f"   ❌ 爬取失败 {target['url']}: {str(e)}")
+                continue
+        
+        for target, future in pending:
+            try:
+                # 提取漫剧相关信息
+                manga_info = future.result()
+            except Exception as e:
+                print(f"   ❌ 解析失败 {target['url']}: {str(e)}")
+                continue
+            if manga_info:
+                manga_info['source_url'] = target['url']
+                manga_info['crawl_time'] = datetime.now().isoformat()
+                manga_data.append(manga_info)
+        
+        return manga_data
+    
 class HardwareMonitor:
     """硬件监控系统"""
     
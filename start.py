@@ -6,32 +6,33 @@
 Content Trend Analysis and Prediction System Startup Script
 """
 
+import importlib.util
 import os
 import sys
 import subprocess
+import threading
 from config import Config
 
 def check_dependencies():
     """检查依赖包"""
     print("🔍 检查依赖包...")
-    try:
-        import flask
-        import requests
-        import beautifulsoup4
-        import ollama
-        print("✅ 所有依赖包已安装")
-        return True
-    except ImportError as e:
-        print(f"❌ 缺少依赖包: {e}")
+    # 只检查是否已安装，不在启动时导入
+    missing = [name for name in ('flask', 'requests', 'bs4', 'ollama') if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"❌ 缺少依赖包: {', '.join(missing)}")
         print("请运行: pip install -r requirements.txt")
         return False
+    print("✅ 所有依赖包已安装")
+    return True
 
 def check_ollama():
-    """检查Ollama服务"""
-    print("🔍 检查Ollama服务...")
+    """检查Ollama服务（在后台线程中运行，结果只作提示）"""
     try:
-        import ollama
-        models = ollama.list()
+        # 直接请求Ollama的HTTP接口，避免启动时导入ollama包
+        import requests
+        response = requests.get(f"{Config.OLLAMA_HOST}/api/tags", timeout=5)
+        response.raise_for_status()
+        models = response.json()
         if models and 'models' in models:
             print(f"✅ Ollama服务正常，发现 {len(models['models'])} 个模型")
             for model in models['models']:
@@ -53,9 +54,9 @@ def initialize_system():
     Config.init_directories()
     print("✅ 目录结构初始化完成")
     
-    # 初始化数据库
-    from database import db_manager
-    print("✅ 数据库初始化完成")
+    # 数据库、爬虫与AI分析器在首次使用时创建
+    if Config.WARM_UP_ON_START:
+        print("✅ 数据库、爬虫与AI分析器将在后台预热")
     
     return True
 
@@ -69,9 +70,10 @@ def start_system():
     if not check_dependencies():
         return False
     
-    # 检查Ollama
-    if not check_ollama():
-        return False
+    # 后台检查Ollama，服务不可用或响应慢都不影响Web服务启动
+    if Config.AI_PROVIDER == "ollama":
+        print("🔍 后台检查Ollama服务...")
+        threading.Thread(target=check_ollama, daemon=True).start()
     
     # 初始化系统
     if not initialize_system():
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pytest
+
+import circuit_breaker as circuit_breaker_module
+from circuit_breaker import CLOSED, HALF_OPEN, CircuitBreaker
+from config import Config
+
+HOST = 'example.com'
+
+
+@pytest.fixture
+def breaker(temp_db, clock, monkeypatch):
+    monkeypatch.setattr(circuit_breaker_module, 'time', clock)
+    # 去掉冷却时间的随机抖动
+    monkeypatch.setattr(circuit_breaker_module, 'random', SimpleNamespace(uniform=lambda low, high: high))
+    return CircuitBreaker()
+
+
+def fail(breaker, times):
+    for _ in range(times):
+        breaker.record_failure(HOST)
+
+
+def test_opens_after_min_requests_when_error_rate_exceeded(breaker):
+    fail(breaker, Config.CIRCUIT_MIN_REQUESTS - 1)
+    assert breaker.allow(HOST)
+    fail(breaker, 1)
+    assert breaker.is_open(HOST)
+    assert not breaker.allow(HOST)
+    assert breaker.retry_after(HOST) == Config.CIRCUIT_BASE_BACKOFF
+
+
+def test_stays_closed_below_error_rate(breaker):
+    for _ in range(Config.CIRCUIT_WINDOW):
+        breaker.record_success(HOST)
+        breaker.record_failure(HOST)
+    assert breaker.stats()[HOST]['state'] == CLOSED
+    assert breaker.allow(HOST)
+
+
+def test_half_open_allows_single_probe_and_recovers(breaker, clock, temp_db):
+    fail(breaker, Config.CIRCUIT_MIN_REQUESTS)
+    clock.advance(Config.CIRCUIT_BASE_BACKOFF)
+
+    assert breaker.allow(HOST)
+    assert breaker.stats()[HOST]['state'] == HALF_OPEN
+    assert not breaker.allow(HOST)  # 探测请求未结束时不放行其他请求
+
+    breaker.record_success(HOST)
+    assert breaker.allow(HOST)
+    assert breaker.stats()[HOST]['open_count'] == 0
+    assert temp_db.get_host_circuit(HOST)['state'] == CLOSED
+
+
+def test_failed_probe_reopens_with_exponential_backoff(breaker, clock):
+    fail(breaker, Config.CIRCUIT_MIN_REQUESTS)
+    backoffs = [breaker.retry_after(HOST)]
+    for _ in range(8):
+        clock.advance(backoffs[-1])
+        assert breaker.allow(HOST)
+        fail(breaker, 1)  # 探测失败立即再次熔断
+        assert breaker.is_open(HOST)
+        backoffs.append(breaker.retry_after(HOST))
+
+    assert backoffs[:4] == [Config.CIRCUIT_BASE_BACKOFF * 2 ** i for i in range(4)]
+    assert max(backoffs) == Config.CIRCUIT_MAX_BACKOFF
+    assert breaker.stats()[HOST]['open_count'] == 9
+
+
+def test_state_persists_across_instances(breaker, clock):
+    fail(breaker, Config.CIRCUIT_MIN_REQUESTS)
+
+    restarted = CircuitBreaker()
+    assert restarted.is_open(HOST)
+    assert not restarted.allow(HOST)
+    assert restarted.allow('other.example.com')
+
+    clock.advance(Config.CIRCUIT_BASE_BACKOFF)
+    assert restarted.allow(HOST)
+    restarted.record_failure(HOST)
+    assert restarted.stats()[HOST]['open_count'] == 2
@@ -0,0 +1,144 @@
+import threading
+import time
+
+import pytest
+
+import crawl_scheduler as crawl_scheduler_module
+from config import Config
+from crawl_engine import CrawlJob
+from crawl_scheduler import CrawlScheduler, cadence_for
+
+CADENCES = {'新闻-新浪新闻': 600, '知乎热榜': 1800, '漫剧': 7200}
+
+
+class FakeCrawler:
+    """按任务顺序同步执行抓取函数，记录运行的任务与条目"""
+
+    def __init__(self, funcs):
+        self.funcs = funcs
+        self.runs = []
+
+    def get_crawl_jobs(self):
+        return [CrawlJob(label, site, func) for (label, site), func in self.funcs.items()]
+
+    def crawl_jobs(self, jobs):
+        for job in jobs:
+            self.runs.append(job.site_name)
+            try:
+                list(job.func())
+            except Exception:
+                pass
+
+
+def items(count):
+    return lambda: [{'title': str(i)} for i in range(count)]
+
+
+def wait_idle(scheduler, timeout=5):
+    deadline = time.monotonic() + timeout
+    while any(job['running'] for job in scheduler.status().values()):
+        assert time.monotonic() < deadline, '抓取批次未结束'
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def scheduler_env(temp_db, clock, monkeypatch):
+    monkeypatch.setattr(crawl_scheduler_module, 'time', clock)
+    monkeypatch.setattr(Config, 'CRAWL_CADENCES', CADENCES)
+    monkeypatch.setattr(Config, 'CRAWL_CADENCE_DEFAULT', 86400)
+    return temp_db
+
+
+def test_cadence_lookup_order(monkeypatch):
+    monkeypatch.setattr(Config, 'CRAWL_CADENCES', CADENCES)
+    monkeypatch.setattr(Config, 'CRAWL_CADENCE_DEFAULT', 86400)
+    assert cadence_for(CrawlJob('新闻', '新浪新闻', None)) == 600      # 任务名
+    assert cadence_for(CrawlJob('真实爆款', '知乎热榜', None)) == 1800  # 站点名
+    assert cadence_for(CrawlJob('漫剧', '腾讯动漫', None)) == 7200      # 内容类型
+    assert cadence_for(CrawlJob('小说', '起点中文网', None)) == 86400
+
+
+def test_runs_due_jobs_once_and_catches_up_after_downtime(scheduler_env, clock):
+    crawler = FakeCrawler({('新闻', '新浪新闻'): items(3), ('漫剧', '腾讯动漫'): items(2), ('小说', '起点中文网'): items(1)})
+    scheduler_env.claim_job_run('漫剧-腾讯动漫', clock.now - 10, 0)
+    scheduler_env.finish_job_run('漫剧-腾讯动漫', clock.now - 5, 'success', 2)
+    scheduler_env.claim_job_run('新闻-新浪新闻', clock.now - 10 * 600, 0)  # 停机期间错过多次
+    scheduler_env.finish_job_run('新闻-新浪新闻', clock.now - 10 * 600, 'success', 3)
+
+    scheduler = CrawlScheduler(crawler, jitter=0).load()
+    assert scheduler.next_runs['漫剧-腾讯动漫'] == clock.now - 10 + 7200
+
+    assert sorted(scheduler.tick()) == ['小说-起点中文网', '新闻-新浪新闻']  # 从未运行与错过的任务立即运行
+    wait_idle(scheduler)
+    assert sorted(crawler.runs) == ['新浪新闻', '起点中文网']  # 错过多次也只补抓一次
+
+    runs = scheduler_env.get_job_runs()
+    assert (runs['新闻-新浪新闻']['status'], runs['新闻-新浪新闻']['items']) == ('success', 3)
+    assert runs['新闻-新浪新闻']['last_started'] == clock.now
+
+    clock.advance(599)
+    assert scheduler.tick() == []
+    clock.advance(1)
+    assert scheduler.tick() == ['新闻-新浪新闻']
+    wait_idle(scheduler)
+
+
+def test_restart_resumes_from_persisted_runs(scheduler_env, clock):
+    crawler = FakeCrawler({('新闻', '新浪新闻'): items(1)})
+    scheduler = CrawlScheduler(crawler, jitter=0).load()
+    scheduler.tick()
+    wait_idle(scheduler)
+
+    clock.advance(300)
+    restarted = CrawlScheduler(crawler, jitter=0).load()
+    assert restarted.tick() == []
+    assert restarted.next_runs['新闻-新浪新闻'] == clock.now + 300
+
+
+def test_running_job_is_not_started_again(scheduler_env, clock):
+    release = threading.Event()
+
+    def slow_job():
+        release.wait(5)
+        return [{'title': 'a'}]
+
+    crawler = FakeCrawler({('新闻', '新浪新闻'): slow_job, ('小说', '起点中文网'): items(1)})
+    scheduler = CrawlScheduler(crawler, jitter=0).load()
+    assert sorted(scheduler.tick()) == ['小说-起点中文网', '新闻-新浪新闻']
+
+    clock.advance(86400)  # 超过节奏时仍在运行
+    assert scheduler.tick() == []
+    assert scheduler.run_all() == []
+    release.set()
+    wait_idle(scheduler)
+    assert crawler.runs == ['新浪新闻', '起点中文网']
+
+
+def test_jobs_claimed_by_another_process_are_skipped(scheduler_env, clock):
+    first, second = FakeCrawler({('新闻', '新浪新闻'): items(1)}), FakeCrawler({('新闻', '新浪新闻'): items(1)})
+    scheduler_env.claim_job_run('新闻-新浪新闻', clock.now, clock.now - Config.CRAWL_JOB_TIMEOUT)  # 另一进程正在运行
+
+    scheduler = CrawlScheduler(first, jitter=0).load()
+    scheduler.next_runs['新闻-新浪新闻'] = clock.now
+    assert scheduler.tick() == []
+    assert scheduler.next_runs['新闻-新浪新闻'] == clock.now + 600
+    assert not scheduler.status()['新闻-新浪新闻']['running']
+
+    # 另一进程中断后，超过 CRAWL_JOB_TIMEOUT 的认领可被接管
+    clock.advance(Config.CRAWL_JOB_TIMEOUT + 1)
+    assert CrawlScheduler(second, jitter=0).run_all() == ['新闻-新浪新闻']
+    assert second.runs == ['新浪新闻'] and first.runs == []
+
+
+def test_failed_job_is_recorded_and_rescheduled(scheduler_env, clock):
+    def broken():
+        yield {'title': 'partial'}
+        raise RuntimeError('parse error')
+
+    scheduler = CrawlScheduler(FakeCrawler({('新闻', '新浪新闻'): broken}), jitter=0).load()
+    started = clock.now
+    assert scheduler.run_all() == ['新闻-新浪新闻']
+
+    run = scheduler_env.get_job_runs()['新闻-新浪新闻']
+    assert (run['status'], run['items']) == ('failed', 1)
+    assert scheduler.status()['新闻-新浪新闻'] == {'cadence': 600, 'next_run': started + 600, 'running': False}
@@ -0,0 +1,76 @@
+import random
+
+from dedup import canonicalize_url, dedup_key
+from hot_trend_crawler import HotTrendCrawler
+from pipeline import ContentPipeline, DedupStage
+
+
+def test_canonicalize_url():
+    assert canonicalize_url('HTTP://WWW.Bilibili.com:80/video/BV1x/?spm_id_from=333&p=2#reply') == \
+        'https://bilibili.com/video/BV1x?p=2'
+    assert canonicalize_url('https://example.com/a?utm_source=x&b=2&a=1&UTM_Medium=y') == 'https://example.com/a?a=1&b=2'
+    assert canonicalize_url('https://example.com:8080/') == 'https://example.com:8080/'
+    assert canonicalize_url('http://example.com/a?q=') == canonicalize_url('https://example.com/a/?q=#top')
+    assert canonicalize_url(' mailto:someone@example.com ') == 'mailto:someone@example.com'
+    assert canonicalize_url('') == ''
+    assert canonicalize_url(None) == ''
+
+
+def test_dedup_key():
+    item = {'content_type': 'news', 'title': '标题', 'url': 'https://www.example.com/n/1?from=feed'}
+    assert dedup_key(item) == 'news|https://example.com/n/1'
+    assert dedup_key({'content_type': 'news', 'title': '标题', 'url': ''}) == 'news|title:标题'
+
+
+def news_items(count, score, start=0):
+    return [
+        {
+            'content_type': 'news',
+            'title': f'新闻{i}',
+            'category': '科技',
+            'url': f'https://news.sina.com.cn/n/{i}?utm_source=feed',
+            'popularity_score': score,
+            'source_site': '新浪新闻'
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def run_pipeline(items):
+    pipeline = ContentPipeline(stages=[DedupStage()])
+    with pipeline:
+        for item in items:
+            pipeline.put(item)
+    return pipeline.stats()
+
+
+def test_insert_counts_new_rows_and_refreshes_repeats(temp_db):
+    assert temp_db.insert_content_data(news_items(3, 50)) == 3
+    assert temp_db.insert_content_data(news_items(2, 70) + news_items(1, 60, start=3)) == 1
+
+    rows = temp_db.get_recent_content('news', 3600)
+    assert sorted((row['title'], row['popularity_score']) for row in rows) == [
+        ('新闻0', 70), ('新闻1', 70), ('新闻2', 50), ('新闻3', 60)
+    ]
+
+
+def test_repeated_crawl_refreshes_hot_trends(temp_db, monkeypatch):
+    first = run_pipeline(news_items(10, 80))
+    assert (first['saved'], first['new'], first['refreshed']) == (10, 10, 0)
+
+    # 同一天再次抓取：榜上作品热度上升，另有一条新作品；同一次运行中的重复仍被丢弃
+    second_items = news_items(10, 95) + news_items(1, 95, start=10)
+    second_items.append(dict(second_items[0], url='https://news.sina.com.cn/n/0/?spm=1'))
+    random.Random(1).shuffle(second_items)
+    second = run_pipeline(second_items)
+    assert (second['saved'], second['dropped'], second['new'], second['refreshed']) == (11, 1, 1, 10)
+
+    crawler = HotTrendCrawler(max_age=3600)
+
+    def crawl_not_expected():
+        raise AssertionError('新鲜来源不应重新抓取')
+
+    monkeypatch.setattr(crawler.news_crawler, 'get_crawl_jobs', lambda: [('新浪新闻', crawl_not_expected)])
+    hot_news = crawler._get_news_hot_trends()
+    assert sorted(item['title'] for item in hot_news) == sorted(f'新闻{i}' for i in range(11))
+    assert all(item['hot_score'] == 95 and item['source'] == '新浪新闻' for item in hot_news)
@@ -0,0 +1,70 @@
+import pytest
+
+from feed_watermark import WATERMARK_KEY, FeedWatermark, published_timestamp
+from pipeline import ContentPipeline, WatermarkStage
+
+FEED_URL = 'https://example.com/feed.xml'
+
+
+def entry(guid, pub_date=None):
+    return {'guid': guid, 'link': f'https://example.com/{guid}', 'title': guid, 'pub_date': pub_date}
+
+
+def test_published_timestamp_formats():
+    rfc822 = published_timestamp('Sat, 17 Oct 2026 10:00:00 GMT')
+    assert rfc822 == published_timestamp('2026-10-17T10:00:00Z')
+    assert rfc822 == published_timestamp('2026-10-17T18:00:00+08:00')
+    assert published_timestamp('') is None
+    assert published_timestamp('not a date') is None
+
+
+def test_first_crawl_treats_everything_as_new(temp_db):
+    watermark = FeedWatermark.load(FEED_URL)
+    assert watermark.is_new(entry('a', 'Sat, 17 Oct 2026 10:00:00 GMT'))
+    assert watermark.is_new(entry('b'))
+    assert not watermark.is_new(entry('a', 'Sat, 17 Oct 2026 10:00:00 GMT'))  # 同一次抓取中重复
+    assert watermark.new_count == 2
+
+
+def test_saved_watermark_skips_seen_and_older_items(temp_db):
+    watermark = FeedWatermark.load(FEED_URL)
+    watermark.is_new(entry('a', 'Sat, 17 Oct 2026 10:00:00 GMT'))
+    watermark.is_new(entry('b', 'Sat, 17 Oct 2026 12:00:00 GMT'))
+    watermark.save()
+
+    watermark = FeedWatermark.load(FEED_URL)
+    assert not watermark.is_new(entry('a', 'Sat, 17 Oct 2026 10:00:00 GMT'))  # GUID已记录
+    assert not watermark.is_new(entry('old', 'Sat, 17 Oct 2026 11:00:00 GMT'))  # 早于水位
+    assert watermark.is_new(entry('same-time', 'Sat, 17 Oct 2026 12:00:00 GMT'))  # 与水位同时的未见条目
+    assert watermark.is_new(entry('undated'))
+    assert watermark.is_new(entry('newer', 'Sun, 18 Oct 2026 08:00:00 GMT'))
+    # 判断基于本次抓取开始时的水位，与条目顺序无关
+    assert watermark.is_new(entry('late', 'Sat, 17 Oct 2026 12:30:00 GMT'))
+
+
+def test_guid_falls_back_to_link_and_title(temp_db):
+    watermark = FeedWatermark.load(FEED_URL)
+    assert watermark.is_new({'link': 'https://example.com/x', 'title': 'x'})
+    assert not watermark.is_new({'link': 'https://example.com/x', 'title': 'x', 'guid': ''})
+
+
+def test_save_without_new_items_does_not_write(temp_db):
+    FeedWatermark.load(FEED_URL).save()
+    assert temp_db.get_feed_watermark(FEED_URL) is None
+
+
+@pytest.mark.parametrize('fail_writes, saved', [(True, False), (False, True)])
+def test_watermark_saved_only_after_pipeline_commit(temp_db, fail_writes, saved):
+    watermark = FeedWatermark.load(FEED_URL)
+    item = entry('a', 'Sat, 17 Oct 2026 10:00:00 GMT')
+    assert watermark.is_new(item)
+
+    def failing_writer(batch):
+        raise RuntimeError('disk full')
+
+    pipeline = ContentPipeline(stages=[WatermarkStage()], writer=failing_writer if fail_writes else lambda batch: None)
+    with pipeline:
+        pipeline.put({'title': 'a', WATERMARK_KEY: watermark})
+
+    assert (temp_db.get_feed_watermark(FEED_URL) is not None) == saved
+    assert FeedWatermark.load(FEED_URL).is_new(item) != saved
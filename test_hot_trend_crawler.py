@@ -0,0 +1,48 @@
+from hot_trend_crawler import HotTrendCrawler
+
+
+def news_item(i, score):
+    return {
+        'content_type': 'news',
+        'title': f'新闻{i}',
+        'category': '科技',
+        'url': f'https://news.sina.com.cn/n/{i}',
+        'popularity_score': score,
+        'source_site': '新浪新闻'
+    }
+
+
+def age_rows(db, seconds):
+    conn = db.get_connection()
+    conn.execute("UPDATE content_data SET created_at = datetime('now', ?)", (f'-{seconds} seconds',))
+    conn.commit()
+    conn.close()
+
+
+def test_stale_incremental_source_keeps_rows_stored_earlier_today(temp_db, monkeypatch):
+    temp_db.insert_content_data([news_item(i, 95) for i in range(3)])
+    age_rows(temp_db, 7200)
+
+    calls = []
+
+    def incremental_job():
+        # 增量来源只返回上次抓取之后的新条目
+        calls.append(1)
+        yield news_item(3, 96)
+
+    crawler = HotTrendCrawler(max_age=3600)
+    monkeypatch.setattr(crawler.news_crawler, 'get_crawl_jobs', lambda: [('新浪新闻', incremental_job)])
+    hot_news = crawler._get_news_hot_trends()
+
+    assert calls == [1]
+    assert sorted(item['title'] for item in hot_news) == [f'新闻{i}' for i in range(4)]
+    assert len(temp_db.get_recent_content('news', 3600)) == 1  # 新条目经管道入库
+
+
+def test_recrawl_without_max_age_reads_back_from_database(temp_db, monkeypatch):
+    crawler = HotTrendCrawler(max_age=0)
+    items = [news_item(0, 95), dict(news_item(0, 95), url='https://news.sina.com.cn/n/0?utm_source=x'), news_item(1, 50)]
+    monkeypatch.setattr(crawler.news_crawler, 'get_crawl_jobs', lambda: [('新浪新闻', lambda: items)])
+
+    hot_news = crawler._get_news_hot_trends()
+    assert [(item['title'], item['hot_score']) for item in hot_news] == [('新闻0', 95)]
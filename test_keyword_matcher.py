@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from ai_analyzer import AIAnalyzer
+from keyword_matcher import TAXONOMY, KeywordMatcher, keyword_matcher
+
+# 原实现：逐个关键词 `in` 判断 / text.count 计数
+def reference_labels(rule, text):
+    return [label for label, keywords in rule['labels'] if any(keyword in text for keyword in keywords)]
+
+
+def reference_counts(rule, text):
+    return {label: sum(text.count(keyword) for keyword in keywords) for label, keywords in rule['labels']}
+
+
+def reference_lines(text, keywords):
+    return [line.strip() for line in text.split('\n') if any(keyword in line for keyword in keywords)]
+
+
+def random_texts(count=2000, seed=20):
+    """由关键词、关键词片段与填充字符随机拼接的文本，覆盖重叠与前缀命中"""
+    rng = random.Random(seed)
+    keywords = sorted({keyword for rule in TAXONOMY.values() for _, words in rule['labels'] for keyword in words})
+    pieces = keywords + [keyword[:1] for keyword in keywords] + ['不', '的', '，', '\n', ' ', 'a', 'AIG']
+    return [''.join(rng.choice(pieces) for _ in range(rng.randint(0, 40))) for _ in range(count)]
+
+
+@pytest.mark.parametrize('rule_set', sorted(TAXONOMY))
+def test_scan_matches_in_and_count(rule_set):
+    rule = TAXONOMY[rule_set]
+    weight = rule.get('weight', 1)
+    for text in random_texts():
+        matches = keyword_matcher.scan(text)
+        labels = reference_labels(rule, text)
+
+        assert matches.labels(rule_set) == labels, text
+        assert matches.first(rule_set) == (labels[0] if labels else rule.get('default')), text
+        assert matches.has(rule_set) == bool(labels), text
+        assert matches.counts(rule_set) == reference_counts(rule, text), text
+
+        found = {keyword for _, keywords in rule['labels'] for keyword in keywords if keyword in text}
+        assert matches.boost(rule_set) == len(found) * weight, text
+
+
+def test_overlapping_and_prefix_keywords_are_all_counted():
+    counts = keyword_matcher.scan('结论不确定，但AIGC明显').counts('analysis.confidence')
+    assert counts == {'positive': 2, 'negative': 1}  # “不确定”同时计入“确定”
+    assert keyword_matcher.scan('AIGC').keywords('ai_manga.topic') == {'AI', 'AIGC'}
+
+
+def test_select_only_scans_requested_rule_sets():
+    matcher = keyword_matcher.select('site.youku')
+    matches = matcher.scan('AI微剧')
+    assert matches.first('site.youku') == '短剧'
+    assert [keyword for _, keyword in matches.hits] == ['微剧']
+    with pytest.raises(KeyError):
+        matches.labels('site.sina')
+
+
+def test_inline_rules_and_empty_text():
+    matcher = KeywordMatcher({'categories': {'labels': [('甲', ['ab']), ('乙', ['b'])]}})
+    assert matcher.scan('xab').labels('categories') == ['甲', '乙']
+    assert matcher.scan('').first('categories', '无') == '无'
+    assert matcher.scan(None).count('categories') == 0
+
+
+def test_analyzer_extraction_matches_line_scan():
+    analyzer = AIAnalyzer.__new__(AIAnalyzer)
+    rule = dict(TAXONOMY['analysis.line']['labels'])
+    for text in random_texts(500, seed=21):
+        assert analyzer._extract_key_insights(text) == reference_lines(text, rule['insight'])[:5]
+        assert analyzer._extract_predictions(text) == reference_lines(text, rule['prediction'])[:8]
+        assert analyzer._extract_risks(text) == reference_lines(text, rule['risk'])[:3]
+
+        counts = reference_counts(TAXONOMY['analysis.confidence'], text)
+        total = counts['positive'] + counts['negative']
+        expected = round(min(counts['positive'] / total, 1.0), 2) if total else 0.7
+        assert analyzer._calculate_confidence(text) == expected
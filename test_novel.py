@@ -8,7 +8,7 @@ def test_novel_crawler():
     
     # 测试起点爬虫
     print("\n--- 测试起点中文网 ---")
-    qidian_results = nc.crawl_qidian()
+    qidian_results = nc.crawl_site('qidian')
     print(f"起点爬取结果: {len(qidian_results)}条")
     for i, novel in enumerate(qidian_results[:3]):
         print(f"{i+1}. {novel['title']} [{novel['category']}] - {novel['url']}")
@@ -17,7 +17,7 @@ def test_novel_crawler():
     
     # 测试晋江爬虫
     print("\n--- 测试晋江文学城 ---")
-    jjwxc_results = nc.crawl_jjwxc()
+    jjwxc_results = nc.crawl_site('jjwxc')
     print(f"晋江爬取结果: {len(jjwxc_results)}条")
     for i, novel in enumerate(jjwxc_results[:3]):
         print(f"{i+1}. {novel['title']} [{novel['category']}] - {novel['url']}")
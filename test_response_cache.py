@@ -0,0 +1,97 @@
+import os
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import response_cache as response_cache_module
+from response_cache import ResponseCache
+
+TTL = {'example.com': 600, 'nocache.example.com': 0, 'default': 60}
+
+
+def make_response(content, status_code=200, headers=None, encoding='utf-8'):
+    response = requests.Response()
+    response._content = content
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers or {'Content-Type': 'text/html', 'ETag': '"v1"', 'Set-Cookie': 'a=1'})
+    response.encoding = encoding
+    return response
+
+
+def blob_count(cache):
+    return sum(len(files) for _, _, files in os.walk(os.path.join(cache.cache_dir, 'blobs')))
+
+
+@pytest.fixture
+def cache(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(response_cache_module, 'time', clock)
+    return ResponseCache(cache_dir=str(tmp_path / 'http_cache'), max_bytes=250, ttl_config=TTL)
+
+
+def test_round_trip_keeps_body_validators_and_encoding(cache):
+    cache.put('https://example.com/a', make_response('页面'.encode('gbk'), encoding='gbk'))
+    cached = cache.get('https://example.com/a')
+
+    assert cached.content == '页面'.encode('gbk')
+    assert cached.text == '页面'
+    assert cached.from_cache
+    assert dict(cached.headers) == {'Content-Type': 'text/html', 'ETag': '"v1"'}
+    assert cache.get('https://example.com/missing') is None
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 1)
+
+
+def test_ttl_per_host_and_touch(cache, clock):
+    cache.put('https://example.com/a', make_response(b'a'))
+    cache.put('https://other.example.org/b', make_response(b'b'))
+    cache.put('https://nocache.example.com/c', make_response(b'c'))
+    cache.put('https://example.com/error', make_response(b'e', status_code=500))
+    assert cache.get('https://nocache.example.com/c') is None
+    assert cache.get('https://example.com/error') is None
+
+    clock.advance(61)
+    assert cache.get('https://other.example.org/b') is None  # 默认有效期
+    assert cache.get('https://example.com/a') is not None
+
+    clock.advance(500)
+    cache.touch('https://example.com/a')  # 如304时延长有效期
+    clock.advance(500)
+    assert cache.get('https://example.com/a') is not None
+    clock.advance(101)
+    assert cache.get('https://example.com/a') is None
+
+
+def test_identical_bodies_share_one_blob(cache):
+    body = b'x' * 100
+    cache.put('https://example.com/a', make_response(body))
+    cache.put('https://example.com/b', make_response(body))
+    assert blob_count(cache) == 1
+    assert cache.stats()['total_bytes'] == 100
+
+    cache.put('https://example.com/a', make_response(b'y' * 100))
+    assert blob_count(cache) == 2
+    assert cache.get('https://example.com/b').content == body
+
+    cache.put('https://example.com/b', make_response(b'y' * 100))
+    assert blob_count(cache) == 1
+
+
+def test_lru_eviction_keeps_recently_used(cache, clock):
+    for name in 'abc':
+        if name == 'c':
+            cache.get('https://example.com/a')  # a 最近被访问
+        cache.put(f'https://example.com/{name}', make_response(name.encode() * 100))
+        clock.advance(1)
+
+    assert cache.get('https://example.com/b') is None
+    assert cache.get('https://example.com/a') is not None
+    assert cache.get('https://example.com/c') is not None
+    stats = cache.stats()
+    assert (stats['evictions'], stats['entries'], stats['total_bytes']) == (1, 2, 200)
+    assert blob_count(cache) == 2
+
+
+def test_oversized_response_is_not_cached(cache):
+    cache.put('https://example.com/big', make_response(b'z' * 300))
+    assert cache.get('https://example.com/big') is None
+    assert blob_count(cache) == 0
@@ -0,0 +1,90 @@
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+import robots_cache as robots_cache_module
+from robots_cache import RobotsCache
+
+ROBOTS = 'User-agent: *\nDisallow: /private/\n'
+
+
+class FakeTransport:
+    """按 robots.txt 地址返回预设响应，记录请求次数"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.calls.append(url)
+        response = self.responses[url]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def robots_response(status=200, text=ROBOTS, cache_control=None):
+    return SimpleNamespace(status_code=status, text=text, headers={'Cache-Control': cache_control} if cache_control else {})
+
+
+@pytest.fixture
+def transport(temp_db, clock, monkeypatch):
+    transport = FakeTransport({})
+    monkeypatch.setattr(robots_cache_module, 'time', clock)
+    monkeypatch.setattr(robots_cache_module, 'transport', transport)
+    monkeypatch.setattr(robots_cache_module, 'host_limiter', SimpleNamespace(slot=lambda url: nullcontext()))
+    return transport
+
+
+def test_fetches_once_and_shares_through_database(transport, clock):
+    transport.responses['https://example.com/robots.txt'] = robots_response(cache_control='public, max-age=300')
+    cache = RobotsCache(default_ttl=3600)
+
+    assert cache.can_fetch('https://example.com/public/page')
+    assert not cache.can_fetch('https://example.com/private/page')
+    assert len(transport.calls) == 1
+
+    # 新实例（如下次运行）从数据库读取，不再抓取
+    assert not RobotsCache(default_ttl=3600).can_fetch('https://example.com/private/x')
+    assert len(transport.calls) == 1
+
+    # 过了 Cache-Control 的 max-age 后重新抓取
+    clock.advance(301)
+    assert cache.can_fetch('https://example.com/public/page')
+    assert len(transport.calls) == 2
+
+
+def test_default_ttl_without_cache_control(transport, clock):
+    transport.responses['https://example.com/robots.txt'] = robots_response()
+    cache = RobotsCache(default_ttl=3600)
+    cache.can_fetch('https://example.com/')
+    clock.advance(3599)
+    cache.can_fetch('https://example.com/')
+    assert len(transport.calls) == 1
+    clock.advance(2)
+    cache.can_fetch('https://example.com/')
+    assert len(transport.calls) == 2
+
+
+@pytest.mark.parametrize('status, allowed', [(401, False), (403, False), (503, False), (404, True), (410, True)])
+def test_status_codes(transport, temp_db, status, allowed):
+    transport.responses['https://example.com/robots.txt'] = robots_response(status=status, text='<html>error</html>')
+    assert RobotsCache().can_fetch('https://example.com/page') == allowed
+    assert RobotsCache().can_fetch('https://example.com/other') == allowed  # 从数据库恢复的结果一致
+    assert temp_db.get_robots_record('https://example.com')['status'] == status
+
+
+def test_fetch_failure_disallows_for_error_ttl_without_persisting(transport, temp_db, clock):
+    transport.responses['https://down.example.com/robots.txt'] = requests.ConnectionError('refused')
+    cache = RobotsCache(error_ttl=600)
+
+    assert not any(cache.can_fetch(f'https://down.example.com/page{i}') for i in range(5))
+    assert len(transport.calls) == 1
+    assert temp_db.get_robots_record('https://down.example.com') is None
+
+    transport.responses['https://down.example.com/robots.txt'] = robots_response()
+    clock.advance(601)
+    assert cache.can_fetch('https://down.example.com/page')
+    assert len(transport.calls) == 2
@@ -0,0 +1,72 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import whois_cache as whois_cache_module
+from whois_cache import WhoisCache
+
+
+class FakeWhois:
+    """模拟 whois 模块，记录查询的域名"""
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.queries = []
+        self.fail = False
+
+    def whois(self, domain):
+        self.queries.append(domain)
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError('whois server unreachable')
+        return SimpleNamespace(registrar='Example Registrar', creation_date='2020-01-01')
+
+
+@pytest.fixture
+def fake_whois(temp_db, clock, monkeypatch):
+    fake = FakeWhois()
+    monkeypatch.setattr(whois_cache_module, 'whois', fake)
+    monkeypatch.setattr(whois_cache_module, 'time', clock)
+    return fake
+
+
+def test_result_cached_in_memory_and_database(fake_whois, clock):
+    cache = WhoisCache(ttl=3600, error_ttl=60)
+    expected = {'domain': 'example.com', 'registered': True, 'creation_date': '2020-01-01'}
+    assert cache.lookup('Example.com') == expected
+    assert cache.lookup('example.com') == expected
+    assert WhoisCache(ttl=3600, error_ttl=60).lookup('example.com') == expected
+    assert fake_whois.queries == ['example.com']
+
+    clock.advance(3601)
+    cache.lookup('example.com')
+    assert fake_whois.queries == ['example.com', 'example.com']
+
+
+def test_failure_cached_for_error_ttl(fake_whois, clock):
+    fake_whois.fail = True
+    cache = WhoisCache(ttl=3600, error_ttl=60)
+    assert cache.lookup('down.example')['error'] == 'whois server unreachable'
+    assert WhoisCache(ttl=3600, error_ttl=60).lookup('down.example')['error']
+    assert len(fake_whois.queries) == 1
+
+    fake_whois.fail = False
+    clock.advance(61)
+    assert cache.lookup('down.example')['registered']
+    assert len(fake_whois.queries) == 2
+
+
+def test_concurrent_lookups_query_once(fake_whois):
+    fake_whois.delay = 0.05
+    cache = WhoisCache()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.lookup('example.com'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fake_whois.queries == ['example.com']
+    assert len(results) == 8 and all(result == results[0] for result in results)
@@ -0,0 +1,208 @@
+import socket
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+
+
+class DNSCache:
+    """DNS解析缓存，按TTL缓存主机解析出的地址
+
+    只供传输层适配器的连接使用（见 _dns_pool_class），不影响进程中的其他网络请求；
+    条目数超过 max_entries 时先清理过期条目，仍超出时丢弃最早加入的条目。
+    """
+
+    def __init__(self, ttl, max_entries=None):
+        self.ttl = ttl
+        self.max_entries = max_entries or Config.DNS_CACHE_MAX_ENTRIES
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, host, port):
+        """解析主机地址，未过期时直接返回缓存结果；解析失败抛出 socket.gaierror"""
+        key = (host, port)
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+
+        address = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)[0][4][0]
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (now + self.ttl, address)
+            self.misses += 1
+            if len(self.entries) > self.max_entries:
+                self._evict(now)
+        return address
+
+    def _evict(self, now):
+        for key in [key for key, entry in self.entries.items() if entry[0] <= now]:
+            del self.entries[key]
+        while len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+
+    def invalidate(self, host, port):
+        """删除主机的缓存地址（连接失败时调用，下次重新解析）"""
+        with self.lock:
+            self.entries.pop((host, port), None)
+
+    def clear(self):
+        """清空DNS缓存"""
+        with self.lock:
+            self.entries.clear()
+
+
+def _dns_pool_class(pool_cls, dns_cache):
+    """连接池类的子类：新建连接时按缓存地址连接，TLS的SNI与证书校验仍使用原主机名"""
+    class Connection(pool_cls.ConnectionCls):
+        def _new_conn(self):
+            hostname = self._dns_host
+            try:
+                self._dns_host = dns_cache.resolve(hostname, self.port)
+            except OSError:
+                pass  # 解析失败时按原流程连接，由 urllib3 抛出 NameResolutionError
+            try:
+                return super()._new_conn()
+            except Exception:
+                dns_cache.invalidate(hostname, self.port)
+                raise
+            finally:
+                self._dns_host = hostname
+
+    return type(pool_cls.__name__, (pool_cls,), {'ConnectionCls': Connection})
+
+
+class PooledAdapter(HTTPAdapter):
+    """按主机配置连接池大小的适配器
+
+    设置 route_base 后所有请求（含重定向）改为发往 {route_base}/{原URL}，
+    用于离线回放；返回的 response.url 仍为原URL。指定 dns_cache 时，
+    该适配器的连接使用DNS缓存。
+    """
+
+    def __init__(self, host_pool_sizes=None, dns_cache=None, **kwargs):
+        self.host_pool_sizes = host_pool_sizes or {}
+        self.route_base = None
+        self.dns_cache = dns_cache
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        if self.dns_cache:
+            self.poolmanager.pool_classes_by_scheme = {
+                scheme: _dns_pool_class(pool_cls, self.dns_cache)
+                for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items()
+            }
+
+    def send(self, request, **kwargs):
+        if not self.route_base:
+            return super().send(request, **kwargs)
+
+        original_url = request.url
+        routed = request.copy()
+        routed.url = f"{self.route_base}/{original_url}"
+        response = super().send(routed, **kwargs)
+        response.url = original_url
+        return response
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        """在连接池参数中加入该主机的连接数上限（requests>=2.32.2）"""
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        maxsize = self.host_pool_sizes.get(host_params['host'])
+        if maxsize:
+            pool_kwargs['maxsize'] = maxsize
+        return host_params, pool_kwargs
+
+
+class TransportManager:
+    """进程级HTTP传输层
+
+    所有爬虫共用同一个连接池适配器，同一主机的TCP/TLS连接在各爬虫和
+    各工作线程之间复用（keep-alive）。requests.Session 本身不保证线程
+    安全，因此每个线程从 session() 取得自己的会话，会话都挂载共享适配器。
+    """
+
+    def __init__(self, pool_connections=None, pool_maxsize=None, host_pool_sizes=None, dns_ttl=None):
+        dns_ttl = Config.DNS_CACHE_TTL if dns_ttl is None else dns_ttl
+        self.dns_cache = DNSCache(dns_ttl) if dns_ttl > 0 else None
+        self.adapter = PooledAdapter(
+            host_pool_sizes=host_pool_sizes if host_pool_sizes is not None else Config.HTTP_HOST_POOL_SIZES,
+            dns_cache=self.dns_cache,
+            pool_connections=pool_connections or Config.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize or Config.HTTP_POOL_MAXSIZE,
+            max_retries=0,  # 重试由 HttpFetcher 负责
+            pool_block=False
+        )
+        self.local = threading.local()
+        self.response_hooks = []
+
+    def new_session(self, headers=None):
+        """创建挂载共享连接池的会话"""
+        session = requests.Session()
+        session.mount('http://', self.adapter)
+        session.mount('https://', self.adapter)
+        session.hooks['response'].append(self._dispatch_response)
+        if headers:
+            session.headers.update(headers)
+        return session
+
+    def session(self):
+        """当前线程专用的会话"""
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.new_session()
+            self.local.session = session
+        return session
+
+    def request(self, method, url, headers=None, **kwargs):
+        """使用当前线程的会话发送请求"""
+        return self.session().request(method, url, headers=headers, **kwargs)
+
+    def get(self, url, headers=None, **kwargs):
+        """发送GET请求"""
+        return self.request('GET', url, headers=headers, **kwargs)
+
+    def add_response_hook(self, hook):
+        """注册响应回调 hook(response)，所有会话收到的每个响应（含重定向）都会调用"""
+        self.response_hooks.append(hook)
+
+    def remove_response_hook(self, hook):
+        """移除响应回调"""
+        self.response_hooks.remove(hook)
+
+    def _dispatch_response(self, response, *args, **kwargs):
+        for hook in list(self.response_hooks):
+            hook(response)
+
+    def route_to(self, base_url):
+        """把所有请求转发到 base_url（如本地回放服务器），传入None恢复直连"""
+        self.adapter.route_base = base_url.rstrip('/') if base_url else None
+
+    def stats(self):
+        """连接池与DNS缓存统计"""
+        pools = {}
+        for key in list(self.adapter.poolmanager.pools.keys()):
+            pool = self.adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            pools[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                'maxsize': pool.pool.maxsize if pool.pool else 0,
+                'connections_opened': pool.num_connections,
+                'requests': pool.num_requests
+            }
+        return {
+            'pools': pools,
+            'dns_hits': self.dns_cache.hits if self.dns_cache else 0,
+            'dns_misses': self.dns_cache.misses if self.dns_cache else 0
+        }
+
+
+# 全局传输层实例，所有爬虫共享连接池
+transport = TransportManager()
@@ -0,0 +1,45 @@
+import random
+import threading
+
+from config import Config
+
+# 数据文件缺失或为空时使用的默认UA
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'
+
+
+class UserAgentPool:
+    """离线User-Agent池
+
+    首次取用时才从随包附带的文本文件（每行一个UA）加载，进程内只加载一次，
+    不访问网络；随机选取为 O(1)。接口与 fake_useragent.UserAgent 的 random 属性一致。
+    """
+
+    def __init__(self, path=None):
+        self.path = path or Config.USER_AGENTS_FILE
+        self.lock = threading.Lock()
+        self.agents = None
+
+    def _load(self):
+        """加载UA列表"""
+        with self.lock:
+            if self.agents is None:
+                try:
+                    with open(self.path, encoding='utf-8') as f:
+                        agents = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+                except OSError:
+                    agents = []
+                self.agents = agents or [DEFAULT_USER_AGENT]
+        return self.agents
+
+    @property
+    def random(self):
+        """随机返回一个UA"""
+        agents = self.agents if self.agents is not None else self._load()
+        return random.choice(agents)
+
+    def __len__(self):
+        return len(self.agents if self.agents is not None else self._load())
+
+
+# 全局UA池，所有爬虫共享
+ua_pool = UserAgentPool()
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import whois
+
+from config import Config
+from database import db_manager
+
+
+class WhoisCache:
+    """按域名缓存WHOIS查询结果
+
+    WHOIS是整个系统中最慢的调用之一，结果在内存和数据库中按域名缓存，
+    成功结果保留较长时间，查询失败也短期缓存，避免反复查询同一域名。
+    同一域名并发查询时只发起一次。
+    """
+
+    def __init__(self, ttl=None, error_ttl=None):
+        self.ttl = ttl or Config.WHOIS_CACHE_TTL
+        self.error_ttl = error_ttl or Config.WHOIS_ERROR_TTL
+        self.results = {}
+        self.lock = threading.Lock()
+        self.domain_locks = {}
+
+    def _domain_lock(self, domain):
+        """获取域名对应的锁"""
+        with self.lock:
+            if domain not in self.domain_locks:
+                self.domain_locks[domain] = threading.Lock()
+            return self.domain_locks[domain]
+
+    def lookup(self, domain):
+        """查询域名注册信息，返回 {'domain', 'registered', 'creation_date'} 或带 error 的结果"""
+        domain = domain.lower()
+        entry = self.results.get(domain)
+        if entry and entry[1] > time.time():
+            return entry[0]
+
+        with self._domain_lock(domain):
+            entry = self.results.get(domain)
+            if entry and entry[1] > time.time():
+                return entry[0]
+
+            record = db_manager.get_whois_record(domain)
+            if record and record['expires_at'] > time.time():
+                result, expires_at = self._to_result(domain, record), record['expires_at']
+            else:
+                result, expires_at = self._query(domain)
+
+            self.results[domain] = (result, expires_at)
+            return result
+
+    def _query(self, domain):
+        """执行WHOIS查询并保存结果"""
+        try:
+            whois_info = whois.whois(domain)
+            registered = whois_info.registrar is not None
+            creation_date = str(whois_info.creation_date) if whois_info.creation_date else 'Unknown'
+            error = None
+            expires_at = time.time() + self.ttl
+        except Exception as e:
+            registered, creation_date, error = False, None, str(e)
+            expires_at = time.time() + self.error_ttl
+
+        db_manager.save_whois_record(domain, registered, creation_date, error, expires_at)
+        return self._to_result(domain, {
+            'registered': registered, 'creation_date': creation_date, 'error': error
+        }), expires_at
+
+    @staticmethod
+    def _to_result(domain, record):
+        """转换为 check_site_legality 的返回格式"""
+        if record['error']:
+            return {'domain': domain, 'error': record['error']}
+        return {
+            'domain': domain,
+            'registered': bool(record['registered']),
+            'creation_date': record['creation_date']
+        }
+
+
+# 全局WHOIS缓存
+whois_cache = WhoisCache()